@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks
+===================
+Times the HTML generator and the PPTX export on the real crop corpus and on a
+synthetic corpus scaled up from it, and writes machine-readable results.
+
+Usage:
+    python scripts/benchmark.py --output bench.json
+    python scripts/benchmark.py --synthetic 1000 --baseline bench-baseline.json
+    python scripts/benchmark.py --synthetic 0 --save-baseline bench-baseline.json
+
+Each case runs in a fresh process so its peak RSS can be reported. Per-item
+cases (one crop, page or slide per sample) report percentiles over all items;
+whole-pipeline cases take one sample per --repeat. With --baseline, a case
+whose p50 is more than --threshold slower than the baseline counts as a
+regression and the exit status is 1.
+
+The synthetic corpus cycles through the real crops under new slugs, with
+symlinks to the real stage images; its pages are not in the registry, so the
+PPTX cases on it go through parse_html.
+
+The startup_* cases run html_to_pptx.py with --help and with an empty
+--html-dir under -X importtime and report the total module import time,
+which is most of what a per-crop invocation pays before doing any work.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import contextlib
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from crop_data import CROPS, build_crop
+from image_inventory import load_inventory
+from generate_tables_html import ROOT_DIR, CROPS_DIR, build_site, generate_crop_html
+
+
+IMAGES_DIR = os.path.join(ROOT_DIR, 'assets', 'images', 'crops')
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# ─── CORPORA ───────────────────────────────────────────────────────
+
+def real_corpus():
+    return {
+        'name': 'real',
+        'images_dir': IMAGES_DIR,
+        'html_dir': CROPS_DIR,
+        'registry': dict(CROPS),
+    }
+
+
+def synthetic_corpus(size, work_dir):
+    """A corpus of `size` crops cycling through the real ones."""
+    slugs = sorted(CROPS)
+    inventory = load_inventory(IMAGES_DIR)
+    images_dir = os.path.join(work_dir, 'images')
+    registry = {}
+
+    for k in range(size):
+        source = slugs[k % len(slugs)]
+        slug = f'{source}-x{k // len(slugs)}'
+        registry[slug] = CROPS[source]
+        slug_dir = os.path.join(images_dir, slug)
+        os.makedirs(slug_dir)
+        for stage, by_ext in inventory.get(source, {}).items():
+            for ext, path in by_ext.items():
+                target = os.path.join(slug_dir, f'{slug}_stage_{stage}{ext}')
+                try:
+                    os.symlink(os.path.abspath(path), target)
+                except OSError:
+                    shutil.copyfile(path, target)
+
+    html_dir = os.path.join(work_dir, 'html')
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_site(images_dir, html_dir, os.path.join(work_dir, 'manifest.json'),
+                   force=True, registry=registry)
+
+    return {
+        'name': f'synthetic-{size}',
+        'images_dir': images_dir,
+        'html_dir': html_dir,
+        'registry': registry,
+    }
+
+
+def _html_files(corpus):
+    return [os.path.join(corpus['html_dir'], f'{slug}.html') for slug in sorted(corpus['registry'])]
+
+
+def _dir_bytes(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+# ─── CASES ─────────────────────────────────────────────────────────
+# Each case returns (samples in seconds, output bytes or None).
+
+def case_generate_crop_html(corpus, repeat, work_dir):
+    samples = []
+    output_bytes = 0
+    for slug, entry in sorted(corpus['registry'].items()):
+        for _ in range(repeat):
+            elapsed, page = _timed(generate_crop_html, slug, *entry, corpus['images_dir'])
+            samples.append(elapsed)
+        output_bytes += len(page.encode('utf-8'))
+    return samples, output_bytes
+
+
+def case_build_site(corpus, repeat, work_dir):
+    samples = []
+    for k in range(repeat):
+        out_dir = os.path.join(work_dir, f'site-{k}')
+        elapsed, _ = _timed(build_site, corpus['images_dir'], out_dir,
+                            os.path.join(out_dir, 'manifest.json'), force=True,
+                            registry=corpus['registry'])
+        samples.append(elapsed)
+    return samples, _dir_bytes(out_dir)
+
+
+def case_build_site_noop(corpus, repeat, work_dir):
+    out_dir = os.path.join(work_dir, 'site')
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    build_site(corpus['images_dir'], out_dir, manifest_path, registry=corpus['registry'])
+    samples = []
+    for _ in range(repeat):
+        elapsed, _ = _timed(build_site, corpus['images_dir'], out_dir, manifest_path,
+                            registry=corpus['registry'])
+        samples.append(elapsed)
+    return samples, None
+
+
+def _case_parse_html(parser):
+    def case(corpus, repeat, work_dir):
+        from html_to_pptx import parse_html
+        samples = []
+        for html_path in _html_files(corpus):
+            for _ in range(repeat):
+                samples.append(_timed(parse_html, html_path, parser)[0])
+        return samples, None
+    return case
+
+
+def case_add_crop_slide(corpus, repeat, work_dir):
+    from html_to_pptx import new_presentation, add_crop_slide
+    samples = []
+    for slug in sorted(corpus['registry']):
+        crop = build_crop(slug, corpus['images_dir'], corpus['registry'])
+        for _ in range(repeat):
+            prs = new_presentation()
+            samples.append(_timed(add_crop_slide, prs, crop, corpus['images_dir'])[0])
+    return samples, None
+
+
+def case_process_single_html(corpus, repeat, work_dir):
+    from html_to_pptx import process_single_html
+    out_dir = os.path.join(work_dir, 'pptx')
+    os.makedirs(out_dir, exist_ok=True)
+    samples = []
+    for html_path in _html_files(corpus):
+        for _ in range(repeat):
+            samples.append(_timed(process_single_html, html_path,
+                                  corpus['images_dir'], out_dir)[0])
+    return samples, _dir_bytes(out_dir)
+
+
+def case_process_all_to_single(corpus, repeat, work_dir):
+    from html_to_pptx import process_all_to_single
+    output_path = os.path.join(work_dir, 'all_crops.pptx')
+    samples = []
+    for _ in range(repeat):
+        samples.append(_timed(process_all_to_single, corpus['html_dir'],
+                              corpus['images_dir'], output_path, force=True)[0])
+    return samples, os.path.getsize(output_path)
+
+
+def case_process_all_to_single_noop(corpus, repeat, work_dir):
+    from html_to_pptx import process_all_to_single
+    output_path = os.path.join(work_dir, 'all_crops.pptx')
+    process_all_to_single(corpus['html_dir'], corpus['images_dir'], output_path)
+    samples = []
+    for _ in range(repeat):
+        samples.append(_timed(process_all_to_single, corpus['html_dir'],
+                              corpus['images_dir'], output_path)[0])
+    return samples, os.path.getsize(output_path)
+
+
+def import_time(script, *args):
+    """Total import time in seconds of running a script, from -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', script, *args],
+                            cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"; top-level
+        # imports are the unindented names and their cumulative times add up
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit() and not name.startswith('  '):
+            total_us += int(cumulative)
+    return total_us / 1e6
+
+
+def _case_startup(*args):
+    def case(corpus, repeat, work_dir):
+        cli_args = [arg.format(work_dir=work_dir) for arg in args]
+        os.makedirs(os.path.join(work_dir, 'empty'), exist_ok=True)
+        samples = [import_time('html_to_pptx.py', *cli_args) for _ in range(5 * repeat)]
+        return samples, None
+    return case
+
+
+CASES = {
+    'generate_crop_html': case_generate_crop_html,
+    'build_site': case_build_site,
+    'build_site_noop': case_build_site_noop,
+    'parse_html_fast': _case_parse_html('fast'),
+    'parse_html_bs4': _case_parse_html('bs4'),
+    'add_crop_slide': case_add_crop_slide,
+    'process_single_html': case_process_single_html,
+    'process_all_to_single': case_process_all_to_single,
+    'process_all_to_single_noop': case_process_all_to_single_noop,
+    'startup_help': _case_startup('--help'),
+    'startup_empty_dir': _case_startup('--html-dir', '{work_dir}/empty', '--images-dir',
+                                       '{work_dir}/empty', '--output-dir', '{work_dir}/out'),
+}
+
+
+# ─── RUNNER ────────────────────────────────────────────────────────
+
+def percentile(sorted_samples, q):
+    """Linearly interpolated percentile (q in 0..100) of sorted samples."""
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    pos = (len(sorted_samples) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (pos - lo)
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _run_case(name, corpus, repeat):
+    """Run one case in this (fresh) process and summarise it."""
+    with tempfile.TemporaryDirectory(prefix='bench-') as work_dir, \
+            contextlib.redirect_stdout(io.StringIO()):
+        samples, output_bytes = CASES[name](corpus, repeat, work_dir)
+
+    ordered = sorted(samples)
+    ms = 1000.0
+    return {
+        'n': len(ordered),
+        'total_s': round(sum(ordered), 4),
+        'mean_ms': round(sum(ordered) / len(ordered) * ms, 3),
+        'min_ms': round(ordered[0] * ms, 3),
+        'p50_ms': round(percentile(ordered, 50) * ms, 3),
+        'p90_ms': round(percentile(ordered, 90) * ms, 3),
+        'p99_ms': round(percentile(ordered, 99) * ms, 3),
+        'max_ms': round(ordered[-1] * ms, 3),
+        'peak_rss_mb': round(_peak_rss_mb(), 1) if _peak_rss_mb() is not None else None,
+        'output_bytes': output_bytes,
+    }
+
+
+def run_isolated(name, corpus, repeat):
+    ctx = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(_run_case, name, corpus, repeat).result()
+
+
+def compare(results, baseline, threshold):
+    """Return [(key, current p50, baseline p50, ratio)] for regressed cases."""
+    regressions = []
+    for key, current in sorted(results.items()):
+        base = baseline.get(key)
+        if not base or not base.get('p50_ms'):
+            continue
+        ratio = current['p50_ms'] / base['p50_ms']
+        if ratio > 1 + threshold:
+            regressions.append((key, current['p50_ms'], base['p50_ms'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the crop page and PPTX pipelines')
+    parser.add_argument('--synthetic', type=int, default=1000,
+                        help='Size of the synthetic corpus (0 = real corpus only)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Samples per item (per-item cases) or per run (pipeline cases)')
+    parser.add_argument('--cases', default=','.join(CASES),
+                        help='Comma-separated cases to run')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='Compare p50 timings against this results file')
+    parser.add_argument('--save-baseline', help='Also write results to this baseline file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed p50 slowdown against the baseline (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.cases.split(',') if n.strip()]
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench-corpus-') as corpus_dir:
+        corpora = [real_corpus()]
+        if args.synthetic > 0:
+            print(f"Building synthetic corpus of {args.synthetic} crops...")
+            corpora.append(synthetic_corpus(args.synthetic, corpus_dir))
+
+        print(f"{'case':<44}{'n':>6}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'RSS MB':>9}")
+        for corpus in corpora:
+            for name in names:
+                key = f"{corpus['name']}/{name}"
+                result = run_isolated(name, corpus, args.repeat)
+                results[key] = result
+                print(f"{key:<44}{result['n']:>6}{result['p50_ms']:>10.2f}"
+                      f"{result['p90_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                      f"{result['peak_rss_mb'] or 0:>9.1f}")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'synthetic': args.synthetic,
+        },
+        'results': results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            print(f"Wrote {path}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('results', {})
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for key, current, base, ratio in regressions:
+                print(f"  {key}: p50 {current:.2f} ms vs {base:.2f} ms ({ratio:.2f}x)")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
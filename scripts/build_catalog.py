@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Product Catalog Builder
+=======================
+Renders the "Pick Your Pack" product cards from a saved Gumroad products
+snapshot (blocks/products.json, the /v2/products API response) into the
+static blocks in blocks/ and into index.html and all-crops.html, so the
+pages no longer call the Gumroad API in the browser.
+
+Usage:
+    python scripts/build_catalog.py
+    GUMROAD_ACCESS_TOKEN=... python scripts/build_catalog.py --fetch
+
+With --fetch the snapshot is refreshed first with a conditional request
+(If-None-Match with the ETag cached in .cache/); a 304 leaves it alone.
+Each output is only rewritten when the hash of its inputs (the products it
+shows and this renderer) differs from the one recorded in
+.build-manifest.json, or when the file on disk no longer matches.
+"""
+
+import os
+import re
+import sys
+import json
+import html
+import inspect
+import argparse
+import urllib.error
+import urllib.request
+
+from image_metadata import CACHE_DIR
+from generate_tables_html import (
+    ROOT_DIR, MANIFEST_PATH, sha256_text, load_manifest, save_manifest,
+)
+
+
+SNAPSHOT_PATH = os.path.join(ROOT_DIR, 'blocks', 'products.json')
+ETAG_PATH = os.path.join(CACHE_DIR, 'gumroad-products.etag')
+API_URL = 'https://api.gumroad.com/v2/products'
+STORE_URL = 'https://iliadesign.gumroad.com/l/'
+
+MARKER_BEGIN = '<!-- PRODUCT CARDS: generated by scripts/build_catalog.py -->'
+MARKER_END = '<!-- /PRODUCT CARDS -->'
+
+# Product permalinks in display order; unpublished or unknown ones are skipped
+PICK_YOUR_PACK = [
+    'fullset', 'free-sample-pack', 'cereals_grains', 'leafy', 'legume',
+    'nightshade', 'root-and-tuber', 'cucurbits-and-melons', 'brassicas',
+    'oilseed', 'other', 'freepreview',
+]
+INDEX_EXTRAS = [
+    'plant-growth-cycles', 'oipiv', 'development_fruit_tree', 'GardenIcons',
+    'FlowerGrowth', 'FarmLineIconsSet',
+]
+
+# name -> (page, block, permalinks, button class, indent of the cards in the page)
+TARGETS = {
+    'index': ('index.html', 'blocks/products-cards-index.html',
+              PICK_YOUR_PACK + INDEX_EXTRAS, 'product-card-btn', ''),
+    'allcrops': ('all-crops.html', 'blocks/products-cards-allcrops.html',
+                 PICK_YOUR_PACK, 'btn-green', ' ' * 12),
+}
+
+
+# ─── SNAPSHOT ──────────────────────────────────────────────────────
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not data.get('success'):
+        raise ValueError(f'{path}: not a successful Gumroad products response')
+    return data['products']
+
+
+def fetch_snapshot(token, path=SNAPSHOT_PATH, etag_path=ETAG_PATH):
+    """Refresh the snapshot from the API; returns True if it changed."""
+    request = urllib.request.Request(f'{API_URL}?access_token={token}')
+    try:
+        with open(etag_path, 'r', encoding='utf-8') as f:
+            request.add_header('If-None-Match', f.read().strip())
+    except OSError:
+        pass
+
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            body = response.read()
+            etag = response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            print("Gumroad catalog not modified (ETag match)")
+            return False
+        raise
+
+    data = json.loads(body)
+    if not data.get('success'):
+        raise ValueError('Gumroad API returned an unsuccessful response')
+    if etag:
+        os.makedirs(os.path.dirname(etag_path), exist_ok=True)
+        with open(etag_path, 'w', encoding='utf-8') as f:
+            f.write(etag)
+
+    text = json.dumps(data, indent=1, ensure_ascii=False) + '\n'
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if json.load(f) == data:
+                print("Gumroad catalog unchanged")
+                return False
+    except (OSError, ValueError):
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    print(f"Updated {os.path.relpath(path, ROOT_DIR)}")
+    return True
+
+
+def products_by_permalink(products):
+    """Published products keyed by short_url permalink and custom permalink."""
+    by_slug = {}
+    for p in products:
+        if not p.get('published'):
+            continue
+        keys = []
+        short_url = p.get('short_url') or ''
+        if '/l/' in short_url:
+            keys.append(short_url.split('/l/')[-1])
+        if p.get('custom_permalink'):
+            keys.append(p['custom_permalink'])
+        for key in keys:
+            by_slug[key] = p
+            by_slug[key.lower()] = p
+    return by_slug
+
+
+def select_products(products, permalinks):
+    """[(permalink, product)] in display order, skipping missing ones."""
+    by_slug = products_by_permalink(products)
+    selected = []
+    for slug in permalinks:
+        p = by_slug.get(slug) or by_slug.get(slug.lower())
+        if p is not None:
+            selected.append((slug, p))
+    return selected
+
+
+# ─── RENDERING ─────────────────────────────────────────────────────
+
+def render_cards(selected, button_class, indent=''):
+    """The product-card <div>s for a products grid."""
+    cards = []
+    for slug, p in selected:
+        name = html.escape(p['name'])
+        price = html.escape(p.get('formatted_price') or f"${p['price'] / 100:g}")
+        thumb = p.get('thumbnail_url') or ''
+        url = html.escape(p.get('short_url') or STORE_URL + slug)
+        btn_text = 'Download Free' if p.get('price') == 0 else 'Purchase'
+        img = f'<img src="{html.escape(thumb)}" alt="{name}" loading="lazy">' if thumb else ''
+        cards.append(f"""{indent}<div class="product-card">
+{indent}    <div class="product-card-img">
+{indent}        {img}
+{indent}    </div>
+{indent}    <div class="product-card-body">
+{indent}        <div class="product-card-title">{name}</div>
+{indent}        <div class="product-card-price">{price}</div>
+{indent}    </div>
+{indent}    <div class="product-card-footer">
+{indent}        <a class="{button_class}" href="{url}" target="_blank" rel="noopener">{btn_text}</a>
+{indent}    </div>
+{indent}</div>""")
+    return '\n'.join(cards)
+
+
+def render_block(selected, button_class):
+    """A standalone "Pick Your Pack" section for pasting into other pages."""
+    cards = render_cards(selected, button_class, indent=' ' * 12)
+    return f"""<!-- PICK YOUR PACK — generated by scripts/build_catalog.py -->
+<section class="pick-section" id="catalog">
+    <div class="container">
+        <h2 class="section-title">Pick Your <strong>Pack</strong></h2>
+        <div class="products-grid">
+{cards}
+        </div>
+    </div>
+</section>"""
+
+
+_MARKED_RE = re.compile(re.escape(MARKER_BEGIN) + r'.*?' + re.escape(MARKER_END), re.S)
+
+
+def marked_region(page_html):
+    """The product card region of page_html, markers included."""
+    match = _MARKED_RE.search(page_html)
+    if match is None:
+        raise ValueError('product card markers not found')
+    return match.group(0)
+
+
+def inject_cards(page_html, cards, indent=''):
+    """Replace the marked region of page_html with the product cards."""
+    marked_region(page_html)
+    region = f'{MARKER_BEGIN}\n{cards}\n{indent}{MARKER_END}'
+    return _MARKED_RE.sub(lambda m: region, page_html, count=1)
+
+
+# ─── BUILD ─────────────────────────────────────────────────────────
+
+def _write_if_changed(path, text):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return True
+
+
+def build_catalog(snapshot_path=SNAPSHOT_PATH, manifest_path=MANIFEST_PATH, force=False):
+    """Render every target from the snapshot; returns the number of files written.
+
+    Manifest entries record the hash of each target's inputs, of its block
+    and of the marked region of its page.
+    """
+    products = load_snapshot(snapshot_path)
+    manifest = load_manifest(manifest_path)
+    entries = manifest.setdefault('catalog', {})
+    renderer = inspect.getsource(render_cards) + inspect.getsource(render_block)
+
+    written = 0
+    for name, (page, block, permalinks, button_class, indent) in TARGETS.items():
+        selected = select_products(products, permalinks)
+        inputs_hash = sha256_text(json.dumps(
+            [selected, button_class, indent, renderer], sort_keys=True, ensure_ascii=False))
+        block_path = os.path.join(ROOT_DIR, block)
+        page_path = os.path.join(ROOT_DIR, page)
+
+        with open(page_path, 'r', encoding='utf-8') as f:
+            page_html = f.read()
+        entry = entries.get(name, {})
+        block_html = None
+        if os.path.isfile(block_path):
+            with open(block_path, 'r', encoding='utf-8') as f:
+                block_html = f.read()
+        if (not force and entry.get('inputs') == inputs_hash
+                and block_html is not None and sha256_text(block_html) == entry.get('block')
+                and sha256_text(marked_region(page_html)) == entry.get('page')):
+            print(f"  {name}: unchanged ({len(selected)} products)")
+            continue
+
+        block_html = render_block(selected, button_class) + '\n'
+        page_html = inject_cards(page_html, render_cards(selected, button_class, indent), indent)
+        changed = [path for path, text in ((block, block_html), (page, page_html))
+                   if _write_if_changed(os.path.join(ROOT_DIR, path), text)]
+        written += len(changed)
+        entries[name] = {
+            'inputs': inputs_hash,
+            'block': sha256_text(block_html),
+            'page': sha256_text(marked_region(page_html)),
+        }
+        print(f"  {name}: {len(selected)} products"
+              + (f", wrote {', '.join(changed)}" if changed else ", output already current"))
+
+    save_manifest(manifest, manifest_path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the static product cards from the Gumroad snapshot')
+    parser.add_argument('--snapshot', default=SNAPSHOT_PATH,
+                        help='Saved Gumroad /v2/products response')
+    parser.add_argument('--fetch', action='store_true',
+                        help='Refresh the snapshot from the API first (needs GUMROAD_ACCESS_TOKEN)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render every target even if its inputs are unchanged')
+    args = parser.parse_args()
+
+    if args.fetch:
+        token = os.environ.get('GUMROAD_ACCESS_TOKEN')
+        if not token:
+            parser.error('--fetch needs the GUMROAD_ACCESS_TOKEN environment variable')
+        fetch_snapshot(token, args.snapshot)
+
+    written = build_catalog(args.snapshot, force=args.force)
+    print(f"\nCatalog: wrote {written} file(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
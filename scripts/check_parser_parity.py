@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+parse_html Backend Parity Check
+===============================
+Runs html_to_pptx.parse_html with both extraction backends (lxml XPath and
+BeautifulSoup) over every crop page, reports any page where the extracted
+data differs, and prints per-page parse timings.
+
+Usage:
+    python scripts/check_parser_parity.py --html-dir ./crops [--repeat 5]
+
+Exits with status 1 if any page differs.
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+from html_to_pptx import parse_html
+
+
+BACKENDS = ('fast', 'bs4')
+
+
+def time_parse(html_path, parser, repeat):
+    """Return (data, best wall time in ms) over `repeat` parses."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = parse_html(html_path, parser)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return data, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare parse_html backends on crop pages')
+    parser.add_argument('--html-dir', default=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'crops'),
+        help='Directory with crop HTML files')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Parses per page and backend; the best time is reported')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Only print mismatches and the summary')
+    args = parser.parse_args()
+
+    html_files = sorted(glob.glob(os.path.join(args.html_dir, '*.html')))
+    if not html_files:
+        print(f"No HTML files found in {args.html_dir}")
+        return 1
+
+    totals = dict.fromkeys(BACKENDS, 0.0)
+    mismatches = []
+
+    if not args.quiet:
+        print(f"{'page':<32}{'fast ms':>10}{'bs4 ms':>10}{'speedup':>10}")
+    for html_path in html_files:
+        results = {b: time_parse(html_path, b, args.repeat) for b in BACKENDS}
+        for b in BACKENDS:
+            totals[b] += results[b][1]
+
+        name = os.path.basename(html_path)
+        fast_data, fast_ms = results['fast']
+        bs4_data, bs4_ms = results['bs4']
+        if fast_data != bs4_data:
+            mismatches.append(name)
+            keys = sorted(k for k in set(fast_data) | set(bs4_data)
+                          if fast_data.get(k) != bs4_data.get(k))
+            print(f"  MISMATCH {name}: {', '.join(keys)}")
+        if not args.quiet:
+            print(f"{name:<32}{fast_ms:>10.2f}{bs4_ms:>10.2f}{bs4_ms / fast_ms:>9.1f}x")
+
+    n = len(html_files)
+    print(f"\n{n} pages, {len(mismatches)} mismatches")
+    print(f"  fast: {totals['fast']:.1f} ms total, {totals['fast'] / n:.2f} ms/page")
+    print(f"  bs4:  {totals['bs4']:.1f} ms total, {totals['bs4'] / n:.2f} ms/page")
+    print(f"  speedup: {totals['bs4'] / totals['fast']:.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
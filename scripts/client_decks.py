@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Personalized Client Decks
+=========================
+Builds one deck per client with the "Your Product" row of each crop slide
+filled in from a product list, instead of the 'Add product & dosage'
+placeholder.
+
+Usage:
+    python scripts/client_decks.py --products clients.csv --html-dir crops \\
+        --images-dir assets/images/crops --output-dir client_decks [--jobs 0]
+
+The product list is a CSV file with a header row, or a JSON array of
+objects, with the fields
+
+    client, crop, stage, product[, dosage]
+
+where crop is the page slug (e.g. wheat) and stage is either the stage
+number (1-10) or its BBCH code as shown on the slide (e.g. 10-19). A
+client's deck has a slide for every crop it lists (every crop with
+--all-crops), in catalog order, and is written to {client-slug}.pptx;
+two client names with the same slug (e.g. "Acme Ag" and "acme-ag") are
+an error.
+
+Each crop slide is built once, as a single-slide base deck shared by all
+clients; a client deck is those base decks merged at the package level
+(pptx_merge.merge_decks) with only the product row's text replaced. Base
+decks are kept in {output-dir}/.crop-decks/ and only rebuilt when their
+inputs change (html_to_pptx.export_changed). Client decks are merged on
+--jobs processes, and every deck's build time is reported against --budget
+seconds.
+"""
+
+import io
+import os
+import re
+import csv
+import sys
+import json
+import glob
+import time
+import argparse
+import contextlib
+
+from lxml import etree
+
+from html_to_pptx import (CLR_BBCH, CROP_DECKS_DIRNAME, load_crop, export_changed,
+                          _ordered_results)
+
+
+NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+A = f'{{{NS_A}}}'
+PRODUCT_ROW = 2           # rows of the slide table: BBCH codes, descriptions, products
+REQUIRED_FIELDS = ('client', 'crop', 'stage', 'product')
+
+
+# ─── PRODUCT LIST ──────────────────────────────────────────────────
+
+def load_products(path):
+    """The rows of a CSV or JSON product list, as dicts of stripped strings."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith('.json'):
+            rows = json.load(f)
+            if not isinstance(rows, list):
+                raise ValueError(f'{path}: expected a JSON array of objects')
+        else:
+            rows = list(csv.DictReader(f))
+
+    records = []
+    for line, row in enumerate(rows, 1):
+        row = {str(k).strip().lower(): str(v if v is not None else '').strip()
+               for k, v in row.items()}
+        missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+        if missing:
+            raise ValueError(f'{path}: entry {line} has no {", ".join(missing)}')
+        row.setdefault('dosage', '')
+        records.append(row)
+    return records
+
+
+def client_slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'client'
+
+
+def _normalize_code(code):
+    return re.sub(r'\s+', '', code.upper().replace('BBCH', '')).replace('–', '-')
+
+
+def stage_column(crop, stage):
+    """The table column (0-based) of `stage`, a stage number or BBCH code, or None."""
+    key = _normalize_code(stage)
+    for col, entry in enumerate(crop.stages):
+        if _normalize_code(entry.code) == key:
+            return col
+    if stage.isdigit():
+        for col, entry in enumerate(crop.stages):
+            if entry.number == int(stage):
+                return col
+    return None
+
+
+# ─── SLIDE PATCHING ────────────────────────────────────────────────
+
+def fill_product_row(slide_xml, products):
+    """Slide XML with the product row's placeholders replaced.
+
+    `products` maps a stage column to (product, dosage); dosage goes on a
+    second line. Filled cells take the BBCH code colour instead of the
+    light placeholder grey (a master's theme colours are left alone).
+    """
+    root = etree.fromstring(slide_xml)
+    rows = root.findall(f'.//{A}tbl/{A}tr')
+    cells = rows[PRODUCT_ROW].findall(f'{A}tc')
+    for col, (product, dosage) in products.items():
+        p = cells[col + 1].find(f'{A}txBody/{A}p')
+        for child in p.findall(f'{A}r') + p.findall(f'{A}br'):
+            p.remove(child)
+        lines = [product, dosage] if dosage else [product]
+        for k, text in enumerate(lines):
+            if k:
+                etree.SubElement(p, f'{A}br')
+            etree.SubElement(etree.SubElement(p, f'{A}r'), f'{A}t').text = text
+        for color in p.iterfind(f'{A}pPr/{A}defRPr/{A}solidFill/{A}srgbClr'):
+            color.set('val', CLR_BBCH)
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _build_client_deck(job):
+    """Worker: merge one client's deck; returns (name, slides, seconds, error)."""
+    from pptx_merge import merge_decks
+
+    name, base_decks, patches, output_path = job
+    start = time.perf_counter()
+
+    def transform(deck_path, index, slide_xml):
+        products = patches.get(deck_path)
+        return fill_product_row(slide_xml, products) if products else None
+
+    try:
+        stats = merge_decks(base_decks, output_path, transform_slide=transform)
+    except Exception as e:
+        return name, 0, time.perf_counter() - start, str(e)
+    return name, stats.slides, time.perf_counter() - start, None
+
+
+# ─── BATCH ─────────────────────────────────────────────────────────
+
+def build_client_decks(products_path, html_dir, images_dir, output_dir, jobs=1,
+                       budget=1.0, all_crops=False, image_dpi=None, master=None):
+    """Write a personalized deck per client; returns the number of decks over budget."""
+    records = load_products(products_path)
+    pages = {os.path.splitext(os.path.basename(path))[0]: path
+             for path in glob.glob(os.path.join(html_dir, '*.html'))}
+
+    clients = {}            # client -> {slug: {column: (product, dosage)}}
+    crops = {}
+    for row in records:
+        slug = row['crop']
+        if slug not in pages:
+            print(f"  ⚠ {row['client']}: no page for crop '{slug}', skipped")
+            continue
+        if slug not in crops:
+            crops[slug] = load_crop(pages[slug], images_dir)
+        col = stage_column(crops[slug], row['stage'])
+        if col is None:
+            print(f"  ⚠ {row['client']}: {slug} has no stage '{row['stage']}', skipped")
+            continue
+        clients.setdefault(row['client'], {}).setdefault(slug, {})[col] = (
+            row['product'], row['dosage'])
+
+    if not clients:
+        print(f"No usable entries in {products_path}")
+        return 0
+    filenames = {}          # client -> deck file name
+    owners = {}             # deck file name -> client
+    for name in sorted(clients):
+        filename = f'{client_slug(name)}.pptx'
+        if filename in owners:
+            raise ValueError(f"{products_path}: clients '{owners[filename]}' and '{name}' "
+                             f"would both be written to {filename}")
+        filenames[name] = filename
+        owners[filename] = name
+    used = sorted(pages) if all_crops else sorted({s for c in clients.values() for s in c})
+    os.makedirs(output_dir, exist_ok=True)
+
+    base_dir = os.path.join(output_dir, CROP_DECKS_DIRNAME)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        built, reused, failures = export_changed([pages[slug] for slug in used], images_dir,
+                                                 base_dir, jobs=jobs, image_dpi=image_dpi,
+                                                 master=master)
+    for html_path, error in failures:
+        print(f"  ERROR building {os.path.basename(html_path)}: {error}")
+    failed = {html_path for html_path, _ in failures}
+    base = {slug: os.path.join(base_dir, f'{slug}.pptx') for slug in used
+            if pages[slug] not in failed and os.path.isfile(os.path.join(base_dir, f'{slug}.pptx'))}
+    print(f"Base slides: built {built}, reused {reused} unchanged "
+          f"in {time.perf_counter() - start:.1f} s")
+
+    work = []
+    for name, by_crop in sorted(clients.items()):
+        slugs = [slug for slug in (used if all_crops else sorted(by_crop)) if slug in base]
+        patches = {base[slug]: by_crop[slug] for slug in slugs if slug in by_crop}
+        output_path = os.path.join(output_dir, filenames[name])
+        work.append((name, [base[slug] for slug in slugs], patches, output_path))
+
+    print(f"\nClient decks (budget {budget:.2f} s per deck):")
+    start = time.perf_counter()
+    timings = []
+    for name, slides, seconds, error in _ordered_results(_build_client_deck, work, jobs):
+        if error is not None:
+            print(f"  ERROR {name}: {error}")
+            continue
+        timings.append((seconds, name))
+        flag = '  ⚠ over budget' if seconds > budget else ''
+        print(f"  {name:<32} {slides:>4} slides {seconds * 1000:>8.0f} ms{flag}")
+    total = time.perf_counter() - start
+
+    if timings:
+        timings.sort()
+        over = sum(1 for seconds, _ in timings if seconds > budget)
+        slowest, slowest_name = timings[-1]
+        print(f"\nBuilt {len(timings)} client decks in {total:.1f} s; "
+              f"p50 {timings[len(timings) // 2][0] * 1000:.0f} ms, "
+              f"slowest {slowest * 1000:.0f} ms ({slowest_name}); {over} over budget")
+        return over
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a personalized deck per client')
+    parser.add_argument('--products', required=True,
+                        help='CSV or JSON list of client, crop, stage, product, dosage')
+    parser.add_argument('--html-dir', required=True,
+                        help='Directory with crop HTML files')
+    parser.add_argument('--images-dir', required=True,
+                        help='Directory with crop images (e.g. assets/images/crops)')
+    parser.add_argument('--output-dir', default='./client_decks',
+                        help='Output directory for the client decks')
+    parser.add_argument('--all-crops', action='store_true',
+                        help='Give every client a slide for every crop, not only the crops '
+                             'it has products for')
+    parser.add_argument('--jobs', type=int, default=0,
+                        help='Worker processes (0 = one per CPU core)')
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='Seconds a client deck may take before it is flagged')
+    parser.add_argument('--image-dpi', type=int, default=None,
+                        help='Downscale and recompress images to this DPI at their slide size')
+    parser.add_argument('--template', default=None,
+                        help='Designer master (.pptx or .potx), as for html_to_pptx.py')
+    args = parser.parse_args()
+
+    jobs = args.jobs or os.cpu_count() or 1
+    try:
+        build_client_decks(args.products, args.html_dir, args.images_dir, args.output_dir,
+                           jobs=jobs, budget=args.budget, all_crops=args.all_crops,
+                           image_dpi=args.image_dpi, master=args.template)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Asset Minification and Precompression
+=====================================
+Writes minified, maximally compressed .gz (and, if the brotli package is
+installed, .br) siblings of the generated pages and stylesheets, for a
+static host that serves precompressed files.
+
+Usage:
+    python scripts/compress_assets.py [--jobs 0] [--force]
+
+Covers index.html, all-crops.html, crops/*.html, crops/fragments/*.html,
+the all-crops table chunks in crops/catalog/ and assets/css/*.css. The
+files themselves are left as they are (index.html and all-crops.html are
+edited by hand); only the compressed siblings hold the minified markup,
+with <style> blocks minified and comments and indentation stripped from
+inline scripts. A file is only recompressed when its content hash changed
+since the last run (state in .cache/); siblings whose source is gone are
+deleted.
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import glob
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:  # only .gz siblings are written
+    brotli = None
+
+from image_metadata import ROOT_DIR, CACHE_DIR
+from generate_tables_html import minify_css
+
+
+STATE_PATH = os.path.join(CACHE_DIR, 'compress-state.json')
+SOURCES = ('index.html', 'all-crops.html', 'crops/*.html', 'crops/fragments/*.html',
+           'crops/catalog/*.json', 'assets/css/*.css')
+# Bumped whenever the minifiers change, so every file is recompressed
+MINIFIER_VERSION = 1
+
+
+# ─── MINIFIERS ─────────────────────────────────────────────────────
+
+def minify_js(js):
+    """Drop comments, indentation and blank lines from a script.
+
+    Newlines are kept so automatic semicolon insertion is unaffected.
+    Strings and template literals are copied verbatim; a '/' that starts
+    '//' or '/*' outside a string is taken as a comment.
+    """
+    out = []
+    i, n = 0, len(js)
+    while i < n:
+        c = js[i]
+        if c in '\'"`':
+            end = i + 1
+            while end < n and js[end] != c:
+                end += 2 if js[end] == '\\' else 1
+            out.append(js[i:end + 1])
+            i = end + 1
+        elif js.startswith('//', i):
+            end = js.find('\n', i)
+            i = n if end < 0 else end
+        elif js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        else:
+            out.append(c)
+            i += 1
+    lines = (line.strip() for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+_RAW_BLOCK_RE = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)', re.S | re.I)
+_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.S)
+
+
+def _collapse(text):
+    """Collapse whitespace runs: to a newline if they contain one, else a space."""
+    return re.sub(r'\s+', lambda m: '\n' if '\n' in m.group(0) else ' ', text)
+
+
+def minify_html(markup):
+    """Minify a page without changing how it renders.
+
+    Whitespace between tags is collapsed rather than removed, so inline
+    spacing is preserved; <pre> and <textarea> are left untouched.
+    """
+    out = []
+    pos = 0
+    for match in _RAW_BLOCK_RE.finditer(markup):
+        out.append(_collapse(_COMMENT_RE.sub('', markup[pos:match.start()])))
+        open_tag, tag, body, close_tag = match.groups()
+        tag = tag.lower()
+        if tag == 'style':
+            body = minify_css(body)
+        elif tag == 'script' and 'src=' not in open_tag and 'json' not in open_tag:
+            body = minify_js(body)
+        out.append(open_tag + body + close_tag)
+        pos = match.end()
+    out.append(_collapse(_COMMENT_RE.sub('', markup[pos:])))
+    return ''.join(out).strip() + '\n'
+
+
+# ─── COMPRESSION ───────────────────────────────────────────────────
+
+def _compress_one(job):
+    """Worker: minify and compress one file; returns (relpath, sizes)."""
+    rel, path = job
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if path.endswith('.css'):
+        minified = minify_css(text) + '\n'
+    elif path.endswith('.json'):
+        minified = text        # written compact by the generator
+    else:
+        minified = minify_html(text)
+    data = minified.encode('utf-8')
+
+    sizes = {'source': len(text.encode('utf-8')), 'minified': len(data)}
+    outputs = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        outputs['.br'] = brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+    for ext, blob in outputs.items():
+        tmp_path = f'{path}{ext}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, path + ext)
+        sizes[ext] = len(blob)
+    return rel, sizes
+
+
+def _sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def source_files(root=ROOT_DIR):
+    files = []
+    for pattern in SOURCES:
+        files.extend(sorted(glob.glob(os.path.join(root, pattern))))
+    return files
+
+
+def compress_assets(root=ROOT_DIR, state_path=STATE_PATH, jobs=1, force=False):
+    """Compress every changed source; returns (compressed, skipped, removed)."""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    exts = ['.gz'] + (['.br'] if brotli is not None else [])
+    settings = {'minifier': MINIFIER_VERSION, 'exts': exts}
+    if state.get('settings') != settings:
+        state, force = {}, True
+    files = state.setdefault('files', {})
+
+    work = []
+    hashes = {}
+    for path in source_files(root):
+        rel = os.path.relpath(path, root).replace(os.sep, '/')
+        hashes[rel] = _sha256(path)
+        entry = files.get(rel)
+        if (not force and entry and entry.get('sha256') == hashes[rel]
+                and all(os.path.isfile(path + ext) for ext in exts)):
+            continue
+        work.append((rel, path))
+
+    totals = {'source': 0, 'minified': 0, '.gz': 0, '.br': 0}
+    if jobs == 1 or len(work) < 2:
+        results = [_compress_one(job) for job in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_compress_one, work, chunksize=8))
+    for rel, sizes in results:
+        files[rel] = {'sha256': hashes[rel], **sizes}
+        for key, value in sizes.items():
+            totals[key] += value
+
+    # Siblings of sources that no longer exist
+    removed = 0
+    patterns = [pattern + ext for pattern in SOURCES for ext in ('.gz', '.br')]
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(root, pattern)):
+            source = path[:-3]
+            if not os.path.isfile(source):
+                os.remove(path)
+                removed += 1
+    for rel in [rel for rel in files if rel not in hashes]:
+        del files[rel]
+
+    state['settings'] = settings
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    with open(state_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=0, sort_keys=True)
+
+    skipped = len(hashes) - len(work)
+    print(f"Compressed {len(work)}, skipped {skipped} unchanged, removed {removed} stale file(s)")
+    if work:
+        line = (f"  {totals['source'] / 1024:.1f} KB -> {totals['minified'] / 1024:.1f} KB minified"
+                f" -> {totals['.gz'] / 1024:.1f} KB gzip")
+        if brotli is not None:
+            line += f", {totals['.br'] / 1024:.1f} KB brotli"
+        print(line)
+    if brotli is None:
+        print("  brotli is not installed; only .gz files were written")
+    return len(work), skipped, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write minified .gz/.br siblings of the site pages')
+    parser.add_argument('--jobs', type=int, default=0,
+                        help='Parallel worker processes (0 = one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='Recompress every file even if it is unchanged')
+    args = parser.parse_args()
+
+    jobs = args.jobs or os.cpu_count() or 1
+    compress_assets(jobs=jobs, force=args.force)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
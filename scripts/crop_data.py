@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Crop Data Model
+===============
+The crop registry (CROPS, BBCH_STAGES) and compact records built from it,
+shared by generate_tables_html.py and html_to_pptx.py.
+
+    crop = build_crop("alfalfa", "assets/images/crops")
+    crop.title                      # "Alfalfa (Medicago sativa)"
+    [s.code for s in crop.stages]   # BBCH codes of the stages shown
+
+A Crop lists the stages that have a PNG in the images directory (all 10 when
+none do, or when no directory is given), each as a Stage carrying its BBCH
+code, name, description, alt text and image path.
+"""
+
+import os
+import importlib.util
+from collections import namedtuple
+
+from image_inventory import existing_stages, stage_image
+
+
+NUM_STAGES = 10
+
+# This file; watched by the generators' --watch modes
+REGISTRY_PATH = os.path.abspath(__file__)
+
+# ============================================================
+# CROP DATABASE: slug -> (display_name, latin_name, crop_type)
+# crop_type determines which BBCH description set to use
+# ============================================================
+
+CROPS = {
+    "alfalfa": ("Alfalfa", "Medicago sativa", "forage"),
+    "artichoke": ("Artichoke", "Cynara cardunculus", "vegetable"),
+    "arugula": ("Arugula", "Eruca vesicaria", "leafy"),
+    "asparagus": ("Asparagus", "Asparagus officinalis", "vegetable"),
+    "banana-musaceae": ("Banana", "Musa acuminata", "fruit_tropical"),
+    "barley": ("Barley", "Hordeum vulgare", "cereal"),
+    "bean": ("Bean", "Phaseolus vulgaris", "legume"),
+    "bean-2": ("Bean", "Phaseolus vulgaris", "legume"),
+    "bok-choy": ("Bok Choy", "Brassica rapa subsp. chinensis", "leafy"),
+    "broccoli": ("Broccoli", "Brassica oleracea var. italica", "brassica"),
+    "brussels-sprouts": ("Brussels Sprouts", "Brassica oleracea var. gemmifera", "brassica"),
+    "buckwheat": ("Buckwheat", "Fagopyrum esculentum", "cereal"),
+    "carrot": ("Carrot", "Daucus carota", "root"),
+    "cauliflower": ("Cauliflower", "Brassica oleracea var. botrytis", "brassica"),
+    "cayenne-pepper": ("Cayenne Pepper", "Capsicum annuum", "solanaceae"),
+    "celery": ("Celery", "Apium graveolens", "vegetable"),
+    "chickpea-2": ("Chickpea", "Cicer arietinum", "legume"),
+    "chicory": ("Chicory", "Cichorium intybus", "leafy"),
+    "chicory-2": ("Chicory", "Cichorium intybus", "leafy"),
+    "clover": ("Clover", "Trifolium pratense", "forage"),
+    "clover-2": ("Clover", "Trifolium pratense", "forage"),
+    "common-vetch": ("Common Vetch", "Vicia sativa", "legume"),
+    "corn": ("Corn", "Zea mays", "cereal"),
+    "cotton": ("Cotton", "Gossypium hirsutum", "industrial"),
+    "cotton-2": ("Cotton", "Gossypium hirsutum", "industrial"),
+    "couch-grass": ("Couch Grass", "Elymus repens", "grass"),
+    "cowpea": ("Cowpea", "Vigna unguiculata", "legume"),
+    "cucumber": ("Cucumber", "Cucumis sativus", "cucurbit"),
+    "daikon": ("Daikon", "Raphanus sativus var. longipinnatus", "root"),
+    "dill": ("Dill", "Anethum graveolens", "herb"),
+    "eggplant": ("Eggplant", "Solanum melongena", "solanaceae"),
+    "fennel": ("Fennel", "Foeniculum vulgare", "herb"),
+    "flax": ("Flax", "Linum usitatissimum", "industrial"),
+    "flax-2": ("Flax", "Linum usitatissimum", "industrial"),
+    "garlic": ("Garlic", "Allium sativum", "bulb"),
+    "grape": ("Grape", "Vitis vinifera", "vine"),
+    "grape-2": ("Grape", "Vitis vinifera", "vine"),
+    "grape-3": ("Grape", "Vitis vinifera", "vine"),
+    "grape-4": ("Grape", "Vitis vinifera", "vine"),
+    "hemp": ("Hemp", "Cannabis sativa", "industrial"),
+    "hemp-2": ("Hemp", "Cannabis sativa", "industrial"),
+    "hops": ("Hops", "Humulus lupulus", "vine"),
+    "kale": ("Kale", "Brassica oleracea var. sabellica", "brassica"),
+    "kohlrabi": ("Kohlrabi", "Brassica oleracea var. gongylodes", "brassica"),
+    "leek": ("Leek", "Allium ampeloprasum", "bulb"),
+    "lentil": ("Lentil", "Lens culinaris", "legume"),
+    "lettuce": ("Lettuce", "Lactuca sativa", "leafy"),
+    "melon": ("Melon", "Cucumis melo", "cucurbit"),
+    "oat": ("Oat", "Avena sativa", "cereal"),
+    "oilseed-radish": ("Oilseed Radish", "Raphanus sativus var. oleiformis", "industrial"),
+    "okra": ("Okra", "Abelmoschus esculentus", "vegetable"),
+    "onion": ("Onion", "Allium cepa", "bulb"),
+    "parsnip": ("Parsnip", "Pastinaca sativa", "root"),
+    "pea": ("Pea", "Pisum sativum", "legume"),
+    "pea-2": ("Pea", "Pisum sativum", "legume"),
+    "peanut": ("Peanut", "Arachis hypogaea", "legume"),
+    "peanut-2": ("Peanut", "Arachis hypogaea", "legume"),
+    "pepper": ("Pepper", "Capsicum annuum", "solanaceae"),
+    "pepper-2": ("Pepper", "Capsicum annuum", "solanaceae"),
+    "perennial-ryegrass": ("Perennial Ryegrass", "Lolium perenne", "grass"),
+    "perennial-ryegrass-2": ("Perennial Ryegrass", "Lolium perenne", "grass"),
+    "pineapple": ("Pineapple", "Ananas comosus", "fruit_tropical"),
+    "potato": ("Potato", "Solanum tuberosum", "tuber"),
+    "potato-2": ("Potato", "Solanum tuberosum", "tuber"),
+    "pumpkin": ("Pumpkin", "Cucurbita maxima", "cucurbit"),
+    "quinoa": ("Quinoa", "Chenopodium quinoa", "cereal"),
+    "radish": ("Radish", "Raphanus sativus", "root"),
+    "rapeseed": ("Rapeseed", "Brassica napus", "oilseed"),
+    "red-beet": ("Red Beet", "Beta vulgaris", "root"),
+    "red-cabbage": ("Red Cabbage", "Brassica oleracea var. capitata f. rubra", "brassica"),
+    "rice": ("Rice", "Oryza sativa", "cereal"),
+    "rice-2": ("Rice", "Oryza sativa", "cereal"),
+    "rutabaga": ("Rutabaga", "Brassica napus var. napobrassica", "root"),
+    "sesame": ("Sesame", "Sesamum indicum", "oilseed"),
+    "sorghum": ("Sorghum", "Sorghum bicolor", "cereal"),
+    "soybean": ("Soybean", "Glycine max", "legume"),
+    "soybean-2": ("Soybean", "Glycine max", "legume"),
+    "soybean-3": ("Soybean", "Glycine max", "legume"),
+    "spinach": ("Spinach", "Spinacia oleracea", "leafy"),
+    "strawberry": ("Strawberry", "Fragaria × ananassa", "fruit_berry"),
+    "sugar-beet": ("Sugar Beet", "Beta vulgaris subsp. vulgaris", "root"),
+    "sugar-beet-2": ("Sugar Beet", "Beta vulgaris subsp. vulgaris", "root"),
+    "sugarcane": ("Sugarcane", "Saccharum officinarum", "grass"),
+    "sugarcane-2": ("Sugarcane", "Saccharum officinarum", "grass"),
+    "sunflower": ("Sunflower", "Helianthus annuus", "oilseed"),
+    "sweet-potato": ("Sweet Potato", "Ipomoea batatas", "tuber"),
+    "tomato": ("Tomato", "Solanum lycopersicum", "solanaceae"),
+    "tomato-2": ("Tomato", "Solanum lycopersicum", "solanaceae"),
+    "turnip": ("Turnip", "Brassica rapa", "root"),
+    "watermelon": ("Watermelon", "Citrullus lanatus", "cucurbit"),
+    "wheat": ("Wheat", "Triticum aestivum", "cereal"),
+    "white-cabbage": ("White Cabbage", "Brassica oleracea var. capitata", "brassica"),
+    "white-mustard": ("White Mustard", "Sinapis alba", "oilseed"),
+    "zucchini": ("Zucchini", "Cucurbita pepo", "cucurbit"),
+}
+
+# ============================================================
+# BBCH STAGE DESCRIPTIONS BY CROP TYPE
+# 10 stages: Germination, Sprouting, Emergence, Leaf dev,
+#            Stem elongation, Inflorescence, Flowering,
+#            Fruit dev, Ripening, Senescence
+# ============================================================
+
+BBCH_STAGES = {
+    "default": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Sprouting", "Emergence", "Leaf Development", "Stem Elongation", "Inflorescence", "Flowering", "Fruit Development", "Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition",
+            "Radicle emergence, seedling growth",
+            "Shoot emergence, cotyledon unfolding",
+            "Leaf unfolding, true leaves expand",
+            "Stem elongation, shoot development",
+            "Inflorescence emergence, bud formation",
+            "Flowering, anthesis",
+            "Fruit development and growth",
+            "Fruit ripening, color change",
+            "Plant senescence, drying"
+        ],
+        "alts": ["Seed", "Sprouting", "Emergence", "Leaf development", "Stem elongation", "Inflorescence", "Flowering", "Fruit development", "Ripening", "Senescence"]
+    },
+    "cereal": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Tillering", "Stem Elongation", "Booting", "Heading", "Flowering", "Grain Development", "Grain Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Coleoptile emergence, first leaves unfolding",
+            "Tiller formation, side shoots develop",
+            "Stem elongation, nodes visible",
+            "Flag leaf sheath swelling, booting",
+            "Head emergence from flag leaf sheath",
+            "Anthesis, pollen release",
+            "Grain filling, milk to dough stage",
+            "Grain ripening, hard dough to maturity",
+            "Plant drying, harvest ready"
+        ],
+        "alts": ["Seed", "Seedling", "Tillering", "Stem elongation", "Booting", "Heading", "Flowering", "Grain filling", "Grain ripening", "Senescence"]
+    },
+    "legume": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Sprouting", "Emergence", "Leaf Development", "Stem Elongation", "Bud Formation", "Flowering", "Pod Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, swelling",
+            "Radicle emergence, hypocotyl growth",
+            "Shoot emergence, cotyledon unfolding",
+            "Leaf and tendril development",
+            "Stem elongation, shoot growth",
+            "Bud formation, inflorescence emergence",
+            "Flowering, anthesis",
+            "Pod formation and growth",
+            "Seed ripening, pod yellowing",
+            "Plant drying, senescence"
+        ],
+        "alts": ["Seed", "Sprouting", "Emergence", "Leaf development", "Stem elongation", "Bud formation", "Flowering", "Pod development", "Ripening", "Senescence"]
+    },
+    "solanaceae": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Leaf Development", "Shoot Growth", "Side Shoot Formation", "Bud Formation", "Flowering", "Fruit Development", "Fruit Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon emergence, seedling growth",
+            "True leaf unfolding, leaf expansion",
+            "Main shoot elongation, branching",
+            "Side shoot development, canopy formation",
+            "Flower bud emergence, bud swelling",
+            "Flowering, petal opening",
+            "Fruit set and enlargement",
+            "Fruit ripening, color change",
+            "Plant senescence, leaf drop"
+        ],
+        "alts": ["Seed", "Seedling", "Leaf development", "Shoot growth", "Branching", "Bud formation", "Flowering", "Fruit development", "Fruit ripening", "Senescence"]
+    },
+    "cucurbit": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Leaf Development", "Vine Growth", "Runner Formation", "Bud Formation", "Flowering", "Fruit Development", "Fruit Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon emergence, hypocotyl growth",
+            "True leaf unfolding, leaf expansion",
+            "Vine elongation, tendril formation",
+            "Runner and lateral shoot development",
+            "Flower bud formation, bud visible",
+            "Male and female flowering",
+            "Fruit set, fruit enlargement",
+            "Fruit ripening, rind hardening",
+            "Plant senescence, vine drying"
+        ],
+        "alts": ["Seed", "Seedling", "Leaf development", "Vine growth", "Runner formation", "Bud formation", "Flowering", "Fruit development", "Fruit ripening", "Senescence"]
+    },
+    "root": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Leaf Development", "Root Thickening", "Harvestable Product", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon emergence, seedling growth",
+            "True leaf unfolding, rosette formation",
+            "Tap root begins thickening",
+            "Root reaches harvestable size",
+            "Bolting, inflorescence emergence",
+            "Flowering, anthesis",
+            "Seed development in pods",
+            "Seed ripening, pod drying",
+            "Plant senescence, leaf yellowing"
+        ],
+        "alts": ["Seed", "Seedling", "Leaf development", "Root thickening", "Harvestable root", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
+    },
+    "brassica": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Leaf Development", "Head Formation", "Head Growth", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon emergence, seedling growth",
+            "True leaf unfolding, rosette formation",
+            "Head or curd begins forming",
+            "Head or curd enlargement",
+            "Bolting, flower stalk emergence",
+            "Flowering, anthesis",
+            "Seed development in siliques",
+            "Seed ripening, silique drying",
+            "Plant senescence, drying"
+        ],
+        "alts": ["Seed", "Seedling", "Leaf development", "Head formation", "Head growth", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
+    },
+    "bulb": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Sprouting", "Leaf Development", "Bulb Formation", "Bulb Growth", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed or clove, imbibition",
+            "Radicle or root emergence, sprout growth",
+            "Leaf unfolding, leaf sheath development",
+            "Bulb begins swelling",
+            "Bulb enlargement, scale formation",
+            "Flower stalk elongation, spathe visible",
+            "Flowering, umbel opening",
+            "Seed development",
+            "Seed ripening, bulb maturity",
+            "Leaf yellowing, neck softening"
+        ],
+        "alts": ["Seed/Clove", "Sprouting", "Leaf development", "Bulb formation", "Bulb growth", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
+    },
+    "vine": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Dormancy", "Bud Break", "Leaf Development", "Shoot Growth", "Canopy Development", "Inflorescence", "Flowering", "Berry Development", "Berry Ripening", "Senescence"],
+        "descriptions": [
+            "Winter dormancy, bud scales closed",
+            "Bud swelling, bud break, shoot emergence",
+            "Leaf unfolding, leaves expand",
+            "Shoot elongation, tendril development",
+            "Canopy development, lateral shoots",
+            "Inflorescence visible, flower clusters form",
+            "Flowering, cap fall, fruit set",
+            "Berry development, veraison onset",
+            "Berry ripening, sugar accumulation",
+            "Leaf fall, cane maturation"
+        ],
+        "alts": ["Dormancy", "Bud break", "Leaf development", "Shoot growth", "Canopy", "Inflorescence", "Flowering", "Berry development", "Berry ripening", "Senescence"]
+    },
+    "tuber": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Sprouting", "Emergence", "Leaf Development", "Stem Elongation", "Tuber Initiation", "Inflorescence", "Flowering", "Tuber Bulking", "Tuber Maturity", "Senescence"],
+        "descriptions": [
+            "Seed tuber dormancy break, sprout growth",
+            "Shoot emergence from soil",
+            "Leaf unfolding, canopy development",
+            "Main stem elongation, branching",
+            "Stolon development, tuber initiation",
+            "Flower bud emergence",
+            "Flowering, petal opening",
+            "Tuber bulking, size increase",
+            "Tuber maturity, skin set",
+            "Haulm senescence, vine drying"
+        ],
+        "alts": ["Sprouting", "Emergence", "Leaf development", "Stem elongation", "Tuber initiation", "Inflorescence", "Flowering", "Tuber bulking", "Tuber maturity", "Senescence"]
+    },
+    "oilseed": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Rosette Formation", "Stem Elongation", "Stem Extension", "Bud Formation", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon emergence, seedling growth",
+            "Leaf unfolding, rosette formation",
+            "Stem visible, internodes elongate",
+            "Further stem extension, branching",
+            "Flower buds visible, bud cluster tight",
+            "Flowering, petals visible",
+            "Pod development, seed filling",
+            "Seed ripening, pod color change",
+            "Plant drying, harvest ready"
+        ],
+        "alts": ["Seed", "Seedling", "Rosette", "Stem elongation", "Stem extension", "Bud formation", "Flowering", "Seed development", "Seed ripening", "Senescence"]
+    },
+    "industrial": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Leaf Development", "Stem Elongation", "Vegetative Growth", "Bud Formation", "Flowering", "Fruit/Boll Development", "Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon emergence, seedling growth",
+            "True leaf development, leaf expansion",
+            "Main stem elongation, node development",
+            "Continued vegetative growth, branching",
+            "Flower bud initiation, square formation",
+            "Flowering, bloom opening",
+            "Boll or capsule development",
+            "Boll opening or capsule maturity",
+            "Plant defoliation, senescence"
+        ],
+        "alts": ["Seed", "Seedling", "Leaf development", "Stem elongation", "Vegetative growth", "Bud formation", "Flowering", "Boll/Capsule development", "Ripening", "Senescence"]
+    },
+    "forage": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Leaf Development", "Stem Elongation", "Vegetative Growth", "Bud Formation", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon or coleoptile emergence",
+            "Leaf unfolding, trifoliate development",
+            "Stem elongation, internode development",
+            "Continued vegetative growth, branching",
+            "Flower bud formation, bud visible",
+            "Flowering, inflorescence open",
+            "Seed set and development",
+            "Seed ripening, pod maturation",
+            "Plant senescence, regrowth potential"
+        ],
+        "alts": ["Seed", "Seedling", "Leaf development", "Stem elongation", "Vegetative growth", "Bud formation", "Flowering", "Seed development", "Seed ripening", "Senescence"]
+    },
+    "grass": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Tillering", "Stem Elongation", "Booting", "Heading", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Coleoptile emergence, first leaf",
+            "Tiller formation, side shoots develop",
+            "Stem elongation, nodes become visible",
+            "Flag leaf sheath swelling",
+            "Inflorescence emergence from sheath",
+            "Anthesis, pollen release",
+            "Caryopsis development, grain filling",
+            "Grain ripening, maturation",
+            "Plant drying, dormancy"
+        ],
+        "alts": ["Seed", "Seedling", "Tillering", "Stem elongation", "Booting", "Heading", "Flowering", "Seed development", "Seed ripening", "Senescence"]
+    },
+    "leafy": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Leaf Development", "Rosette Growth", "Harvestable Product", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon emergence, seedling growth",
+            "True leaf unfolding, leaf expansion",
+            "Rosette or head formation",
+            "Leaves reach harvestable size",
+            "Bolting, flower stalk elongation",
+            "Flowering, anthesis",
+            "Seed development",
+            "Seed ripening, drying",
+            "Plant senescence"
+        ],
+        "alts": ["Seed", "Seedling", "Leaf development", "Rosette growth", "Harvestable leaves", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
+    },
+    "herb": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Leaf Development", "Stem Elongation", "Vegetative Growth", "Bud Formation", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon emergence, seedling growth",
+            "True leaf unfolding, frond development",
+            "Main stem elongation",
+            "Continued vegetative growth, branching",
+            "Flower bud initiation, umbel forming",
+            "Flowering, umbel opening",
+            "Seed development on umbels",
+            "Seed ripening, drying",
+            "Plant senescence, drying"
+        ],
+        "alts": ["Seed", "Seedling", "Leaf development", "Stem elongation", "Vegetative growth", "Bud formation", "Flowering", "Seed development", "Seed ripening", "Senescence"]
+    },
+    "fruit_tropical": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Planting", "Sprouting", "Leaf Development", "Vegetative Growth", "Sucker Formation", "Inflorescence", "Flowering", "Fruit Development", "Fruit Ripening", "Senescence"],
+        "descriptions": [
+            "Planting material, initial root growth",
+            "Shoot emergence, first leaves",
+            "Leaf unfolding, leaf expansion",
+            "Continued vegetative growth",
+            "Sucker or ratoon formation",
+            "Inflorescence emergence, bud visible",
+            "Flowering, petal opening",
+            "Fruit development and enlargement",
+            "Fruit ripening, color change",
+            "Plant senescence, harvest"
+        ],
+        "alts": ["Planting", "Sprouting", "Leaf development", "Vegetative growth", "Sucker formation", "Inflorescence", "Flowering", "Fruit development", "Fruit ripening", "Senescence"]
+    },
+    "fruit_berry": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Dormancy", "Crown Growth", "Leaf Development", "Runner Formation", "Stolon Growth", "Inflorescence", "Flowering", "Fruit Development", "Fruit Ripening", "Senescence"],
+        "descriptions": [
+            "Dormancy, crown planting",
+            "Crown growth, first leaves emerging",
+            "Leaf unfolding, trifoliate leaves expand",
+            "Runner formation begins",
+            "Stolon elongation, daughter plants",
+            "Inflorescence emergence from crown",
+            "Flowering, petal opening",
+            "Fruit set, green fruit enlargement",
+            "Fruit ripening, color change",
+            "Leaf senescence, dormancy onset"
+        ],
+        "alts": ["Dormancy", "Crown growth", "Leaf development", "Runner formation", "Stolon growth", "Inflorescence", "Flowering", "Fruit development", "Fruit ripening", "Senescence"]
+    },
+    "vegetable": {
+        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
+        "names": ["Germination", "Seedling Growth", "Leaf Development", "Shoot Growth", "Harvestable Product", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
+        "descriptions": [
+            "Dry seed, imbibition, radicle emergence",
+            "Cotyledon emergence, seedling growth",
+            "True leaf unfolding, leaf expansion",
+            "Main shoot elongation, branching",
+            "Harvestable product development",
+            "Flower bud emergence",
+            "Flowering, anthesis",
+            "Seed development",
+            "Seed ripening",
+            "Plant senescence"
+        ],
+        "alts": ["Seed", "Seedling", "Leaf development", "Shoot growth", "Harvestable product", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
+    },
+}
+
+
+def reload_registry():
+    """Re-read CROPS and BBCH_STAGES from this file, updating the dicts in place.
+
+    Returns the slugs that were added, removed, or whose entry or BBCH
+    stage set changed. Modules that imported the dicts by name see the new
+    contents. If the file does not load (say, it is mid-edit) the error
+    propagates and the current registry is kept.
+    """
+    spec = importlib.util.spec_from_file_location("_crop_data_reload", REGISTRY_PATH)
+    fresh = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fresh)
+
+    def stages_of(registry, bbch, slug):
+        crop_type = registry[slug][2]
+        return bbch.get(crop_type, bbch["default"])
+
+    changed = {slug for slug in CROPS.keys() | fresh.CROPS.keys()
+               if slug not in CROPS or slug not in fresh.CROPS
+               or CROPS[slug] != fresh.CROPS[slug]
+               or (stages_of(CROPS, BBCH_STAGES, slug)
+                   != stages_of(fresh.CROPS, fresh.BBCH_STAGES, slug))}
+    for current, new in ((CROPS, fresh.CROPS), (BBCH_STAGES, fresh.BBCH_STAGES)):
+        current.clear()
+        current.update(new)
+    return changed
+
+
+def get_bbch(crop_type):
+    """Get BBCH data for a crop type, fallback to default."""
+    return BBCH_STAGES.get(crop_type, BBCH_STAGES["default"])
+
+
+# ============================================================
+# RECORDS
+# ============================================================
+
+Stage = namedtuple('Stage', ['number', 'code', 'name', 'description', 'alt', 'image'])
+Stage.__doc__ = """One growth stage of a crop; `image` is a file path or None."""
+
+
+class Crop(namedtuple('Crop', ['slug', 'title', 'display_name', 'latin_name',
+                               'crop_type', 'stages'])):
+    """One crop as shown on its page and slide; `stages` is a tuple of Stage."""
+
+    __slots__ = ()
+
+
+def stage_numbers(slug, images_dir=None):
+    """Stages shown for a crop: those with a PNG, else all 10."""
+    if images_dir:
+        existing = existing_stages(images_dir, slug, exts=(".png",), num_stages=NUM_STAGES)
+        if existing:
+            return existing
+    return list(range(1, NUM_STAGES + 1))
+
+
+def make_crop(slug, display_name, latin_name, crop_type, images_dir=None):
+    """Build a Crop record from registry-style fields."""
+    bbch = get_bbch(crop_type)
+    stages = tuple(
+        Stage(
+            number=i,
+            code=bbch["codes"][i - 1],
+            name=bbch["names"][i - 1],
+            description=bbch["descriptions"][i - 1],
+            alt=bbch["alts"][i - 1],
+            image=stage_image(images_dir, slug, i) if images_dir else None,
+        )
+        for i in stage_numbers(slug, images_dir)
+    )
+    return Crop(slug, f"{display_name} ({latin_name})", display_name, latin_name,
+                crop_type, stages)
+
+
+def build_crop(slug, images_dir=None, registry=None):
+    """Build the Crop record for a slug in CROPS (or in `registry`)."""
+    registry = CROPS if registry is None else registry
+    return make_crop(slug, *registry[slug], images_dir=images_dir)
+
+
+def load_crops(images_dir=None, registry=None):
+    """Build records for every crop in CROPS (or `registry`), as {slug: Crop}."""
+    registry = CROPS if registry is None else registry
+    return {slug: make_crop(slug, *registry[slug], images_dir=images_dir)
+            for slug in sorted(registry)}
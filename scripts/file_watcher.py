@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+File Watcher
+============
+Reports batches of changed files under a set of directories and files, for
+the --watch modes of generate_tables_html.py and html_to_pptx.py.
+
+    watcher = FileWatcher(["templates", "assets/images/crops"])
+    for changed in watcher.changes():
+        print(sorted(changed))          # absolute paths
+
+On Linux the kernel's inotify API is used through ctypes, so a change is
+seen as soon as the file is closed; elsewhere (or if inotify is
+unavailable) the watched trees are polled for mtime/size changes. Changes
+are debounced: a batch is reported once no further event arrived for
+`debounce` seconds, so copying in a folder of images gives one rebuild.
+
+Directories are watched recursively, and a file path is watched through
+its parent directory so editors that save by renaming are still seen.
+Hidden files and editor backups (.name, name~, *.swp, *.tmp) are ignored.
+If the kernel's event queue overflows, the batch holds the watched roots
+themselves, meaning "anything may have changed".
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+
+IGNORED_SUFFIXES = ('~', '.swp', '.swx', '.tmp', '.part')
+
+# inotify(7) constants
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct('iIII')     # wd, mask, cookie, len
+
+
+def is_ignored(name):
+    return name.startswith('.') or name.endswith(IGNORED_SUFFIXES)
+
+
+# ─── INOTIFY ───────────────────────────────────────────────────────
+
+def _load_libc():
+    """libc with inotify_init1/inotify_add_watch, or None."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class _Inotify:
+    """Recursive inotify watches over directory trees."""
+
+    name = 'inotify'
+
+    def __init__(self, libc, trees, flat):
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f'inotify_init1: {os.strerror(err)}')
+        self._dirs = {}          # watch descriptor -> directory
+        self._flat = set()       # watch descriptors whose subdirectories are not watched
+        for path in trees:
+            self._add_tree(path)
+        for path in flat:
+            wd = self._add_watch(path)
+            if wd is not None:
+                self._flat.add(wd)
+
+    def _add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, 'inotify watch limit reached '
+                                   '(raise fs.inotify.max_user_watches)')
+            return None
+        self._dirs[wd] = path
+        return wd
+
+    def _add_tree(self, root):
+        """Watch root and its subdirectories; returns the files found in them."""
+        found = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not is_ignored(d)]
+            if self._add_watch(dirpath) is not None:
+                found.extend(os.path.join(dirpath, f) for f in filenames if not is_ignored(f))
+        return found
+
+    def read(self, timeout):
+        """Changed paths from events arriving within `timeout` seconds.
+
+        Returns None if the queue overflowed.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(buf, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(buf[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                return None
+            directory = self._dirs.get(wd)
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            if directory is None or (name and is_ignored(name)):
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and wd not in self._flat:
+                # A new directory may already hold files by the time it is watched
+                changed.update(self._add_tree(path))
+            changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+# ─── POLLING ───────────────────────────────────────────────────────
+
+class _Poller:
+    """Fallback: compare (mtime, size) snapshots of the watched trees."""
+
+    name = 'polling'
+
+    def __init__(self, trees, flat, interval):
+        self._trees = list(trees)
+        self._flat = list(flat)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for root in self._trees + self._flat:
+            for dirpath, dirnames, filenames in os.walk(root):
+                if root in self._flat:
+                    dirnames[:] = []
+                dirnames[:] = [d for d in dirnames if not is_ignored(d)]
+                for name in filenames:
+                    if is_ignored(name):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def read(self, timeout):
+        time.sleep(min(timeout, self.interval) if timeout is not None else self.interval)
+        snapshot = self._scan()
+        old = self._snapshot
+        self._snapshot = snapshot
+        return {path for path in old.keys() | snapshot.keys()
+                if old.get(path) != snapshot.get(path)}
+
+    def close(self):
+        pass
+
+
+# ─── WATCHER ───────────────────────────────────────────────────────
+
+class FileWatcher:
+    """Watch directories (recursively) and individual files for changes.
+
+    `backend` is 'auto' (inotify where available, else polling),
+    'inotify' or 'poll'.
+    """
+
+    def __init__(self, paths, debounce=0.1, poll_interval=0.5, backend='auto'):
+        self.roots = [os.path.abspath(p) for p in paths]
+        self.debounce = debounce
+        self._files = {p for p in self.roots if not os.path.isdir(p)}
+        trees = {p for p in self.roots if p not in self._files}
+        # Drop directories already covered by a watched parent
+        trees = sorted(d for d in trees if not any(d.startswith(o + os.sep) for o in trees))
+        # A file is watched through its directory, without subdirectories
+        flat = sorted({os.path.dirname(p) for p in self._files}
+                      - {d for d in map(os.path.dirname, self._files)
+                         if any(d == t or d.startswith(t + os.sep) for t in trees)})
+
+        libc = _load_libc() if backend in ('auto', 'inotify') else None
+        if backend == 'inotify' and libc is None:
+            raise OSError('inotify is not available on this system')
+        self._backend = (_Inotify(libc, trees, flat) if libc
+                         else _Poller(trees, flat, poll_interval))
+
+    @property
+    def backend(self):
+        return self._backend.name
+
+    def _wanted(self, path):
+        """Whether a change to path is inside what was asked to be watched."""
+        for root in self.roots:
+            if path == root or (root not in self._files and path.startswith(root + os.sep)):
+                return True
+        return False
+
+    def wait(self, timeout=None):
+        """Block until something changed; returns the debounced set of paths.
+
+        Returns an empty set if `timeout` seconds pass without a change.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        while True:
+            if changed:
+                wait_for = self.debounce
+            elif deadline is None:
+                wait_for = 1.0
+            else:
+                wait_for = max(0.0, deadline - time.monotonic())
+            batch = self._backend.read(wait_for)
+            if batch is None:
+                return set(self.roots)
+            batch = {path for path in batch if self._wanted(path)}
+            if batch:
+                changed |= batch
+            elif changed:
+                return changed
+            elif deadline is not None and time.monotonic() >= deadline:
+                return changed
+
+    def changes(self):
+        """Yield a set of changed paths for every debounced batch, forever."""
+        while True:
+            yield self.wait()
+
+    def close(self):
+        self._backend.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
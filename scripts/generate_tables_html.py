@@ -8,804 +8,671 @@ Each page is a self-contained HTML file with:
 - English language (lang="en")
 - BBCH stage descriptions specific to each crop type
 - Desktop table + mobile cards layout
+
+Rebuilds are incremental: a hash of each page's inputs is recorded in
+.build-manifest.json and pages whose inputs are unchanged are skipped.
+The catalog in all-crops.html and its table chunks in crops/catalog/ are
+regenerated from the page fragments on every build.
+With --watch the process stays up and rebuilds the pages affected by each
+change to templates/, the crop registry or the images directory.
 """
 
 import os
 import html
+import json
+import hashlib
+import re
+import math
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+from image_inventory import existing_stages as inventory_stages, clear_cache as clear_inventory
+from image_derivatives import (
+    FORMATS as DERIVED_FORMATS, DERIVED_INDEX, build_derivatives, load_derived_index,
+)
+from image_atlas import build_atlases, load_atlas_index
+from page_templates import (
+    TEMPLATES_DIR, load_template, read_template, render_stats, reset_render_stats,
+)
+from crop_data import (
+    CROPS, BBCH_STAGES, REGISTRY_PATH, get_bbch, make_crop, load_crops, reload_registry,
+)
+
+
+# Mobile cards visible without scrolling; later cards get loading="lazy"
+MOBILE_EAGER_CARDS = 3
+
+
+def find_existing_stages(slug, images_base_dir):
+    """Return the stage numbers (1-10) that have a PNG for this slug."""
+    return inventory_stages(images_base_dir, slug, exts=(".png",))
+
+
+def generate_crop_html(slug, display_name, latin_name, crop_type, images_base_dir=None,
+                       derived=None, atlas=None):
+    """Generate a complete self-contained HTML page for one crop.
+    
+    If images_base_dir is provided, only stages with existing PNG files
+    will be included. Otherwise all 10 stages are included.
+    `derived` is the image derivative index (see image_derivatives.py) and
+    `atlas` the strip atlas index (see image_atlas.py).
+    """
+    crop = make_crop(slug, display_name, latin_name, crop_type, images_base_dir)
+    return render_crop_page(crop, derived, atlas)
 
-# ============================================================
-# CROP DATABASE: slug -> (display_name, latin_name, crop_type)
-# crop_type determines which BBCH description set to use
-# ============================================================
 
-CROPS = {
-    "alfalfa": ("Alfalfa", "Medicago sativa", "forage"),
-    "artichoke": ("Artichoke", "Cynara cardunculus", "vegetable"),
-    "arugula": ("Arugula", "Eruca vesicaria", "leafy"),
-    "asparagus": ("Asparagus", "Asparagus officinalis", "vegetable"),
-    "banana-musaceae": ("Banana", "Musa acuminata", "fruit_tropical"),
-    "barley": ("Barley", "Hordeum vulgare", "cereal"),
-    "bean": ("Bean", "Phaseolus vulgaris", "legume"),
-    "bean-2": ("Bean", "Phaseolus vulgaris", "legume"),
-    "bok-choy": ("Bok Choy", "Brassica rapa subsp. chinensis", "leafy"),
-    "broccoli": ("Broccoli", "Brassica oleracea var. italica", "brassica"),
-    "brussels-sprouts": ("Brussels Sprouts", "Brassica oleracea var. gemmifera", "brassica"),
-    "buckwheat": ("Buckwheat", "Fagopyrum esculentum", "cereal"),
-    "carrot": ("Carrot", "Daucus carota", "root"),
-    "cauliflower": ("Cauliflower", "Brassica oleracea var. botrytis", "brassica"),
-    "cayenne-pepper": ("Cayenne Pepper", "Capsicum annuum", "solanaceae"),
-    "celery": ("Celery", "Apium graveolens", "vegetable"),
-    "chickpea-2": ("Chickpea", "Cicer arietinum", "legume"),
-    "chicory": ("Chicory", "Cichorium intybus", "leafy"),
-    "chicory-2": ("Chicory", "Cichorium intybus", "leafy"),
-    "clover": ("Clover", "Trifolium pratense", "forage"),
-    "clover-2": ("Clover", "Trifolium pratense", "forage"),
-    "common-vetch": ("Common Vetch", "Vicia sativa", "legume"),
-    "corn": ("Corn", "Zea mays", "cereal"),
-    "cotton": ("Cotton", "Gossypium hirsutum", "industrial"),
-    "cotton-2": ("Cotton", "Gossypium hirsutum", "industrial"),
-    "couch-grass": ("Couch Grass", "Elymus repens", "grass"),
-    "cowpea": ("Cowpea", "Vigna unguiculata", "legume"),
-    "cucumber": ("Cucumber", "Cucumis sativus", "cucurbit"),
-    "daikon": ("Daikon", "Raphanus sativus var. longipinnatus", "root"),
-    "dill": ("Dill", "Anethum graveolens", "herb"),
-    "eggplant": ("Eggplant", "Solanum melongena", "solanaceae"),
-    "fennel": ("Fennel", "Foeniculum vulgare", "herb"),
-    "flax": ("Flax", "Linum usitatissimum", "industrial"),
-    "flax-2": ("Flax", "Linum usitatissimum", "industrial"),
-    "garlic": ("Garlic", "Allium sativum", "bulb"),
-    "grape": ("Grape", "Vitis vinifera", "vine"),
-    "grape-2": ("Grape", "Vitis vinifera", "vine"),
-    "grape-3": ("Grape", "Vitis vinifera", "vine"),
-    "grape-4": ("Grape", "Vitis vinifera", "vine"),
-    "hemp": ("Hemp", "Cannabis sativa", "industrial"),
-    "hemp-2": ("Hemp", "Cannabis sativa", "industrial"),
-    "hops": ("Hops", "Humulus lupulus", "vine"),
-    "kale": ("Kale", "Brassica oleracea var. sabellica", "brassica"),
-    "kohlrabi": ("Kohlrabi", "Brassica oleracea var. gongylodes", "brassica"),
-    "leek": ("Leek", "Allium ampeloprasum", "bulb"),
-    "lentil": ("Lentil", "Lens culinaris", "legume"),
-    "lettuce": ("Lettuce", "Lactuca sativa", "leafy"),
-    "melon": ("Melon", "Cucumis melo", "cucurbit"),
-    "oat": ("Oat", "Avena sativa", "cereal"),
-    "oilseed-radish": ("Oilseed Radish", "Raphanus sativus var. oleiformis", "industrial"),
-    "okra": ("Okra", "Abelmoschus esculentus", "vegetable"),
-    "onion": ("Onion", "Allium cepa", "bulb"),
-    "parsnip": ("Parsnip", "Pastinaca sativa", "root"),
-    "pea": ("Pea", "Pisum sativum", "legume"),
-    "pea-2": ("Pea", "Pisum sativum", "legume"),
-    "peanut": ("Peanut", "Arachis hypogaea", "legume"),
-    "peanut-2": ("Peanut", "Arachis hypogaea", "legume"),
-    "pepper": ("Pepper", "Capsicum annuum", "solanaceae"),
-    "pepper-2": ("Pepper", "Capsicum annuum", "solanaceae"),
-    "perennial-ryegrass": ("Perennial Ryegrass", "Lolium perenne", "grass"),
-    "perennial-ryegrass-2": ("Perennial Ryegrass", "Lolium perenne", "grass"),
-    "pineapple": ("Pineapple", "Ananas comosus", "fruit_tropical"),
-    "potato": ("Potato", "Solanum tuberosum", "tuber"),
-    "potato-2": ("Potato", "Solanum tuberosum", "tuber"),
-    "pumpkin": ("Pumpkin", "Cucurbita maxima", "cucurbit"),
-    "quinoa": ("Quinoa", "Chenopodium quinoa", "cereal"),
-    "radish": ("Radish", "Raphanus sativus", "root"),
-    "rapeseed": ("Rapeseed", "Brassica napus", "oilseed"),
-    "red-beet": ("Red Beet", "Beta vulgaris", "root"),
-    "red-cabbage": ("Red Cabbage", "Brassica oleracea var. capitata f. rubra", "brassica"),
-    "rice": ("Rice", "Oryza sativa", "cereal"),
-    "rice-2": ("Rice", "Oryza sativa", "cereal"),
-    "rutabaga": ("Rutabaga", "Brassica napus var. napobrassica", "root"),
-    "sesame": ("Sesame", "Sesamum indicum", "oilseed"),
-    "sorghum": ("Sorghum", "Sorghum bicolor", "cereal"),
-    "soybean": ("Soybean", "Glycine max", "legume"),
-    "soybean-2": ("Soybean", "Glycine max", "legume"),
-    "soybean-3": ("Soybean", "Glycine max", "legume"),
-    "spinach": ("Spinach", "Spinacia oleracea", "leafy"),
-    "strawberry": ("Strawberry", "Fragaria × ananassa", "fruit_berry"),
-    "sugar-beet": ("Sugar Beet", "Beta vulgaris subsp. vulgaris", "root"),
-    "sugar-beet-2": ("Sugar Beet", "Beta vulgaris subsp. vulgaris", "root"),
-    "sugarcane": ("Sugarcane", "Saccharum officinarum", "grass"),
-    "sugarcane-2": ("Sugarcane", "Saccharum officinarum", "grass"),
-    "sunflower": ("Sunflower", "Helianthus annuus", "oilseed"),
-    "sweet-potato": ("Sweet Potato", "Ipomoea batatas", "tuber"),
-    "tomato": ("Tomato", "Solanum lycopersicum", "solanaceae"),
-    "tomato-2": ("Tomato", "Solanum lycopersicum", "solanaceae"),
-    "turnip": ("Turnip", "Brassica rapa", "root"),
-    "watermelon": ("Watermelon", "Citrullus lanatus", "cucurbit"),
-    "wheat": ("Wheat", "Triticum aestivum", "cereal"),
-    "white-cabbage": ("White Cabbage", "Brassica oleracea var. capitata", "brassica"),
-    "white-mustard": ("White Mustard", "Sinapis alba", "oilseed"),
-    "zucchini": ("Zucchini", "Cucurbita pepo", "cucurbit"),
-}
+def derived_entry(crop, st, derived):
+    """The derivative index entry for a stage image, or None."""
+    if not derived:
+        return None
+    return derived.get(f"{crop.slug}/{crop.slug}_stage_{st.number}.png")
 
-# ============================================================
-# BBCH STAGE DESCRIPTIONS BY CROP TYPE
-# 10 stages: Germination, Sprouting, Emergence, Leaf dev,
-#            Stem elongation, Inflorescence, Flowering,
-#            Fruit dev, Ripening, Senescence
-# ============================================================
-
-BBCH_STAGES = {
-    "default": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Sprouting", "Emergence", "Leaf Development", "Stem Elongation", "Inflorescence", "Flowering", "Fruit Development", "Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition",
-            "Radicle emergence, seedling growth",
-            "Shoot emergence, cotyledon unfolding",
-            "Leaf unfolding, true leaves expand",
-            "Stem elongation, shoot development",
-            "Inflorescence emergence, bud formation",
-            "Flowering, anthesis",
-            "Fruit development and growth",
-            "Fruit ripening, color change",
-            "Plant senescence, drying"
-        ],
-        "alts": ["Seed", "Sprouting", "Emergence", "Leaf development", "Stem elongation", "Inflorescence", "Flowering", "Fruit development", "Ripening", "Senescence"]
-    },
-    "cereal": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Tillering", "Stem Elongation", "Booting", "Heading", "Flowering", "Grain Development", "Grain Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Coleoptile emergence, first leaves unfolding",
-            "Tiller formation, side shoots develop",
-            "Stem elongation, nodes visible",
-            "Flag leaf sheath swelling, booting",
-            "Head emergence from flag leaf sheath",
-            "Anthesis, pollen release",
-            "Grain filling, milk to dough stage",
-            "Grain ripening, hard dough to maturity",
-            "Plant drying, harvest ready"
-        ],
-        "alts": ["Seed", "Seedling", "Tillering", "Stem elongation", "Booting", "Heading", "Flowering", "Grain filling", "Grain ripening", "Senescence"]
-    },
-    "legume": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Sprouting", "Emergence", "Leaf Development", "Stem Elongation", "Bud Formation", "Flowering", "Pod Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, swelling",
-            "Radicle emergence, hypocotyl growth",
-            "Shoot emergence, cotyledon unfolding",
-            "Leaf and tendril development",
-            "Stem elongation, shoot growth",
-            "Bud formation, inflorescence emergence",
-            "Flowering, anthesis",
-            "Pod formation and growth",
-            "Seed ripening, pod yellowing",
-            "Plant drying, senescence"
-        ],
-        "alts": ["Seed", "Sprouting", "Emergence", "Leaf development", "Stem elongation", "Bud formation", "Flowering", "Pod development", "Ripening", "Senescence"]
-    },
-    "solanaceae": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Leaf Development", "Shoot Growth", "Side Shoot Formation", "Bud Formation", "Flowering", "Fruit Development", "Fruit Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon emergence, seedling growth",
-            "True leaf unfolding, leaf expansion",
-            "Main shoot elongation, branching",
-            "Side shoot development, canopy formation",
-            "Flower bud emergence, bud swelling",
-            "Flowering, petal opening",
-            "Fruit set and enlargement",
-            "Fruit ripening, color change",
-            "Plant senescence, leaf drop"
-        ],
-        "alts": ["Seed", "Seedling", "Leaf development", "Shoot growth", "Branching", "Bud formation", "Flowering", "Fruit development", "Fruit ripening", "Senescence"]
-    },
-    "cucurbit": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Leaf Development", "Vine Growth", "Runner Formation", "Bud Formation", "Flowering", "Fruit Development", "Fruit Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon emergence, hypocotyl growth",
-            "True leaf unfolding, leaf expansion",
-            "Vine elongation, tendril formation",
-            "Runner and lateral shoot development",
-            "Flower bud formation, bud visible",
-            "Male and female flowering",
-            "Fruit set, fruit enlargement",
-            "Fruit ripening, rind hardening",
-            "Plant senescence, vine drying"
-        ],
-        "alts": ["Seed", "Seedling", "Leaf development", "Vine growth", "Runner formation", "Bud formation", "Flowering", "Fruit development", "Fruit ripening", "Senescence"]
-    },
-    "root": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Leaf Development", "Root Thickening", "Harvestable Product", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon emergence, seedling growth",
-            "True leaf unfolding, rosette formation",
-            "Tap root begins thickening",
-            "Root reaches harvestable size",
-            "Bolting, inflorescence emergence",
-            "Flowering, anthesis",
-            "Seed development in pods",
-            "Seed ripening, pod drying",
-            "Plant senescence, leaf yellowing"
-        ],
-        "alts": ["Seed", "Seedling", "Leaf development", "Root thickening", "Harvestable root", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
-    },
-    "brassica": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Leaf Development", "Head Formation", "Head Growth", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon emergence, seedling growth",
-            "True leaf unfolding, rosette formation",
-            "Head or curd begins forming",
-            "Head or curd enlargement",
-            "Bolting, flower stalk emergence",
-            "Flowering, anthesis",
-            "Seed development in siliques",
-            "Seed ripening, silique drying",
-            "Plant senescence, drying"
-        ],
-        "alts": ["Seed", "Seedling", "Leaf development", "Head formation", "Head growth", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
-    },
-    "bulb": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Sprouting", "Leaf Development", "Bulb Formation", "Bulb Growth", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed or clove, imbibition",
-            "Radicle or root emergence, sprout growth",
-            "Leaf unfolding, leaf sheath development",
-            "Bulb begins swelling",
-            "Bulb enlargement, scale formation",
-            "Flower stalk elongation, spathe visible",
-            "Flowering, umbel opening",
-            "Seed development",
-            "Seed ripening, bulb maturity",
-            "Leaf yellowing, neck softening"
-        ],
-        "alts": ["Seed/Clove", "Sprouting", "Leaf development", "Bulb formation", "Bulb growth", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
-    },
-    "vine": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Dormancy", "Bud Break", "Leaf Development", "Shoot Growth", "Canopy Development", "Inflorescence", "Flowering", "Berry Development", "Berry Ripening", "Senescence"],
-        "descriptions": [
-            "Winter dormancy, bud scales closed",
-            "Bud swelling, bud break, shoot emergence",
-            "Leaf unfolding, leaves expand",
-            "Shoot elongation, tendril development",
-            "Canopy development, lateral shoots",
-            "Inflorescence visible, flower clusters form",
-            "Flowering, cap fall, fruit set",
-            "Berry development, veraison onset",
-            "Berry ripening, sugar accumulation",
-            "Leaf fall, cane maturation"
-        ],
-        "alts": ["Dormancy", "Bud break", "Leaf development", "Shoot growth", "Canopy", "Inflorescence", "Flowering", "Berry development", "Berry ripening", "Senescence"]
-    },
-    "tuber": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Sprouting", "Emergence", "Leaf Development", "Stem Elongation", "Tuber Initiation", "Inflorescence", "Flowering", "Tuber Bulking", "Tuber Maturity", "Senescence"],
-        "descriptions": [
-            "Seed tuber dormancy break, sprout growth",
-            "Shoot emergence from soil",
-            "Leaf unfolding, canopy development",
-            "Main stem elongation, branching",
-            "Stolon development, tuber initiation",
-            "Flower bud emergence",
-            "Flowering, petal opening",
-            "Tuber bulking, size increase",
-            "Tuber maturity, skin set",
-            "Haulm senescence, vine drying"
-        ],
-        "alts": ["Sprouting", "Emergence", "Leaf development", "Stem elongation", "Tuber initiation", "Inflorescence", "Flowering", "Tuber bulking", "Tuber maturity", "Senescence"]
-    },
-    "oilseed": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Rosette Formation", "Stem Elongation", "Stem Extension", "Bud Formation", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon emergence, seedling growth",
-            "Leaf unfolding, rosette formation",
-            "Stem visible, internodes elongate",
-            "Further stem extension, branching",
-            "Flower buds visible, bud cluster tight",
-            "Flowering, petals visible",
-            "Pod development, seed filling",
-            "Seed ripening, pod color change",
-            "Plant drying, harvest ready"
-        ],
-        "alts": ["Seed", "Seedling", "Rosette", "Stem elongation", "Stem extension", "Bud formation", "Flowering", "Seed development", "Seed ripening", "Senescence"]
-    },
-    "industrial": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Leaf Development", "Stem Elongation", "Vegetative Growth", "Bud Formation", "Flowering", "Fruit/Boll Development", "Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon emergence, seedling growth",
-            "True leaf development, leaf expansion",
-            "Main stem elongation, node development",
-            "Continued vegetative growth, branching",
-            "Flower bud initiation, square formation",
-            "Flowering, bloom opening",
-            "Boll or capsule development",
-            "Boll opening or capsule maturity",
-            "Plant defoliation, senescence"
-        ],
-        "alts": ["Seed", "Seedling", "Leaf development", "Stem elongation", "Vegetative growth", "Bud formation", "Flowering", "Boll/Capsule development", "Ripening", "Senescence"]
-    },
-    "forage": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Leaf Development", "Stem Elongation", "Vegetative Growth", "Bud Formation", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon or coleoptile emergence",
-            "Leaf unfolding, trifoliate development",
-            "Stem elongation, internode development",
-            "Continued vegetative growth, branching",
-            "Flower bud formation, bud visible",
-            "Flowering, inflorescence open",
-            "Seed set and development",
-            "Seed ripening, pod maturation",
-            "Plant senescence, regrowth potential"
-        ],
-        "alts": ["Seed", "Seedling", "Leaf development", "Stem elongation", "Vegetative growth", "Bud formation", "Flowering", "Seed development", "Seed ripening", "Senescence"]
-    },
-    "grass": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Tillering", "Stem Elongation", "Booting", "Heading", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Coleoptile emergence, first leaf",
-            "Tiller formation, side shoots develop",
-            "Stem elongation, nodes become visible",
-            "Flag leaf sheath swelling",
-            "Inflorescence emergence from sheath",
-            "Anthesis, pollen release",
-            "Caryopsis development, grain filling",
-            "Grain ripening, maturation",
-            "Plant drying, dormancy"
-        ],
-        "alts": ["Seed", "Seedling", "Tillering", "Stem elongation", "Booting", "Heading", "Flowering", "Seed development", "Seed ripening", "Senescence"]
-    },
-    "leafy": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Leaf Development", "Rosette Growth", "Harvestable Product", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon emergence, seedling growth",
-            "True leaf unfolding, leaf expansion",
-            "Rosette or head formation",
-            "Leaves reach harvestable size",
-            "Bolting, flower stalk elongation",
-            "Flowering, anthesis",
-            "Seed development",
-            "Seed ripening, drying",
-            "Plant senescence"
-        ],
-        "alts": ["Seed", "Seedling", "Leaf development", "Rosette growth", "Harvestable leaves", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
-    },
-    "herb": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Leaf Development", "Stem Elongation", "Vegetative Growth", "Bud Formation", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon emergence, seedling growth",
-            "True leaf unfolding, frond development",
-            "Main stem elongation",
-            "Continued vegetative growth, branching",
-            "Flower bud initiation, umbel forming",
-            "Flowering, umbel opening",
-            "Seed development on umbels",
-            "Seed ripening, drying",
-            "Plant senescence, drying"
-        ],
-        "alts": ["Seed", "Seedling", "Leaf development", "Stem elongation", "Vegetative growth", "Bud formation", "Flowering", "Seed development", "Seed ripening", "Senescence"]
-    },
-    "fruit_tropical": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Planting", "Sprouting", "Leaf Development", "Vegetative Growth", "Sucker Formation", "Inflorescence", "Flowering", "Fruit Development", "Fruit Ripening", "Senescence"],
-        "descriptions": [
-            "Planting material, initial root growth",
-            "Shoot emergence, first leaves",
-            "Leaf unfolding, leaf expansion",
-            "Continued vegetative growth",
-            "Sucker or ratoon formation",
-            "Inflorescence emergence, bud visible",
-            "Flowering, petal opening",
-            "Fruit development and enlargement",
-            "Fruit ripening, color change",
-            "Plant senescence, harvest"
-        ],
-        "alts": ["Planting", "Sprouting", "Leaf development", "Vegetative growth", "Sucker formation", "Inflorescence", "Flowering", "Fruit development", "Fruit ripening", "Senescence"]
-    },
-    "fruit_berry": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Dormancy", "Crown Growth", "Leaf Development", "Runner Formation", "Stolon Growth", "Inflorescence", "Flowering", "Fruit Development", "Fruit Ripening", "Senescence"],
-        "descriptions": [
-            "Dormancy, crown planting",
-            "Crown growth, first leaves emerging",
-            "Leaf unfolding, trifoliate leaves expand",
-            "Runner formation begins",
-            "Stolon elongation, daughter plants",
-            "Inflorescence emergence from crown",
-            "Flowering, petal opening",
-            "Fruit set, green fruit enlargement",
-            "Fruit ripening, color change",
-            "Leaf senescence, dormancy onset"
-        ],
-        "alts": ["Dormancy", "Crown growth", "Leaf development", "Runner formation", "Stolon growth", "Inflorescence", "Flowering", "Fruit development", "Fruit ripening", "Senescence"]
-    },
-    "vegetable": {
-        "codes": ["00–09", "10–19", "20–29", "30–39", "40–49", "51–59", "60–69", "70–79", "80–89", "90–99"],
-        "names": ["Germination", "Seedling Growth", "Leaf Development", "Shoot Growth", "Harvestable Product", "Inflorescence", "Flowering", "Seed Development", "Seed Ripening", "Senescence"],
-        "descriptions": [
-            "Dry seed, imbibition, radicle emergence",
-            "Cotyledon emergence, seedling growth",
-            "True leaf unfolding, leaf expansion",
-            "Main shoot elongation, branching",
-            "Harvestable product development",
-            "Flower bud emergence",
-            "Flowering, anthesis",
-            "Seed development",
-            "Seed ripening",
-            "Plant senescence"
-        ],
-        "alts": ["Seed", "Seedling", "Leaf development", "Shoot growth", "Harvestable product", "Inflorescence", "Flowering", "Seed development", "Seed ripening", "Senescence"]
-    },
-}
 
+def atlas_frame(crop, st, atlas):
+    """(atlas entry, [x, y, w, h]) of a stage in its crop's strip atlas, or None."""
+    entry = atlas.get(crop.slug) if atlas else None
+    if entry is None or str(st.number) not in entry["frames"]:
+        return None
+    return entry, entry["frames"][str(st.number)]
 
-def get_bbch(crop_type):
-    """Get BBCH data for a crop type, fallback to default."""
-    return BBCH_STAGES.get(crop_type, BBCH_STAGES["default"])
 
+def render_atlas_image(src, alt_attr, base, entry, frame):
+    """An <img> that shows its frame of a strip atlas as a CSS background.
 
-def generate_crop_html(slug, display_name, latin_name, crop_type, images_base_dir=None):
-    """Generate a complete self-contained HTML page for one crop.
-    
-    If images_base_dir is provided, only stages with existing PNG files
-    will be included. Otherwise all 10 stages are included.
+    The src is an empty SVG with the frame's intrinsic size, so the
+    element lays out exactly like the stage PNG would; data-src keeps the
+    PNG path for tools that read the pages.
+    """
+    x, y, w, h = frame
+    pos_x = x / (entry["width"] - w) * 100 if entry["width"] > w else 0
+    pos_y = y / (entry["height"] - h) * 100 if entry["height"] > h else 0
+    size = f'{entry["width"] / w * 100:.6g}% {entry["height"] / h * 100:.6g}%'
+    placeholder = f"data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='{w}' height='{h}'/%3E"
+    background = (f"background:url({base}assets/images/atlas/{html.escape(entry['file'])}) "
+                  f"{pos_x:.6g}% {pos_y:.6g}%/{size} no-repeat")
+    return (f'<img src="{placeholder}" data-src="{src}" {alt_attr} '
+            f'width="{w}" height="{h}" style="{background}">')
+
+
+def render_stage_image(crop, st, base="../", derived=None, lazy=False, atlas=None):
+    """Render the <img> for one stage.
+
+    With an atlas index the stage is drawn from its crop's strip atlas.
+    Otherwise, when the image has derivatives it is wrapped in a <picture>
+    with AVIF and WebP srcsets and gets width/height, so the browser can
+    reserve its box and pick the smallest file for the displayed size.
+    """
+    dn = html.escape(crop.display_name)
+    slug_e = html.escape(crop.slug)
+    alt = html.escape(st.alt)
+    src = f"{base}assets/images/crops/{slug_e}/{slug_e}_stage_{st.number}.png"
+    alt_attr = f'alt="{dn} Stage {st.number} — {alt}"'
+
+    frame = atlas_frame(crop, st, atlas)
+    if frame is not None:
+        return render_atlas_image(src, alt_attr, base, *frame)
+
+    img = f'<img src="{src}" {alt_attr}'
+    entry = derived_entry(crop, st, derived)
+    if entry is None:
+        return img + ">"
+
+    # Displayed widths: 70px mobile cards, table images capped at 140px/220px tall
+    aspect = entry["width"] / entry["height"]
+    sizes = (f"(max-width: 540px) 70px, (max-width: 800px) {math.ceil(140 * aspect)}px, "
+             f"{math.ceil(220 * aspect)}px")
+    sources = []
+    for fmt in DERIVED_FORMATS:
+        if entry.get(fmt):
+            srcset = ", ".join(f"{base}assets/images/derived/{html.escape(rel)} {w}w"
+                               for w, rel in entry[fmt])
+            sources.append(f'<source type="image/{fmt}" srcset="{srcset}" sizes="{sizes}">')
+    loading = ' loading="lazy"' if lazy else ""
+    img += f' width="{entry["width"]}" height="{entry["height"]}"{loading} decoding="async">'
+    return f'<picture>{"".join(sources)}{img}</picture>'
+
+
+def render_stages_table(crop, base="../", derived=None, atlas=None):
+    """Render the desktop <table class="stages-table"> for a Crop record
+    from templates/stages-table.html.
+
+    Image paths are relative to `base`: "../" from crops/*.html, "" for
+    pages at the site root.
     """
-    bbch = get_bbch(crop_type)
-    codes = bbch["codes"]
-    names = bbch["names"]
-    descriptions = bbch["descriptions"]
-    alts = bbch["alts"]
-
-    dn = html.escape(display_name)
-    ln = html.escape(latin_name)
-    slug_e = html.escape(slug)
-
-    # Determine which stages have images
-    if images_base_dir:
-        existing_stages = []
-        for i in range(1, 11):
-            img_path = os.path.join(images_base_dir, slug, f"{slug}_stage_{i}.png")
-            if os.path.isfile(img_path):
-                existing_stages.append(i)
-        if not existing_stages:
-            # Fallback: include all 10 if no images found at all
-            existing_stages = list(range(1, 11))
-    else:
-        existing_stages = list(range(1, 11))
-
-    num_stages = len(existing_stages)
-
     # Build image cells for desktop
     img_cells = []
-    for i in existing_stages:
-        alt = html.escape(alts[i-1])
-        img_cells.append(f'        <td><img src="../assets/images/crops/{slug_e}/{slug_e}_stage_{i}.png" alt="{dn} Stage {i} — {alt}"></td>')
-    img_row = "\n".join(img_cells)
+    for st in crop.stages:
+        img_cells.append(f'        <td>{render_stage_image(crop, st, base, derived, atlas=atlas)}</td>')
 
     # Build BBCH code cells
     bbch_cells = []
-    for i in existing_stages:
-        bbch_cells.append(f'        <td class="bbch">{codes[i-1]}</td>')
-    bbch_row = "\n".join(bbch_cells)
+    for st in crop.stages:
+        bbch_cells.append(f'        <td class="bbch">{html.escape(st.code)}</td>')
 
     # Build description cells
     desc_cells = []
-    for i in existing_stages:
-        desc_cells.append(f'        <td>{html.escape(descriptions[i-1])}</td>')
-    desc_row = "\n".join(desc_cells)
+    for st in crop.stages:
+        desc_cells.append(f'        <td>{html.escape(st.description)}</td>')
 
     # Build product placeholder cells
-    placeholder_cells = []
-    for _ in existing_stages:
-        placeholder_cells.append('        <td><span class="placeholder">Add product name &amp;&nbsp;dosage</span></td>')
-    placeholder_row = "\n".join(placeholder_cells)
+    placeholder_cell = '        <td><span class="placeholder">Add product name &amp;&nbsp;dosage</span></td>'
 
-    # Build mobile cards
+    return load_template("stages-table.html").render(
+        col_tags="<col>" * len(crop.stages),
+        image_cells="\n".join(img_cells),
+        bbch_cells="\n".join(bbch_cells),
+        description_cells="\n".join(desc_cells),
+        placeholder_cells="\n".join([placeholder_cell] * len(crop.stages)),
+    )
+
+
+def render_crop_page(crop, derived=None, atlas=None, stylesheet=None):
+    """Render the complete HTML page for a Crop record from templates/crop-page.html.
+
+    The page inlines the critical CSS and loads the shared stylesheet
+    (see load_stylesheet) without blocking rendering.
+    """
+    if stylesheet is None:
+        stylesheet = load_stylesheet()
+    stages_table = render_stages_table(crop, derived=derived, atlas=atlas)
+
+    # Build mobile cards; cards below the first screenful load lazily
+    card = load_template("mobile-card.html")
     mobile_cards = []
-    for i in existing_stages:
-        alt = html.escape(alts[i-1])
-        mobile_cards.append(f"""    <div class="mobile-card">
-        <img src="../assets/images/crops/{slug_e}/{slug_e}_stage_{i}.png" alt="{dn} Stage {i} — {alt}">
-        <div class="info">
-            <div class="stage-name">{html.escape(descriptions[i-1])}</div>
-            <div class="bbch-code">BBCH {codes[i-1]}</div>
-            <div class="product-hint">Add product</div>
-        </div>
-    </div>""")
-    mobile_html = "\n".join(mobile_cards)
-
-    # Build dynamic colgroup
-    col_tags = "<col>" * num_stages
+    for i, st in enumerate(crop.stages):
+        mobile_cards.append(card.render(
+            image=render_stage_image(crop, st, derived=derived,
+                                     lazy=i >= MOBILE_EAGER_CARDS, atlas=atlas),
+            description=st.description,
+            code=st.code,
+        ))
 
     # Keywords
-    name_lower = display_name.lower()
-    kw = f"{name_lower} BBCH, {name_lower} growth stages, fertilizer timing {name_lower}, {latin_name}"
-
-    page = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>{dn} Growth Stages (BBCH) | Crop Stages</title>
-<meta name="description" content="Professional BBCH growth stage illustrations for {dn} ({ln}). {num_stages} stages from germination to maturity.">
-<meta name="keywords" content="{html.escape(kw)}">
-<link rel="canonical" href="https://crop-stages.github.io/crops/{slug_e}.html">
-
-<style>
-
-* {{
-    box-sizing: border-box;
-}}
-
-body {{
-    font-family: "Segoe UI", Arial, sans-serif;
-    background: #ffffff;
-    margin: 0;
-    padding: 40px;
-    color: #4a4f45;
-}}
-
-.header {{
-    display: flex;
-    justify-content: space-between;
-    align-items: baseline;
-    margin-bottom: 40px;
-    flex-wrap: wrap;
-    gap: 10px;
-}}
-
-.header h1 {{
-    font-weight: 400;
-    font-size: clamp(24px, 4vw, 42px);
-    margin: 0;
-    color: #6c7466;
-}}
-
-.header .right-title {{
-    font-size: clamp(12px, 1.4vw, 16px);
-    letter-spacing: 1px;
-    color: #6c7466;
-}}
-
-.nav-link {{
-    display: inline-block;
-    margin-bottom: 20px;
-    color: #5a7a52;
-    text-decoration: none;
-    font-size: 14px;
-}}
-.nav-link:hover {{
-    text-decoration: underline;
-}}
-
-/* === TABLE LAYOUT === */
-.stages-table {{
-    width: 100%;
-    border-collapse: collapse;
-    table-layout: fixed;
-}}
-
-.stages-table .label-col {{
-    width: 140px;
-}}
-
-.stages-table tr.image-row td {{
-    vertical-align: bottom;
-    text-align: center;
-    padding: 10px 2px 15px;
-    position: relative;
-}}
-
-.stages-table tr.image-row td:not(:first-child):not(:last-child)::after {{
-    content: "";
-    position: absolute;
-    top: 0;
-    bottom: 0;
-    right: 0;
-    border-right: 2px dashed #c5cbbe;
-}}
-
-.stages-table tr.image-row td img {{
-    max-width: 100%;
-    max-height: 220px;
-    height: auto;
-    display: block;
-    margin: 0 auto;
-}}
-
-.stages-table tr.data-row td {{
-    padding: 10px 5px;
-    font-size: clamp(9px, 1.1vw, 14px);
-    text-align: center;
-    vertical-align: top;
-    border-top: 1px solid #c8cec0;
-    line-height: 1.35;
-    overflow-wrap: break-word;
-    word-wrap: break-word;
-    hyphens: auto;
-}}
-
-.stages-table tr.data-row:first-of-type td {{
-    border-top: 2px solid #b7bdad;
-}}
-
-.stages-table tr.data-row td.label {{
-    text-align: left;
-    font-weight: 600;
-    color: #6c7466;
-    padding-right: 10px;
-}}
-
-.stages-table tr.data-row td.bbch {{
-    font-size: clamp(11px, 1.3vw, 16px);
-    font-weight: 500;
-}}
-
-.stages-table tr.data-row.footer-row td {{
-    min-height: 40px;
-}}
-
-.stages-table tr.data-row.footer-row td .placeholder {{
-    color: #c8cec0;
-    font-size: clamp(8px, 0.9vw, 11px);
-    font-style: italic;
-    line-height: 1.3;
-}}
-
-/* === RESPONSIVE === */
-@media (max-width: 1100px) {{
-    .stages-table .label-col {{
-        width: 110px;
-    }}
-}}
-
-@media (max-width: 800px) {{
-    body {{
-        padding: 20px;
-    }}
-    .stages-table .label-col {{
-        width: 90px;
-    }}
-    .stages-table tr.image-row td img {{
-        max-height: 140px;
-    }}
-}}
-
-@media (max-width: 540px) {{
-    body {{
-        padding: 16px;
-    }}
-    .stages-table {{
-        display: none;
-    }}
-    .mobile-cards {{
-        display: flex;
-        flex-direction: column;
-        gap: 12px;
-    }}
-    .mobile-card {{
-        background: #f6f7f5;
-        border-radius: 10px;
-        padding: 14px;
-        display: flex;
-        align-items: center;
-        gap: 14px;
-    }}
-    .mobile-card img {{
-        width: 70px;
-        height: auto;
-        flex-shrink: 0;
-    }}
-    .mobile-card .info {{
-        font-size: 14px;
-        line-height: 1.5;
-    }}
-    .mobile-card .info .stage-name {{
-        font-weight: 600;
-        font-size: 14px;
-        color: #4a4f45;
-    }}
-    .mobile-card .info .bbch-code {{
-        color: #9da39a;
-        font-size: 12px;
-    }}
-    .mobile-card .info .product-hint {{
-        color: #c8cec0;
-        font-size: 11px;
-        font-style: italic;
-        margin-top: 4px;
-    }}
-}}
-
-@media (min-width: 541px) {{
-    .mobile-cards {{
-        display: none;
-    }}
-}}
-
-</style>
-</head>
-
-<body>
-
-<a href="../index.html" class="nav-link">&larr; Back to all crops</a>
-
-<div class="header">
-    <h1>{dn} ({ln})</h1>
-    <div class="right-title">Botanical Growth Stages</div>
-</div>
-
-<!-- ===== DESKTOP TABLE ===== -->
-<table class="stages-table">
-    <colgroup>
-        <col class="label-col">
-        {col_tags}
-    </colgroup>
-
-    <tr class="image-row">
-        <td></td>
-{img_row}
-    </tr>
-
-    <tr class="data-row">
-        <td class="label">BBCH Stage</td>
-{bbch_row}
-    </tr>
-
-    <tr class="data-row">
-        <td class="label">Description</td>
-{desc_row}
-    </tr>
-
-    <tr class="data-row footer-row">
-        <td class="label">Your Product</td>
-{placeholder_row}
-    </tr>
-</table>
-
-<!-- ===== MOBILE CARDS ===== -->
-<div class="mobile-cards">
-{mobile_html}
-</div>
-
-</body>
-</html>"""
-    return page
+    name_lower = crop.display_name.lower()
+    kw = f"{name_lower} BBCH, {name_lower} growth stages, fertilizer timing {name_lower}, {crop.latin_name}"
+
+    return load_template("crop-page.html").render(
+        display_name=crop.display_name,
+        latin_name=crop.latin_name,
+        slug=crop.slug,
+        num_stages=len(crop.stages),
+        keywords=kw,
+        critical_css=stylesheet.critical,
+        stylesheet=stylesheet.filename,
+        stages_table=stages_table,
+        mobile_cards="\n".join(mobile_cards),
+    )
 
 
-def main():
-    import argparse
-    parser = argparse.ArgumentParser(description='Generate crop HTML table pages')
-    parser.add_argument('--images-dir', default=None,
-                        help='Path to images/crops/ directory. If provided, only stages with existing PNGs will be included.')
-    args = parser.parse_args()
+# ============================================================
+# BUILD MANIFEST
+# slug -> {"inputs": sha256 of page inputs, "output": sha256 of page,
+#          "fragment": sha256 of the carousel table fragment,
+#          "lastmod": UTC date the page content last changed}
+# ============================================================
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CROPS_DIR = os.path.join(ROOT_DIR, "crops")
+MANIFEST_PATH = os.path.join(ROOT_DIR, ".build-manifest.json")
+FRAGMENTS_DIRNAME = "fragments"
+
+
+def sha256_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the build manifest, or an empty one if missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault("pages", {})
+    return manifest
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Write the manifest atomically, leaving the file alone if unchanged."""
+    text = json.dumps(manifest, indent=1, sort_keys=True, ensure_ascii=False) + "\n"
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return
+    except OSError:
+        pass
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+# Files in templates/ that pages are rendered from
+PAGE_TEMPLATES = ("crop-page.html", "stages-table.html", "mobile-card.html")
+
+
+@lru_cache(maxsize=None)
+def _renderer_source():
+    import inspect
+    return "".join(inspect.getsource(func) for func in
+                   (render_atlas_image, render_stage_image, render_stages_table, render_crop_page))
+
+
+def template_source():
+    """Source of the page templates and the code that fills them in.
+
+    The code is read once per process; template files only when they change.
+    """
+    return _renderer_source() + "".join(load_template(name).source for name in PAGE_TEMPLATES)
+
+
+def page_inputs_hash(crop, stages, use_images, derived=None, atlas=None, stylesheet=None):
+    """Hash everything a crop page is rendered from.
+
+    Covers the CROPS entry, the BBCH set for its crop_type, the stage PNGs
+    that exist, their derivatives or atlas, the stylesheet and the
+    templates (see template_source).
+    """
+    slug = crop.slug
+    inputs = {
+        "crop": [slug, crop.display_name, crop.latin_name, crop.crop_type],
+        "bbch": get_bbch(crop.crop_type),
+        "stages": [f"{slug}_stage_{i}.png" for i in stages] if use_images else None,
+        "derived": [derived_entry(crop, st, derived) for st in crop.stages],
+        "atlas": atlas.get(slug) if atlas else None,
+        "stylesheet": [stylesheet.filename, stylesheet.critical] if stylesheet else None,
+        "template": template_source(),
+    }
+    return sha256_text(json.dumps(inputs, sort_keys=True, ensure_ascii=False))
+
+
+def page_is_current(entry, inputs_hash, filepath, fragment_path=None):
+    """True if the page (and its fragment) on disk were built from these inputs
+    and not edited since."""
+    if not entry or entry.get("inputs") != inputs_hash:
+        return False
+    outputs = [(filepath, "output")]
+    if fragment_path:
+        outputs.append((fragment_path, "fragment"))
+    for path, key in outputs:
+        if not os.path.isfile(path) or sha256_file(path) != entry.get(key):
+            return False
+    return True
+
+
+def render_fragment(crop, derived=None, atlas=None):
+    """The carousel fragment: just the stages table, with image paths from the site root."""
+    return render_stages_table(crop, base="", derived=derived, atlas=atlas) + "\n"
+
+
+# ============================================================
+# SHARED STYLESHEET
+# templates/crop-table.css is published as assets/css/crop-table.{hash}.css;
+# templates/crop-table.critical.css is inlined into every page.
+# ============================================================
+
+CSS_DIR = os.path.join(ROOT_DIR, "assets", "css")
+STYLESHEET_NAME = "crop-table"
+
+Stylesheet = namedtuple("Stylesheet", ["filename", "css", "critical"])
+
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def load_stylesheet():
+    """The shared crop page stylesheet, minified and fingerprinted."""
+    css = minify_css(read_template(f"{STYLESHEET_NAME}.css")) + "\n"
+    critical = minify_css(read_template(f"{STYLESHEET_NAME}.critical.css"))
+    return Stylesheet(f"{STYLESHEET_NAME}.{sha256_text(css)[:10]}.css", css, critical)
+
 
-    # Output directory
-    out_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "crops")
-    os.makedirs(out_dir, exist_ok=True)
+def publish_stylesheet(stylesheet, css_dir=CSS_DIR):
+    """Write the fingerprinted stylesheet and delete superseded versions.
 
-    count = 0
+    Returns True if the file was written.
+    """
+    os.makedirs(css_dir, exist_ok=True)
+    path = os.path.join(css_dir, stylesheet.filename)
+    written = False
+    if not os.path.isfile(path) or sha256_file(path) != sha256_text(stylesheet.css):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(stylesheet.css)
+        written = True
+
+    stale = re.compile(rf"^{re.escape(STYLESHEET_NAME)}\.[0-9a-f]{{10}}\.css(\.gz|\.br)?$")
+    for entry in os.scandir(css_dir):
+        if stale.match(entry.name) and not entry.name.startswith(stylesheet.filename):
+            os.remove(entry.path)
+            print(f"  removed stale {entry.name}")
+    return written
+
+
+# ============================================================
+# SITEMAP
+# sitemap.xml and robots.txt from the registry; <lastmod> is the date a
+# page's content hash last changed (manifest "pages" and "static" entries)
+# ============================================================
+
+SITE_URL = "https://crop-stages.github.io"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+# Protocol limits per sitemap file
+SITEMAP_MAX_URLS = 50000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+# Hand-maintained pages at the site root: file -> (URL path, priority)
+STATIC_PAGES = {
+    "index.html": ("/", "1.0"),
+    "all-crops.html": ("/all-crops.html", "0.9"),
+}
+
+
+def today():
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+def update_lastmod(entry, output_hash, previous=None):
+    """Set entry["lastmod"], moving it to today only if the content changed."""
+    previous = previous or {}
+    if previous.get("lastmod") and previous.get("output") == output_hash:
+        entry["lastmod"] = previous["lastmod"]
+    else:
+        entry["lastmod"] = today()
+    return entry
+
+
+def _url_xml(loc, lastmod=None, priority=None):
+    parts = [f"    <loc>{html.escape(loc)}</loc>"]
+    if lastmod:
+        parts.append(f"    <lastmod>{lastmod}</lastmod>")
+    if priority:
+        parts.append(f"    <priority>{priority}</priority>")
+    return "  <url>\n" + "\n".join(parts) + "\n  </url>"
+
+
+def _urlset(urls):
+    body = "\n".join(urls)
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'
+            f"{body}\n</urlset>\n")
+
+
+def _write_if_changed(path, text):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return True
+
+
+def write_sitemap(manifest, slugs, site_dir=ROOT_DIR, crops_path="crops"):
+    """Write sitemap.xml (split under a sitemap index past the protocol
+    limits) and robots.txt into site_dir; returns the number of URLs.
+
+    Static pages get their lastmod from the hash of the file on disk,
+    tracked under manifest["static"].
+    """
+    pages = manifest["pages"]
+    static = manifest.setdefault("static", {})
+    urls = []
+    for filename, (path, priority) in STATIC_PAGES.items():
+        filepath = os.path.join(site_dir, filename)
+        if not os.path.isfile(filepath):
+            continue
+        output_hash = sha256_file(filepath)
+        static[filename] = update_lastmod({"output": output_hash}, output_hash,
+                                          static.get(filename))
+        lastmod = static[filename]["lastmod"]
+        urls.append((_url_xml(SITE_URL + path, lastmod, priority), lastmod))
+    for slug in slugs:
+        lastmod = pages.get(slug, {}).get("lastmod")
+        urls.append((_url_xml(f"{SITE_URL}/{crops_path}/{slug}.html", lastmod), lastmod))
+
+    # Split into files that respect both the URL and the size limit
+    chunks = [[]]
+    size = len(_urlset([]))
+    for url, lastmod in urls:
+        if (len(chunks[-1]) >= SITEMAP_MAX_URLS
+                or size + len(url.encode("utf-8")) + 1 > SITEMAP_MAX_BYTES):
+            chunks.append([])
+            size = len(_urlset([]))
+        chunks[-1].append((url, lastmod))
+        size += len(url.encode("utf-8")) + 1
+
+    written = set()
+    if len(chunks) == 1:
+        _write_if_changed(os.path.join(site_dir, "sitemap.xml"),
+                          _urlset([url for url, _ in chunks[0]]))
+    else:
+        entries = []
+        for i, chunk in enumerate(chunks, 1):
+            name = f"sitemap-{i}.xml"
+            written.add(name)
+            _write_if_changed(os.path.join(site_dir, name), _urlset([url for url, _ in chunk]))
+            lastmod = max((m for _, m in chunk if m), default=None)
+            entries.append(f"  <sitemap>\n    <loc>{SITE_URL}/{name}</loc>\n"
+                           + (f"    <lastmod>{lastmod}</lastmod>\n" if lastmod else "")
+                           + "  </sitemap>")
+        _write_if_changed(os.path.join(site_dir, "sitemap.xml"),
+                          f'<?xml version="1.0" encoding="UTF-8"?>\n'
+                          f'<sitemapindex xmlns="{SITEMAP_NS}">\n' + "\n".join(entries)
+                          + "\n</sitemapindex>\n")
+    for entry in os.scandir(site_dir):
+        if re.fullmatch(r"sitemap-\d+\.xml", entry.name) and entry.name not in written:
+            os.remove(entry.path)
+
+    _write_if_changed(os.path.join(site_dir, "robots.txt"),
+                      f"Sitemap: {SITE_URL}/sitemap.xml\n"
+                      f"User-agent: *\n"
+                      f"Disallow: /{crops_path}/{FRAGMENTS_DIRNAME}/\n"
+                      f"Disallow: /{crops_path}/{CATALOG_DIRNAME}/\n")
+    return len(urls)
+
+
+# ============================================================
+# ALL-CROPS CATALOG
+# all-crops.html lists every crop from the registry: the first few tables
+# are rendered into the page, the rest are packed into fingerprinted JSON
+# chunks ({slug: table html}) that the page loads on scroll
+# ============================================================
+
+ALL_CROPS_PAGE = "all-crops.html"
+CATALOG_DIRNAME = "catalog"
+# Tables rendered into the page itself, and tables per chunk file
+CATALOG_EAGER = 4
+CATALOG_CHUNK_SIZE = 10
+CATALOG_BEGIN = "<!-- CROP CATALOG: generated by scripts/generate_tables_html.py -->"
+CATALOG_END = "<!-- /CROP CATALOG -->"
+CATALOG_INDENT = " " * 8
+CATALOG_PLACEHOLDER = '<div class="crop-table-loading">Scroll down to load table…</div>'
+
+
+def catalog_name(slug, crop, crops):
+    """Display name in the catalog; numbered variants are marked "(v2)" etc."""
+    match = re.fullmatch(r"(.+)-(\d+)", slug)
+    if match and match.group(1) in crops:
+        return f"{crop.display_name} (v{match.group(2)})"
+    return crop.display_name
+
+
+def write_catalog(crops, fragments_dir, site_dir, crops_path="crops"):
+    """Render the catalog into all-crops.html and write its table chunks.
+
+    Tables come from the fragments written by build_site. Chunks are named
+    by content hash and superseded ones are deleted; nothing is rewritten
+    when unchanged. Returns the number of chunks, or None if site_dir has
+    no all-crops.html.
+    """
+    page_path = os.path.join(site_dir, ALL_CROPS_PAGE)
+    if not os.path.isfile(page_path):
+        return None
+    catalog_dir = os.path.join(site_dir, crops_path, CATALOG_DIRNAME)
+    os.makedirs(catalog_dir, exist_ok=True)
+
+    tables = {}
+    for slug in crops:
+        with open(os.path.join(fragments_dir, f"{slug}.html"), "r", encoding="utf-8") as f:
+            tables[slug] = f.read().rstrip("\n")
+
+    slugs = list(crops)
+    chunk_of = {}
+    chunk_files = set()
+    for i in range(CATALOG_EAGER, len(slugs), CATALOG_CHUNK_SIZE):
+        members = slugs[i:i + CATALOG_CHUNK_SIZE]
+        data = json.dumps({slug: tables[slug] for slug in members},
+                          ensure_ascii=False, separators=(",", ":"))
+        k = (i - CATALOG_EAGER) // CATALOG_CHUNK_SIZE + 1
+        name = f"{k:02d}.{sha256_text(data)[:10]}.json"
+        chunk_files.add(name)
+        _write_if_changed(os.path.join(catalog_dir, name), data + "\n")
+        for slug in members:
+            chunk_of[slug] = f"{crops_path}/{CATALOG_DIRNAME}/{name}"
+    for entry in os.scandir(catalog_dir):
+        if entry.is_file() and entry.name.endswith(".json") and entry.name not in chunk_files:
+            os.remove(entry.path)
+
+    template = load_template("catalog-entry.html")
+    table_indent = CATALOG_INDENT + " " * 8
+    entries = []
+    for slug, crop in crops.items():
+        chunk = chunk_of.get(slug)
+        table = CATALOG_PLACEHOLDER if chunk else tables[slug]
+        entries.append(template.render(
+            slug=slug,
+            name=catalog_name(slug, crop, crops),
+            latin=crop.latin_name,
+            chunk_attr=f' data-chunk="{chunk}"' if chunk else "",
+            table="\n".join(table_indent + line if line else line
+                            for line in table.split("\n")),
+        ))
+
+    with open(page_path, "r", encoding="utf-8") as f:
+        page_html = f.read()
+    begin = page_html.find(CATALOG_BEGIN)
+    end = page_html.find(CATALOG_END, begin)
+    if begin < 0 or end < 0:
+        raise ValueError(f"{page_path}: crop catalog markers not found")
+    region = f"{CATALOG_BEGIN}\n" + "\n".join(entries) + f"\n{CATALOG_INDENT}"
+    if _write_if_changed(page_path, page_html[:begin] + region + page_html[end:]):
+        print(f"  wrote {ALL_CROPS_PAGE} ({len(slugs)} crops, {len(chunk_files)} chunks)")
+    return len(chunk_files)
+
+
+# ============================================================
+# INDEX CAROUSEL
+# index.html embeds the featured crops' fragment URLs, fingerprinted with
+# the fragment's content hash, so the carousel fetches its first table
+# straight away instead of waiting for a manifest
+# ============================================================
+
+INDEX_PAGE = "index.html"
+# Crops shown in the carousel, in order; slugs not in the registry are skipped
+CAROUSEL_FEATURED = [
+    "wheat", "corn", "soybean", "rice", "sunflower",
+    "tomato", "potato", "rapeseed", "barley", "cotton",
+]
+CAROUSEL_BEGIN = "/* CAROUSEL CROPS: generated by scripts/generate_tables_html.py */"
+CAROUSEL_END = "/* /CAROUSEL CROPS */"
+
+
+def write_carousel(crops, pages, site_dir, crops_path="crops"):
+    """Write the featured crops' entries into the carousel script of index.html.
+
+    Each entry has the crop's name, page and fragment URL with ?v= set to
+    the fragment hash, so an updated table is never served from cache.
+    Returns the number of entries, or None if site_dir has no index.html.
+    """
+    page_path = os.path.join(site_dir, INDEX_PAGE)
+    if not os.path.isfile(page_path):
+        return None
+    entries = []
+    for slug in CAROUSEL_FEATURED:
+        if slug not in crops or slug not in pages:
+            continue
+        version = pages[slug]["fragment"][:12]
+        entry = json.dumps({
+            "slug": slug,
+            "name": crops[slug].display_name,
+            "file": f"{crops_path}/{FRAGMENTS_DIRNAME}/{slug}.html?v={version}",
+            "page": f"{crops_path}/{slug}.html",
+        }, ensure_ascii=False, separators=(",", ":"))
+        entries.append(entry.replace("<", "\\u003c"))
+
+    with open(page_path, "r", encoding="utf-8") as f:
+        page_html = f.read()
+    begin = page_html.find(CAROUSEL_BEGIN)
+    end = page_html.find(CAROUSEL_END, begin)
+    if begin < 0 or end < 0:
+        raise ValueError(f"{page_path}: carousel markers not found")
+    region = f"{CAROUSEL_BEGIN}\nvar CROPS=[\n" + ",\n".join(entries) + "\n];\n"
+    if _write_if_changed(page_path, page_html[:begin] + region + page_html[end:]):
+        print(f"  wrote {INDEX_PAGE} ({len(entries)} carousel crops)")
+    return len(entries)
+
+
+def build_site(images_dir=None, out_dir=CROPS_DIR, manifest_path=MANIFEST_PATH,
+               force=False, registry=None, atlas=False, slugs=None):
+    """Build every crop page whose inputs changed; returns (built, skipped, deleted).
+
+    `registry` defaults to CROPS. Each page also gets a table-only fragment
+    in out_dir/fragments/; the index carousel links the featured ones (see
+    write_carousel) and the all-crops catalog is regenerated from all of
+    them (see write_catalog). Pages and fragments of slugs recorded in the
+    manifest but no longer in the registry are deleted.
+
+    With images_dir, stage images that have derivatives in the derivative
+    index are rendered with srcset (run image_derivatives.py first). With
+    `atlas`, stages are drawn from per-crop strip atlases instead (run
+    image_atlas.py first); crops without an atlas fall back to images.
+
+    With `slugs`, only those pages are checked and rebuilt; the rest keep
+    their manifest entries (used by --watch after an image change).
+    """
+    registry = CROPS if registry is None else registry
+    fragments_dir = os.path.join(out_dir, FRAGMENTS_DIRNAME)
+    os.makedirs(fragments_dir, exist_ok=True)
+
+    manifest = load_manifest(manifest_path)
+    pages = manifest["pages"]
+    crops = load_crops(images_dir, registry)
+    derived = load_derived_index() if images_dir else {}
+    atlases = load_atlas_index() if images_dir and atlas else {}
+    stylesheet = load_stylesheet()
+    site_dir = os.path.dirname(os.path.abspath(out_dir))
+    reset_render_stats()
+    if publish_stylesheet(stylesheet, os.path.join(site_dir, "assets", "css")):
+        print(f"  wrote assets/css/{stylesheet.filename}")
+
+    built = 0
+    skipped = 0
+    deleted = 0
     skipped_stages = {}
-    for slug, (display_name, latin_name, crop_type) in sorted(CROPS.items()):
-        page_html = generate_crop_html(slug, display_name, latin_name, crop_type, args.images_dir)
-
-        # Count stages for reporting
-        if args.images_dir:
-            existing = []
-            for i in range(1, 11):
-                img_path = os.path.join(args.images_dir, slug, f"{slug}_stage_{i}.png")
-                if os.path.isfile(img_path):
-                    existing.append(i)
+    for slug, crop in crops.items():
+        if slugs is not None and slug not in slugs:
+            continue
+        existing = []
+        if images_dir:
+            existing = find_existing_stages(slug, images_dir)
+
+            # Count stages for reporting
             if len(existing) < 10 and existing:
                 skipped_stages[slug] = len(existing)
                 print(f"  {slug}: {len(existing)} stages (skipped {10 - len(existing)} empty)")
@@ -814,18 +681,143 @@ def main():
                 print(f"  ⚠ {slug}: no images found, using all 10 stages")
 
         filepath = os.path.join(out_dir, f"{slug}.html")
+        fragment_path = os.path.join(fragments_dir, f"{slug}.html")
+        inputs_hash = page_inputs_hash(crop, existing, bool(images_dir), derived, atlases,
+                                       stylesheet)
+        if not force and page_is_current(pages.get(slug), inputs_hash, filepath, fragment_path):
+            pages[slug].setdefault("lastmod", today())
+            skipped += 1
+            continue
+
+        page_html = render_crop_page(crop, derived, atlases, stylesheet)
+        fragment_html = render_fragment(crop, derived, atlases)
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(page_html)
-        count += 1
-
-    print(f"\nGenerated {count} crop table pages in {out_dir}/")
+        with open(fragment_path, "w", encoding="utf-8") as f:
+            f.write(fragment_html)
+        pages[slug] = update_lastmod({
+            "inputs": inputs_hash,
+            "output": sha256_text(page_html),
+            "fragment": sha256_text(fragment_html),
+        }, sha256_text(page_html), pages.get(slug))
+        built += 1
+
+    # Remove pages for crops that were dropped from the registry
+    for slug in sorted(set(pages) - set(registry)):
+        filepath = os.path.join(out_dir, f"{slug}.html")
+        if os.path.isfile(filepath):
+            os.remove(filepath)
+            print(f"  removed {slug}.html")
+        fragment_path = os.path.join(fragments_dir, f"{slug}.html")
+        if os.path.isfile(fragment_path):
+            os.remove(fragment_path)
+        del pages[slug]
+        deleted += 1
+
+    crops_path = os.path.basename(os.path.abspath(out_dir))
+    write_catalog(crops, fragments_dir, site_dir, crops_path)
+    write_carousel(crops, pages, site_dir, crops_path)
+    num_urls = write_sitemap(manifest, list(crops), site_dir, crops_path)
+    save_manifest(manifest, manifest_path)
+
+    print(f"\nBuilt {built}, skipped {skipped} unchanged, deleted {deleted} crop table pages in {out_dir}/")
+    print(f"Sitemap: {num_urls} URLs")
+    for name, (count, total, slowest) in sorted(render_stats().items()):
+        print(f"  {name}: {count} renders, {total * 1000:.1f} ms total, "
+              f"{total / count * 1000:.3f} ms avg, {slowest * 1000:.3f} ms max")
     if skipped_stages:
         less_than_10 = {k: v for k, v in skipped_stages.items() if 0 < v < 10}
         if less_than_10:
             print(f"Crops with fewer than 10 stages: {len(less_than_10)}")
             for slug, n in sorted(less_than_10.items()):
                 print(f"  {slug}: {n} stages")
-    return count
+    return built, skipped, deleted
+
+
+# ============================================================
+# WATCH MODE
+# ============================================================
+
+def affected_slugs(changed, images_dir=None):
+    """Slugs whose stage images are among the `changed` paths.
+
+    Returns None when every page may be affected: a template changed, or
+    the change is the images directory itself.
+    """
+    slugs = set()
+    images_root = os.path.abspath(images_dir) if images_dir else None
+    for path in changed:
+        if images_root and path.startswith(images_root + os.sep):
+            slugs.add(os.path.relpath(path, images_root).split(os.sep)[0])
+        else:
+            return None
+    return slugs
+
+
+def watch_site(images_dir=None, out_dir=CROPS_DIR, atlas=False, jobs=1):
+    """Build once, then rebuild affected pages on every change until Ctrl-C.
+
+    Image changes also refresh the derivatives (if the derivative index
+    exists) and, with `atlas`, the atlases of the crops concerned.
+    """
+    from file_watcher import FileWatcher
+
+    build_site(images_dir, out_dir, atlas=atlas)
+    paths = [TEMPLATES_DIR, REGISTRY_PATH] + ([images_dir] if images_dir else [])
+    with FileWatcher(paths) as watcher:
+        print(f"\nWatching {len(paths)} paths ({watcher.backend}); Ctrl-C to stop")
+        try:
+            for changed in watcher.changes():
+                start = time.perf_counter()
+                names = sorted(os.path.relpath(p, ROOT_DIR) for p in changed)
+                print(f"\nChanged: {', '.join(names[:5])}"
+                      + (f" and {len(names) - 5} more" if len(names) > 5 else ""))
+                registry_slugs = set()
+                if REGISTRY_PATH in changed:
+                    try:
+                        registry_slugs = reload_registry()
+                    except Exception as e:
+                        print(f"  ⚠ crop registry not reloaded: {e}")
+                        continue
+                slugs = affected_slugs(changed - {REGISTRY_PATH}, images_dir)
+                if slugs is not None:
+                    slugs |= registry_slugs
+                images_root = os.path.abspath(images_dir) if images_dir else None
+                if images_root and any(p == images_root or p.startswith(images_root + os.sep)
+                                       for p in changed):
+                    clear_inventory()
+                    if os.path.isfile(DERIVED_INDEX):
+                        build_derivatives(images_dir, jobs=jobs)
+                    if atlas:
+                        build_atlases(images_dir, jobs=jobs)
+                build_site(images_dir, out_dir, atlas=atlas, slugs=slugs)
+                print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Generate crop HTML table pages')
+    parser.add_argument('--images-dir', default=None,
+                        help='Path to images/crops/ directory. If provided, only stages with existing PNGs will be included.')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every page even if its inputs are unchanged')
+    parser.add_argument('--atlas', action='store_true',
+                        help='Draw stage images from the strip atlases built by image_atlas.py')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and rebuild affected pages when templates, the crop '
+                             'registry or images change')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='With --watch, encoder processes for derivatives and atlases '
+                             '(0 = one per CPU)')
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_site(args.images_dir, atlas=args.atlas, jobs=args.jobs or os.cpu_count() or 1)
+        return 0
+    built, _, _ = build_site(args.images_dir, force=args.force, atlas=args.atlas)
+    return built
 
 
 if __name__ == "__main__":
@@ -15,91 +15,243 @@ Each HTML file produces one PPTX file with a single landscape slide containing:
 - Empty "Your Product" row for client to fill in
 
 Or use --single-file mode to combine all crops into one PPTX (one slide per crop).
+
+Crop data comes from the shared registry (crop_data.py) for pages that are
+exactly what generate_tables_html.py last wrote; other pages (hand-edited, or
+not in the registry) are parsed from their HTML. Override with --source.
+
+Exports are incremental: {output-dir}/.export-manifest.json records a hash
+of each deck's inputs (crop text, stage image contents, --image-dpi, master,
+layout and the slide-building code), and a deck is only rebuilt when they
+or the file itself changed; --force
+rebuilds everything. --single-file keeps single-crop decks in .crop-decks/
+next to the combined deck and merges them, so one changed crop costs one
+slide build plus the merge.
+
+Use --jobs N to convert files on N worker processes (0 = one per CPU core).
+With --single-file, --batch-size N instead builds the deck from scratch in
+partial decks of N slides (in parallel with --jobs) and merges them.
+Use --template master.potx to build the slides on a designer's master: its
+"Crop Stages" layout and named placeholders decide where the title, stage
+pictures and table go and how they look (see pptx_master.py).
+Use --image-dpi N to embed images downscaled and recompressed for N DPI at
+their on-slide size instead of the original files.
+
+With --watch the converter stays running after the first export and
+re-exports the decks of crops whose page, stage images or registry entry
+changed (and re-assembles the combined deck). Run it next to
+generate_tables_html.py --watch to go from a new stage PNG to updated
+pages and decks without restarting either.
+
+Slides are not drawn one shape at a time: the layout for each stage count
+is drawn once per process and every crop slide is a copy of its XML with
+the crop's text and pictures filled in (see slide_template()).
+
+python-pptx, BeautifulSoup and lxml are imported where they are first
+needed, so --help, an empty --html-dir and the registry-only paths start
+without loading them.
 """
 
+import gc
+import io
 import os
 import re
 import glob
+import json
+import time
 import argparse
+import contextlib
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
-from bs4 import BeautifulSoup
-from pptx import Presentation
-from pptx.util import Inches, Pt, Emu
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.enum.shapes import MSO_SHAPE
+
+from image_inventory import stage_image, clear_cache as clear_inventory
+from image_metadata import default_store
+from image_prep import prepare_image
+from crop_data import CROPS, REGISTRY_PATH, Crop, Stage, build_crop, reload_registry
+from generate_tables_html import load_manifest, save_manifest, sha256_file, sha256_text
 
 
 # ─── DESIGN CONSTANTS ──────────────────────────────────────────────
-SLIDE_WIDTH = Inches(13.333)   # Widescreen 16:9
-SLIDE_HEIGHT = Inches(7.5)
+# Lengths are plain EMU ints (what pptx.util.Inches/Pt return), so the
+# layout can be defined without importing python-pptx.
+EMU_PER_INCH = 914400
+EMU_PER_PT = 12700
+
+SLIDE_WIDTH = int(13.333 * EMU_PER_INCH)   # Widescreen 16:9
+SLIDE_HEIGHT = int(7.5 * EMU_PER_INCH)
 
 # Colors (no # prefix)
-CLR_TITLE = RGBColor(0x6C, 0x74, 0x66)       # muted green-gray
-CLR_SUBTITLE = RGBColor(0x9D, 0xA3, 0x9A)    # lighter gray
-CLR_LABEL = RGBColor(0x6C, 0x74, 0x66)        # same as title
-CLR_BBCH = RGBColor(0x4A, 0x4F, 0x45)         # dark text
-CLR_DESC = RGBColor(0x5A, 0x5E, 0x54)         # medium text
-CLR_PLACEHOLDER = RGBColor(0xC8, 0xCE, 0xC0)  # light gray placeholder
-CLR_BORDER = RGBColor(0xC8, 0xCE, 0xC0)       # table border
-CLR_HEADER_BG = RGBColor(0xF2, 0xF4, 0xF0)    # subtle header background
-CLR_WHITE = RGBColor(0xFF, 0xFF, 0xFF)
-CLR_FOOTER = RGBColor(0xB0, 0xB5, 0xAA)
+CLR_TITLE = '6C7466'        # muted green-gray
+CLR_SUBTITLE = '9DA39A'     # lighter gray
+CLR_LABEL = '6C7466'        # same as title
+CLR_BBCH = '4A4F45'         # dark text
+CLR_DESC = '5A5E54'         # medium text
+CLR_PLACEHOLDER = 'C8CEC0'  # light gray placeholder
+CLR_BORDER = 'C8CEC0'       # table border
+CLR_HEADER_BG = 'F2F4F0'    # subtle header background
+CLR_WHITE = 'FFFFFF'
+CLR_FOOTER = 'B0B5AA'
 
 # Layout
-MARGIN_LEFT = Inches(0.4)
-MARGIN_RIGHT = Inches(0.4)
-MARGIN_TOP = Inches(0.3)
+MARGIN_LEFT = int(0.4 * EMU_PER_INCH)
+MARGIN_RIGHT = int(0.4 * EMU_PER_INCH)
+MARGIN_TOP = int(0.3 * EMU_PER_INCH)
 CONTENT_WIDTH = SLIDE_WIDTH - MARGIN_LEFT - MARGIN_RIGHT
 
 NUM_STAGES = 10
-LABEL_COL_WIDTH = Inches(1.3)
+LABEL_COL_WIDTH = int(1.3 * EMU_PER_INCH)
 STAGE_AREA_WIDTH = CONTENT_WIDTH - LABEL_COL_WIDTH
 
 
-def parse_html(html_path):
-    """Parse a crop HTML file and extract structured data."""
+def new_presentation(master=None):
+    """An empty widescreen presentation, or one based on a master file."""
+    if master:
+        from pptx_master import open_master
+        return open_master(master)
+    from pptx import Presentation
+    prs = Presentation()
+    prs.slide_width = SLIDE_WIDTH
+    prs.slide_height = SLIDE_HEIGHT
+    return prs
+
+
+# ─── HTML EXTRACTION ───────────────────────────────────────────────
+
+def _class_test(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_LxmlQueries = namedtuple('_LxmlQueries', ['etree', 'h1', 'image_row', 'imgs', 'data_rows',
+                                         'cells', 'bbch_cells', 'text'])
+
+
+@lru_cache(maxsize=None)
+def _lxml_queries():
+    """lxml.etree and the compiled XPath queries, or None without lxml."""
+    try:
+        from lxml import etree
+    except ImportError:  # parse_html falls back to BeautifulSoup
+        return None
+    return _LxmlQueries(
+        etree=etree,
+        h1=etree.XPath('(//h1)[1]'),
+        image_row=etree.XPath(f'(//tr[{_class_test("image-row")}])[1]'),
+        imgs=etree.XPath('.//img'),
+        data_rows=etree.XPath(f'//tr[{_class_test("data-row")}]'),
+        cells=etree.XPath('.//td'),
+        bbch_cells=etree.XPath(f'.//td[{_class_test("bbch")}]'),
+        text=etree.XPath('.//text()'),
+    )
+
+
+def _lxml_text(el, xp):
+    """Same result as BeautifulSoup's get_text(strip=True)."""
+    return ''.join(s.strip() for s in xp.text(el))
+
+
+def _extract_lxml(markup):
+    """Fast path: pull (title, images, rows) out of a page with lxml XPath.
+
+    Returns None if lxml is unavailable or cannot parse the markup.
+    """
+    xp = _lxml_queries()
+    if xp is None:
+        return None
+    etree = xp.etree
+    try:
+        root = etree.fromstring(markup, etree.HTMLParser())
+    except (etree.ParserError, etree.XMLSyntaxError, ValueError):
+        return None
+    if root is None:
+        return None
+
+    h1 = xp.h1(root)
+    title = _lxml_text(h1[0], xp) if h1 else None
+
+    images = None
+    image_row = xp.image_row(root)
+    if image_row:
+        images = [(img.get('data-src') or img.get('src', ''), img.get('alt', ''))
+                  for img in xp.imgs(image_row[0])]
+
+    rows = [
+        ([_lxml_text(c, xp) for c in xp.cells(row)],
+         [_lxml_text(c, xp) for c in xp.bbch_cells(row)])
+        for row in xp.data_rows(root)
+    ]
+    return title, images, rows
+
+
+def _extract_bs4(markup):
+    """Pull (title, images, rows) out of a page with BeautifulSoup.
+
+    rows holds, per tr.data-row, the text of all its cells and of its
+    td.bbch cells.
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(markup, 'lxml')
+
+    h1 = soup.find('h1')
+    title = h1.get_text(strip=True) if h1 else None
+
+    images = None
+    image_row = soup.find('tr', class_='image-row')
+    if image_row:
+        images = [(img.get('data-src') or img.get('src', ''), img.get('alt', ''))
+                  for img in image_row.find_all('img')]
+
+    rows = [
+        ([c.get_text(strip=True) for c in row.find_all('td')],
+         [c.get_text(strip=True) for c in row.find_all('td', class_='bbch')])
+        for row in soup.find_all('tr', class_='data-row')
+    ]
+    return title, images, rows
+
+
+def parse_html(html_path, parser='fast'):
+    """Parse a crop HTML file and extract structured data.
+
+    parser='fast' reads the page with lxml XPath, falling back to
+    BeautifulSoup if lxml is unavailable or rejects the page; 'bs4' always
+    uses BeautifulSoup.
+    """
     with open(html_path, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'lxml')
+        markup = f.read()
+
+    extracted = None
+    if parser == 'fast':
+        extracted = _extract_lxml(markup)
+    if extracted is None:
+        extracted = _extract_bs4(markup)
+    title, images, data_rows = extracted
 
     data = {}
 
     # Title from h1
-    h1 = soup.find('h1')
-    data['title'] = h1.get_text(strip=True) if h1 else Path(html_path).stem
+    data['title'] = title if title is not None else Path(html_path).stem
 
     # Extract crop slug from image paths
-    image_row = soup.find('tr', class_='image-row')
-    if image_row:
-        imgs = image_row.find_all('img')
-        data['images'] = []
-        data['image_alts'] = []
-        for img in imgs:
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-            data['images'].append(src)
-            data['image_alts'].append(alt)
+    if images is not None:
+        data['images'] = [src for src, _ in images]
+        data['image_alts'] = [alt for _, alt in images]
 
     # Extract BBCH codes
-    data_rows = soup.find_all('tr', class_='data-row')
     data['bbch_codes'] = []
     data['descriptions'] = []
 
-    for row in data_rows:
-        cells = row.find_all('td')
+    for cells, bbch_cells in data_rows:
         if not cells:
             continue
 
-        label_cell = cells[0]
-        label_text = label_cell.get_text(strip=True).lower()
+        label_text = cells[0].lower()
 
-        values = [cell.get_text(strip=True) for cell in cells[1:]]
+        values = cells[1:]
 
         if 'bbch' in label_text or 'stage' == label_text.split()[-1] if label_text.split() else False:
             # Check if cells have bbch class
-            bbch_cells = row.find_all('td', class_='bbch')
             if bbch_cells:
-                data['bbch_codes'] = [c.get_text(strip=True) for c in bbch_cells]
+                data['bbch_codes'] = bbch_cells
             elif values:
                 data['bbch_codes'] = values
         elif 'description' in label_text or 'описан' in label_text:
@@ -109,10 +261,9 @@ def parse_html(html_path):
 
     # Fallback: if bbch not found via label, try finding by class
     if not data['bbch_codes']:
-        for row in data_rows:
-            bbch_cells = row.find_all('td', class_='bbch')
+        for _, bbch_cells in data_rows:
             if bbch_cells:
-                data['bbch_codes'] = [c.get_text(strip=True) for c in bbch_cells]
+                data['bbch_codes'] = bbch_cells
                 break
 
     # Extract crop slug from image paths to find local images
@@ -139,126 +290,193 @@ def parse_html(html_path):
 
 
 def resolve_image_path(crop_slug, stage_num, images_dir):
-    """Find the actual image file for a given crop and stage."""
-    # Try standard naming: {crop_slug}_stage_{n}.png
-    candidates = [
-        os.path.join(images_dir, crop_slug, f'{crop_slug}_stage_{stage_num}.png'),
-        os.path.join(images_dir, crop_slug, f'{crop_slug}_stage_{stage_num}.jpg'),
-    ]
-    for c in candidates:
-        if os.path.isfile(c):
-            return c
-    return None
-
-
-def add_crop_slide(prs, crop_data, images_dir, include_footer=True):
-    """Add a single crop slide to the presentation."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
-    slide.background.fill.solid()
-    slide.background.fill.fore_color.rgb = CLR_WHITE
-
-    crop_slug = crop_data.get('crop_slug', '')
-
-    # Determine which stages actually have images
-    existing_stages = []
-    for i in range(1, 11):
-        img_path = resolve_image_path(crop_slug, i, images_dir)
+    """Find the actual image file for a given crop and stage.
+
+    Looks up {crop_slug}_stage_{n}.png, then .jpg, in the image inventory.
+    """
+    return stage_image(images_dir, crop_slug, stage_num)
+
+
+def crop_from_parsed(data, images_dir):
+    """Build a Crop record from parse_html output.
+
+    Stage numbers are read from the image file names, so codes and
+    descriptions stay with their stage on pages that omit some stages.
+    The stages shown are those with an image in images_dir (all 10 if none).
+    """
+    slug = data.get('crop_slug', '')
+    columns = {}
+    for col, src in enumerate(data.get('images', [])):
+        match = re.search(r'_stage_(\d+)\.\w+$', src)
+        if match:
+            columns.setdefault(int(match.group(1)), col)
+
+    stage_paths = {}
+    for i in range(1, NUM_STAGES + 1):
+        img_path = resolve_image_path(slug, i, images_dir)
         if img_path:
-            existing_stages.append(i)
+            stage_paths[i] = img_path
+    numbers = sorted(stage_paths) or list(range(1, NUM_STAGES + 1))
+
+    bbch_codes = data.get('bbch_codes', [])
+    descriptions = data.get('descriptions', [])
+    stages = []
+    for i in numbers:
+        # Pages without an image row are assumed to list all 10 stages
+        col = columns.get(i) if columns else i - 1
+        code = bbch_codes[col] if col is not None and col < len(bbch_codes) else ''
+        desc = descriptions[col] if col is not None and col < len(descriptions) else ''
+        stages.append(Stage(i, code, '', desc, '', stage_paths.get(i)))
+
+    title = data['title']
+    return Crop(slug, title, title, '', None, tuple(stages))
+
+
+_generated_pages = None
+
+
+def page_is_generated(html_path):
+    """True if html_path is byte-for-byte the page the generator last wrote."""
+    global _generated_pages
+    if _generated_pages is None:
+        _generated_pages = load_manifest()['pages']
+    entry = _generated_pages.get(Path(html_path).stem)
+    return bool(entry) and sha256_file(html_path) == entry.get('output')
+
+
+def load_crop(html_path, images_dir, source='auto', parser='fast'):
+    """Crop record for one page, from the registry or parsed from its HTML.
+
+    source='auto' uses the registry for unmodified generated pages and
+    parses everything else; 'registry' uses it for every known slug;
+    'html' always parses.
+    """
+    slug = Path(html_path).stem
+    if source != 'html' and slug in CROPS:
+        if source == 'registry' or page_is_generated(html_path):
+            return build_crop(slug, images_dir)
+    return crop_from_parsed(parse_html(html_path, parser), images_dir)
+
+
+# ─── SLIDE TEMPLATES ───────────────────────────────────────────────
+# A crop slide's layout depends only on its number of stages and whether it
+# has a footer. Each such layout is drawn once with python-pptx, with marker
+# text where the crop's own text goes and an empty picture per stage column;
+# every slide is then a deep copy of that XML with the markers replaced and
+# the pictures pointed at their images.
+
+IMG_ROW_TOP = MARGIN_TOP + int(0.55 * EMU_PER_INCH)
+IMG_ROW_HEIGHT = int(2.4 * EMU_PER_INCH)
+
+TITLE_MARKER = '{title}'
+CODE_MARKER = '{code:%d}'
+DESCRIPTION_MARKER = '{description:%d}'
+
+# bg/sp_tree: XML to copy (bg is None with a master); title, codes,
+# descriptions: positions of the marker runs' <a:t> elements in document
+# order; images: (left, top, width, height) of the stage picture row
+SlideTemplate = namedtuple('SlideTemplate', ['bg', 'sp_tree', 'title', 'codes', 'descriptions',
+                                             'images'])
+
+# (master version, num_stages, include_footer) -> SlideTemplate, per process
+_slide_templates = {}
+
+
+def _draw_slide_template(slide, num_stages, include_footer, master=None):
+    """Draw the layout of a crop slide with markers instead of crop data.
+
+    With a `master`, `slide` uses its crop layout: the named placeholders
+    there are filled (title, subtitle) or give the position of the pictures
+    and table, and the master's theme supplies colours, fonts and borders.
+    Returns the (left, top, width, height) of the stage picture row.
+    """
+    from pptx.dml.color import RGBColor
+    from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+    from pptx.oxml.ns import qn
+    from pptx.util import Inches, Pt
+    from pptx_master import (PH_TITLE, PH_SUBTITLE, PH_IMAGES, PH_TABLE, find_placeholder,
+                             placeholder_box, remove_shape)
 
-    # Fallback: if no images found, use all 10
-    if not existing_stages:
-        existing_stages = list(range(1, 11))
+    def placeholder(name):
+        return find_placeholder(slide, name) if master else None
 
-    num_stages = len(existing_stages)
-    stage_col_w = STAGE_AREA_WIDTH / num_stages
+    if not master:
+        slide.background.fill.solid()
+        slide.background.fill.fore_color.rgb = RGBColor.from_string(CLR_WHITE)
 
     y_cursor = MARGIN_TOP
 
     # ─── TITLE ──────────────────────────────────────────────
-    title_box = slide.shapes.add_textbox(
-        MARGIN_LEFT, y_cursor,
-        CONTENT_WIDTH * 0.75, Inches(0.45)
-    )
-    tf = title_box.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    p.text = crop_data['title']
-    p.font.size = Pt(22)
-    p.font.color.rgb = CLR_TITLE
-    p.font.name = 'Segoe UI'
-    p.font.bold = False
+    title_ph = placeholder(PH_TITLE)
+    if title_ph is not None:
+        title_ph.text_frame.paragraphs[0].text = TITLE_MARKER
+    else:
+        title_box = slide.shapes.add_textbox(
+            MARGIN_LEFT, y_cursor,
+            CONTENT_WIDTH * 0.75, Inches(0.45)
+        )
+        tf = title_box.text_frame
+        tf.word_wrap = True
+        p = tf.paragraphs[0]
+        p.text = TITLE_MARKER
+        p.font.size = Pt(22)
+        p.font.color.rgb = RGBColor.from_string(CLR_TITLE)
+        p.font.name = 'Segoe UI'
+        p.font.bold = False
 
     # Subtitle on the right
-    sub_box = slide.shapes.add_textbox(
-        MARGIN_LEFT + CONTENT_WIDTH * 0.75, y_cursor,
-        CONTENT_WIDTH * 0.25, Inches(0.45)
-    )
-    tf2 = sub_box.text_frame
-    tf2.word_wrap = True
-    p2 = tf2.paragraphs[0]
-    p2.text = 'Botanical Growth Stages'
-    p2.font.size = Pt(10)
-    p2.font.color.rgb = CLR_SUBTITLE
-    p2.font.name = 'Segoe UI'
-    p2.alignment = PP_ALIGN.RIGHT
+    sub_ph = placeholder(PH_SUBTITLE)
+    if sub_ph is not None:
+        sub_ph.text_frame.paragraphs[0].text = 'Botanical Growth Stages'
+    else:
+        sub_box = slide.shapes.add_textbox(
+            MARGIN_LEFT + CONTENT_WIDTH * 0.75, y_cursor,
+            CONTENT_WIDTH * 0.25, Inches(0.45)
+        )
+        tf2 = sub_box.text_frame
+        tf2.word_wrap = True
+        p2 = tf2.paragraphs[0]
+        p2.text = 'Botanical Growth Stages'
+        p2.font.size = Pt(10)
+        p2.font.color.rgb = RGBColor.from_string(CLR_SUBTITLE)
+        p2.font.name = 'Segoe UI'
+        p2.alignment = PP_ALIGN.RIGHT
 
-    y_cursor += Inches(0.55)
+    y_cursor = IMG_ROW_TOP
 
     # ─── IMAGES ROW ─────────────────────────────────────────
-    img_row_height = Inches(2.4)
-    img_x_start = MARGIN_LEFT + LABEL_COL_WIDTH
-
-    images_found = 0
-
-    for col_idx, stage_num in enumerate(existing_stages):
-        img_path = resolve_image_path(crop_slug, stage_num, images_dir)
-
-        if img_path:
-            images_found += 1
-            max_img_w = stage_col_w - Inches(0.05)
-            max_img_h = img_row_height - Inches(0.2)
-
-            try:
-                pic = slide.shapes.add_picture(
-                    img_path,
-                    int(img_x_start + stage_col_w * col_idx + Inches(0.025)),
-                    int(y_cursor),
-                    int(max_img_w),
-                    int(max_img_h)
-                )
-                from PIL import Image as PILImage
-                with PILImage.open(img_path) as pil_img:
-                    orig_w, orig_h = pil_img.size
-
-                aspect = orig_w / orig_h
-                target_w = max_img_w
-                target_h = int(target_w / aspect)
-                if target_h > max_img_h:
-                    target_h = max_img_h
-                    target_w = int(target_h * aspect)
-
-                pic.width = int(target_w)
-                pic.height = int(target_h)
-
-                col_center_x = img_x_start + stage_col_w * col_idx + stage_col_w / 2
-                pic.left = int(col_center_x - target_w / 2)
-                pic.top = int(y_cursor + img_row_height - target_h)
+    images_ph = placeholder(PH_IMAGES)
+    if images_ph is not None:
+        images_box = placeholder_box(images_ph)
+        remove_shape(images_ph)
+    else:
+        images_box = (MARGIN_LEFT + LABEL_COL_WIDTH, IMG_ROW_TOP, STAGE_AREA_WIDTH, IMG_ROW_HEIGHT)
 
-            except Exception as e:
-                print(f"  Warning: Could not add image {img_path}: {e}")
+    # One empty picture per stage; placed and linked by add_crop_slide
+    sp_tree = slide.shapes._spTree
+    for _ in range(num_stages):
+        id_ = slide.shapes._next_shape_id
+        sp_tree.add_pic(id_, f'Picture {id_ - 1}', '', '', 0, 0, 0, 0)
 
-    y_cursor += img_row_height + Inches(0.05)
+    y_cursor += IMG_ROW_HEIGHT + Inches(0.05)
 
     # ─── DATA TABLE ─────────────────────────────────────────
     num_cols = num_stages + 1  # label column + stage columns
     num_rows = 3
 
-    table_height = Inches(1.8)
+    table_ph = placeholder(PH_TABLE)
+    if table_ph is not None:
+        table_x, table_y, table_width, table_height = placeholder_box(table_ph)
+        remove_shape(table_ph)
+    else:
+        table_x, table_y = MARGIN_LEFT, y_cursor
+        table_width, table_height = CONTENT_WIDTH, Inches(1.8)
+    stage_col_w = (table_width - LABEL_COL_WIDTH) / num_stages
+
     table_shape = slide.shapes.add_table(
         num_rows, num_cols,
-        int(MARGIN_LEFT), int(y_cursor),
-        int(CONTENT_WIDTH), int(table_height)
+        int(table_x), int(table_y),
+        int(table_width), int(table_height)
     )
     table = table_shape.table
 
@@ -267,7 +485,8 @@ def add_crop_slide(prs, crop_data, images_dir, include_footer=True):
     for i in range(1, num_cols):
         table.columns[i].width = int(stage_col_w)
 
-    # Style helper
+    # Style helper; with a master only sizes and alignment are set, so the
+    # table style of its theme decides colours, fonts and fills
     def style_cell(cell, text, font_size=8, bold=False, color=CLR_BBCH,
                    align=PP_ALIGN.CENTER, fill_color=None):
         cell.text = ''
@@ -275,8 +494,9 @@ def add_crop_slide(prs, crop_data, images_dir, include_footer=True):
         p.text = text
         p.font.size = Pt(font_size)
         p.font.bold = bold
-        p.font.color.rgb = color
-        p.font.name = 'Segoe UI'
+        if not master:
+            p.font.color.rgb = RGBColor.from_string(color)
+            p.font.name = 'Segoe UI'
         p.alignment = align
         cell.vertical_anchor = MSO_ANCHOR.MIDDLE
         # Margins
@@ -286,9 +506,11 @@ def add_crop_slide(prs, crop_data, images_dir, include_footer=True):
         cell.text_frame.margin_bottom = Pt(3)
         cell.text_frame.word_wrap = True
 
+        if master:
+            return
         if fill_color:
             cell.fill.solid()
-            cell.fill.fore_color.rgb = fill_color
+            cell.fill.fore_color.rgb = RGBColor.from_string(fill_color)
         else:
             cell.fill.background()
 
@@ -296,20 +518,17 @@ def add_crop_slide(prs, crop_data, images_dir, include_footer=True):
     style_cell(table.cell(0, 0), 'BBCH Stage', font_size=9, bold=True,
                color=CLR_LABEL, align=PP_ALIGN.LEFT, fill_color=CLR_HEADER_BG)
 
-    bbch_codes = crop_data.get('bbch_codes', [])
-    for col_idx, stage_num in enumerate(existing_stages):
-        code = bbch_codes[stage_num - 1] if (stage_num - 1) < len(bbch_codes) else ''
-        style_cell(table.cell(0, col_idx + 1), code, font_size=10, bold=True,
+    for col_idx in range(num_stages):
+        style_cell(table.cell(0, col_idx + 1), CODE_MARKER % col_idx, font_size=10, bold=True,
                    color=CLR_BBCH, fill_color=CLR_HEADER_BG)
 
     # Row 1: Description
     style_cell(table.cell(1, 0), 'Description', font_size=9, bold=True,
                color=CLR_LABEL, align=PP_ALIGN.LEFT)
 
-    descriptions = crop_data.get('descriptions', [])
-    for col_idx, stage_num in enumerate(existing_stages):
-        desc = descriptions[stage_num - 1] if (stage_num - 1) < len(descriptions) else ''
-        style_cell(table.cell(1, col_idx + 1), desc, font_size=7, color=CLR_DESC)
+    for col_idx in range(num_stages):
+        style_cell(table.cell(1, col_idx + 1), DESCRIPTION_MARKER % col_idx,
+                   font_size=7, color=CLR_DESC)
 
     # Row 2: Your Product (empty with placeholder)
     style_cell(table.cell(2, 0), 'Your Product', font_size=9, bold=True,
@@ -320,37 +539,21 @@ def add_crop_slide(prs, crop_data, images_dir, include_footer=True):
                    font_size=6, color=CLR_PLACEHOLDER)
 
     # Set table borders
-    from pptx.oxml.ns import qn
-    tbl = table._tbl
-    for row_idx in range(num_rows):
-        for col_idx in range(num_cols):
-            cell = table.cell(row_idx, col_idx)
-            tc = cell._tc
-            tcPr = tc.get_or_add_tcPr()
-
-            for border_name in ['a:lnL', 'a:lnR', 'a:lnT', 'a:lnB']:
-                border = tcPr.find(qn(border_name))
-                if border is None:
-                    border = tcPr.makeelement(qn(border_name), {})
-                    tcPr.append(border)
-
-                border.set('w', str(Pt(0.5)))
-                border.set('cmpd', 'sng')
-
-                solidFill = border.find(qn('a:solidFill'))
-                if solidFill is None:
+    if not master:
+        for row_idx in range(num_rows):
+            for col_idx in range(num_cols):
+                tcPr = table.cell(row_idx, col_idx)._tc.get_or_add_tcPr()
+                for border_name in ['a:lnL', 'a:lnR', 'a:lnT', 'a:lnB']:
+                    border = tcPr.makeelement(qn(border_name),
+                                              {'w': str(Pt(0.5)), 'cmpd': 'sng'})
                     solidFill = border.makeelement(qn('a:solidFill'), {})
+                    solidFill.append(solidFill.makeelement(qn('a:srgbClr'), {'val': CLR_BORDER}))
                     border.append(solidFill)
-                else:
-                    solidFill.clear()
-
-                srgbClr = solidFill.makeelement(qn('a:srgbClr'), {'val': 'C8CEC0'})
-                solidFill.append(srgbClr)
-
-    y_cursor += table_height + Inches(0.15)
+                    tcPr.append(border)
 
     # ─── FOOTER ─────────────────────────────────────────────
-    if include_footer:
+    # A master brings its own footer placeholders
+    if include_footer and not master:
         footer_box = slide.shapes.add_textbox(
             MARGIN_LEFT, SLIDE_HEIGHT - Inches(0.45),
             CONTENT_WIDTH, Inches(0.3)
@@ -359,10 +562,156 @@ def add_crop_slide(prs, crop_data, images_dir, include_footer=True):
         p = tf.paragraphs[0]
         p.text = 'crop-stages.github.io'
         p.font.size = Pt(8)
-        p.font.color.rgb = CLR_FOOTER
+        p.font.color.rgb = RGBColor.from_string(CLR_FOOTER)
         p.font.name = 'Segoe UI'
         p.alignment = PP_ALIGN.RIGHT
 
+    return images_box
+
+
+def crop_layout(prs, master=None):
+    """The slide layout crop slides are added with."""
+    if master:
+        from pptx_master import crop_layout as master_crop_layout
+        return master_crop_layout(prs)
+    return prs.slide_layouts[6]  # Blank layout
+
+
+def slide_template(num_stages, include_footer=True, master=None):
+    """The SlideTemplate for a crop with num_stages stages, built on first use.
+
+    `master` is the path of a designer master (--template), or None for the
+    built-in design; a master's template is rebuilt when the file changes.
+    """
+    version = None
+    if master:
+        from pptx_master import master_version
+        version = master_version(master)
+    key = (version, num_stages, include_footer)
+    template = _slide_templates.get(key)
+    if template is None:
+        from pptx.oxml.ns import qn
+
+        prs = new_presentation(master)
+        slide = prs.slides.add_slide(crop_layout(prs, master))
+        images_box = _draw_slide_template(slide, num_stages, include_footer, master)
+        c_sld = slide._element.cSld
+        runs = {t.text: i for i, t in enumerate(c_sld.spTree.iter(qn('a:t')))}
+        template = SlideTemplate(
+            bg=c_sld.bg,
+            sp_tree=c_sld.spTree,
+            title=runs[TITLE_MARKER],
+            codes=[runs[CODE_MARKER % i] for i in range(num_stages)],
+            descriptions=[runs[DESCRIPTION_MARKER % i] for i in range(num_stages)],
+            images=images_box,
+        )
+        _slide_templates[key] = template
+    return template
+
+
+def _set_run_text(t, text):
+    """Replace the text of a marker run; an empty text drops the run."""
+    from pptx.text.text import _Paragraph
+
+    if text.isprintable():
+        t.text = text
+    elif text:
+        # Line breaks, tabs and control characters need python-pptx's handling
+        _Paragraph(t.getparent().getparent(), None).text = text
+    else:
+        run = t.getparent()
+        run.getparent().remove(run)
+
+
+def add_crop_slide(prs, crop, images_dir, include_footer=True, metadata=None,
+                   image_dpi=None, master=None):
+    """Add a single crop slide to the presentation.
+
+    `crop` is a Crop record; a parse_html() dict is also accepted and is
+    converted with crop_from_parsed(images_dir).
+
+    The slide is a copy of slide_template() for the crop's stage count with
+    the title, BBCH codes, descriptions and pictures filled in. `master`
+    is the designer master file `prs` was created from, if any.
+
+    Image sizes come from `metadata` (an ImageMetadataStore, default: the
+    shared on-disk cache) so images are not reopened for layout. With
+    `image_dpi`, each image is first resized for its box at that DPI.
+    """
+    from copy import deepcopy
+    from pptx.oxml.ns import qn
+    from pptx.util import Inches
+
+    if metadata is None:
+        metadata = default_store()
+    if isinstance(crop, dict):
+        crop = crop_from_parsed(crop, images_dir)
+
+    crop_slug = crop.slug
+    stages = crop.stages
+    num_stages = len(stages)
+    template = slide_template(num_stages, include_footer, master)
+    img_x_start, img_row_top, img_row_width, img_row_height = template.images
+    stage_col_w = img_row_width / num_stages
+
+    slide = prs.slides.add_slide(crop_layout(prs, master))
+    # The slide keeps its own (empty) spTree element, which slide.shapes
+    # already refers to, and takes the template's shapes
+    c_sld = slide._element.cSld
+    sp_tree = c_sld.spTree
+    sp_tree[:] = deepcopy(template.sp_tree)
+    if template.bg is not None:
+        c_sld.insert(0, deepcopy(template.bg))
+
+    # ─── TEXT ───────────────────────────────────────────────
+    runs = list(sp_tree.iter(qn('a:t')))
+    _set_run_text(runs[template.title], crop.title)
+    for col_idx, stage in enumerate(stages):
+        _set_run_text(runs[template.codes[col_idx]], stage.code)
+        _set_run_text(runs[template.descriptions[col_idx]], stage.description)
+
+    # ─── IMAGES ROW ─────────────────────────────────────────
+    images_found = 0
+
+    for col_idx, (stage, pic) in enumerate(zip(stages, sp_tree.findall(qn('p:pic')))):
+        img_path = stage.image
+        placed = False
+
+        if img_path:
+            images_found += 1
+            max_img_w = stage_col_w - Inches(0.05)
+            max_img_h = img_row_height - Inches(0.2)
+
+            try:
+                # Fit the picture from cached metadata before embedding it
+                info = metadata.get(img_path)
+                aspect = info['width'] / info['height']
+                target_w = max_img_w
+                target_h = int(target_w / aspect)
+                if target_h > max_img_h:
+                    target_h = max_img_h
+                    target_w = int(target_h * aspect)
+
+                if image_dpi:
+                    img_path = prepare_image(img_path, info, target_w, target_h, image_dpi)
+
+                # python-pptx stores an image already in the deck only once
+                part, rId = slide.part.get_or_add_image_part(img_path)
+                col_center_x = img_x_start + stage_col_w * col_idx + stage_col_w / 2
+                pic.nvPicPr.cNvPr.set('descr', part.desc)
+                pic.blipFill.blip.set(qn('r:embed'), rId)
+                pic.x = int(col_center_x - target_w / 2)
+                pic.y = int(img_row_top + img_row_height - target_h)
+                pic.cx = int(target_w)
+                pic.cy = int(target_h)
+                placed = True
+
+            except Exception as e:
+                print(f"  Warning: Could not add image {img_path}: {e}")
+
+        if not placed:
+            sp_tree.remove(pic)
+
     if images_found == 0:
         print(f"  ⚠ No images found for '{crop_slug}'")
     else:
@@ -371,26 +720,69 @@ def add_crop_slide(prs, crop_data, images_dir, include_footer=True):
     return slide
 
 
-def process_single_html(html_path, images_dir, output_dir):
+def process_single_html(html_path, images_dir, output_dir, image_dpi=None, parser='fast',
+                        source='auto', master=None):
     """Process one HTML file → one PPTX file."""
     print(f"Processing: {os.path.basename(html_path)}")
-    crop_data = parse_html(html_path)
-
-    prs = Presentation()
-    prs.slide_width = SLIDE_WIDTH
-    prs.slide_height = SLIDE_HEIGHT
+    crop = load_crop(html_path, images_dir, source, parser)
 
-    add_crop_slide(prs, crop_data, images_dir)
+    prs = new_presentation(master)
+    add_crop_slide(prs, crop, images_dir, image_dpi=image_dpi, master=master)
 
     stem = Path(html_path).stem
     output_path = os.path.join(output_dir, f'{stem}.pptx')
     prs.save(output_path)
+    default_store().save()
     print(f"  → Saved: {output_path}")
     return output_path
 
 
-def process_all_to_single(html_dir, images_dir, output_path):
-    """Process all HTML files in a directory → one PPTX with multiple slides."""
+def build_deck(html_files, images_dir, output_path, image_dpi=None, parser='fast',
+               source='auto', master=None):
+    """Build one PPTX with a slide per HTML file."""
+    prs = new_presentation(master)
+    metadata = default_store()
+
+    for html_path in html_files:
+        print(f"\nProcessing: {os.path.basename(html_path)}")
+        try:
+            crop = load_crop(html_path, images_dir, source, parser)
+            add_crop_slide(prs, crop, images_dir, metadata=metadata,
+                           image_dpi=image_dpi, master=master)
+        except Exception as e:
+            print(f"  ERROR: {e}")
+
+    prs.save(output_path)
+    metadata.save()
+
+
+def _build_chunk(job):
+    """Worker entry point: build one partial deck and capture its output."""
+    html_files, images_dir, output_path, image_dpi, parser, source, master = job
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        build_deck(html_files, images_dir, output_path, image_dpi, parser, source, master)
+    # python-pptx parts reference their package cyclically; free the batch
+    # now instead of letting several batches pile up before the next GC.
+    gc.collect()
+    return buf.getvalue()
+
+
+def process_all_to_single(html_dir, images_dir, output_path, image_dpi=None,
+                          batch_size=None, jobs=1, parser='fast', source='auto', master=None,
+                          force=False):
+    """Process all HTML files in a directory → one PPTX with multiple slides.
+
+    The deck is assembled from cached single-crop decks (see
+    assemble_single), so only crops whose inputs changed are rebuilt.
+    With `batch_size`, slides are instead built from scratch into partial
+    decks of that many crops (on up to `jobs` processes) which are then
+    merged at the package level, so peak memory is bounded by one batch
+    rather than the catalog.
+    """
+    import tempfile
+    from pptx_merge import merge_decks
+
     html_files = sorted(
         glob.glob(os.path.join(html_dir, '*.html'))
     )
@@ -401,20 +793,315 @@ def process_all_to_single(html_dir, images_dir, output_path):
 
     print(f"Found {len(html_files)} HTML files")
 
-    prs = Presentation()
-    prs.slide_width = SLIDE_WIDTH
-    prs.slide_height = SLIDE_HEIGHT
+    if not batch_size:
+        assemble_single(html_files, images_dir, output_path, jobs=jobs, image_dpi=image_dpi,
+                        parser=parser, source=source, master=master, force=force)
+        return
 
-    for html_path in html_files:
-        print(f"\nProcessing: {os.path.basename(html_path)}")
+    chunks = [html_files[i:i + batch_size] for i in range(0, len(html_files), batch_size)]
+    parts_root = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryDirectory(prefix='.parts-', dir=parts_root) as parts_dir:
+        work = [
+            (chunk, images_dir, os.path.join(parts_dir, f'part-{k:04d}.pptx'),
+             image_dpi, parser, source, master)
+            for k, chunk in enumerate(chunks)
+        ]
+        for log in _ordered_results(_build_chunk, work, jobs):
+            print(log, end='')
+
+        print(f"\nMerging {len(work)} partial decks of up to {batch_size} slides")
+        stats = merge_decks([job[2] for job in work], output_path)
+
+    print(f"\n✅ Saved combined PPTX: {output_path} ({stats.slides} slides)")
+    print(f"   Images: {stats.media_refs} pictures, {stats.media_parts} unique image parts, "
+          f"{format_bytes(stats.bytes_saved)} saved by dedup")
+
+
+def format_bytes(num):
+    """Human-readable byte count, e.g. '2.6 MB'."""
+    for unit in ('B', 'KB', 'MB'):
+        if abs(num) < 1024 or unit == 'MB':
+            return f'{num:.0f} {unit}' if unit == 'B' else f'{num:.1f} {unit}'
+        num /= 1024
+
+
+def _ordered_results(func, work, jobs):
+    """Yield func(item) for each item in work, in order, on up to `jobs` processes."""
+    if jobs == 1 or len(work) < 2:
+        yield from map(func, work)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(func, work)
+
+
+def _export_one(job):
+    """Worker entry point: run process_single_html and capture its output."""
+    html_path, images_dir, output_dir, image_dpi, parser, source, master = job
+    buf = io.StringIO()
+    error = None
+    with contextlib.redirect_stdout(buf):
         try:
-            crop_data = parse_html(html_path)
-            add_crop_slide(prs, crop_data, images_dir)
+            process_single_html(html_path, images_dir, output_dir, image_dpi, parser, source,
+                                master)
         except Exception as e:
-            print(f"  ERROR: {e}")
+            error = str(e)
+            print(f"  ERROR processing {html_path}: {e}")
+    return html_path, buf.getvalue(), error
+
+
+def export_html_files(html_files, images_dir, output_dir, jobs=1, image_dpi=None,
+                      parser='fast', source='auto', master=None):
+    """Convert each HTML file to its own PPTX, optionally on a process pool.
+
+    Per-file output is printed in input order regardless of which worker
+    finishes first. Returns a list of (html_path, error) for failed files.
+    """
+    work = [(path, images_dir, output_dir, image_dpi, parser, source, master)
+            for path in html_files]
+    failures = []
+
+    for html_path, log, error in _ordered_results(_export_one, work, jobs):
+        print(log, end='')
+        if error is not None:
+            failures.append((html_path, error))
+
+    return failures
+
+
+# ─── INCREMENTAL EXPORT ────────────────────────────────────────────
+# {output dir}/.export-manifest.json records for each page stem the hash of
+# everything its deck is built from and the hash of the deck written:
+#   "pages": stem -> {"inputs": sha256, "output": sha256 of {stem}.pptx}
+#   "combined": file name -> {"inputs": sha256 of the crop decks, "output": sha256}
+# A deck is rebuilt only if its inputs changed or the file was changed or removed.
+
+EXPORT_MANIFEST = '.export-manifest.json'
+# Single-crop decks a --single-file deck is assembled from, next to it
+CROP_DECKS_DIRNAME = '.crop-decks'
+
+LAYOUT_SETTINGS = {
+    'slide': [SLIDE_WIDTH, SLIDE_HEIGHT],
+    'margins': [MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP],
+    'columns': [LABEL_COL_WIDTH, STAGE_AREA_WIDTH],
+    'images': [IMG_ROW_TOP, IMG_ROW_HEIGHT],
+    'colors': [CLR_TITLE, CLR_SUBTITLE, CLR_LABEL, CLR_BBCH, CLR_DESC, CLR_PLACEHOLDER,
+               CLR_BORDER, CLR_HEADER_BG, CLR_WHITE, CLR_FOOTER],
+}
+
+
+@lru_cache(maxsize=None)
+def _slide_code_source():
+    """Source of the code a crop deck's content depends on: the slide
+    functions here, the master loader and image resizing."""
+    import inspect
+    import image_prep
+    import pptx_master
+
+    return ''.join(inspect.getsource(obj) for obj in
+                   (new_presentation, crop_layout, slide_template, _draw_slide_template,
+                    _set_run_text, add_crop_slide, pptx_master, image_prep))
+
+
+def deck_inputs_hash(crop, metadata, image_dpi=None, master_hash=None):
+    """Hash everything a crop's deck is built from.
+
+    Covers the crop's text, the name and content hash of each stage image,
+    the image DPI, the master file and the slide layout (constants and the
+    code that draws, fills and embeds it; see _slide_code_source).
+    """
+    images = []
+    for stage in crop.stages:
+        try:
+            images.append([os.path.basename(stage.image), metadata.get(stage.image)['sha256']]
+                          if stage.image else None)
+        except OSError:
+            images.append(None)
+    inputs = {
+        'crop': [crop.slug, crop.title,
+                 [[stage.number, stage.code, stage.description] for stage in crop.stages]],
+        'images': images,
+        'image_dpi': image_dpi,
+        'master': master_hash,
+        'layout': LAYOUT_SETTINGS,
+        'code': _slide_code_source(),
+    }
+    return sha256_text(json.dumps(inputs, sort_keys=True, ensure_ascii=False))
+
+
+def export_changed(html_files, images_dir, output_dir, jobs=1, image_dpi=None,
+                   parser='fast', source='auto', master=None, force=False):
+    """Export the decks of html_files whose inputs changed since the last run.
+
+    Returns (exported, skipped, failures) with failures as in
+    export_html_files. With `force` every deck is rebuilt.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, EXPORT_MANIFEST)
+    manifest = load_manifest(manifest_path)
+    entries = manifest['pages']
+    metadata = default_store()
+    master_hash = sha256_file(master) if master else None
+
+    stale = []
+    hashes = {}
+    for html_path in html_files:
+        stem = Path(html_path).stem
+        deck_path = os.path.join(output_dir, f'{stem}.pptx')
+        try:
+            crop = load_crop(html_path, images_dir, source, parser)
+            hashes[stem] = deck_inputs_hash(crop, metadata, image_dpi, master_hash)
+        except Exception:
+            hashes[stem] = None  # the export reports the error
+        entry = entries.get(stem)
+        if (not force and hashes[stem] and entry and entry.get('inputs') == hashes[stem]
+                and os.path.isfile(deck_path) and sha256_file(deck_path) == entry.get('output')):
+            continue
+        stale.append(html_path)
+    metadata.save()
+
+    failures = export_html_files(stale, images_dir, output_dir, jobs=jobs, image_dpi=image_dpi,
+                                 parser=parser, source=source, master=master)
+    failed = {html_path for html_path, _ in failures}
+    for html_path in stale:
+        stem = Path(html_path).stem
+        deck_path = os.path.join(output_dir, f'{stem}.pptx')
+        if html_path in failed or not hashes[stem] or not os.path.isfile(deck_path):
+            entries.pop(stem, None)
+        else:
+            entries[stem] = {'inputs': hashes[stem], 'output': sha256_file(deck_path)}
+    save_manifest(manifest, manifest_path)
+    return len(stale) - len(failed), len(html_files) - len(stale), failures
+
+
+def assemble_single(html_files, images_dir, output_path, jobs=1, image_dpi=None,
+                    parser='fast', source='auto', master=None, force=False):
+    """Write the combined deck from up-to-date single-crop decks.
+
+    The crop decks live in CROP_DECKS_DIRNAME next to output_path and are
+    refreshed with export_changed; the combined deck is only re-merged when
+    one of them changed.
+    """
+    from pptx_merge import merge_decks
+
+    deck_dir = os.path.join(os.path.dirname(os.path.abspath(output_path)), CROP_DECKS_DIRNAME)
+    exported, skipped, failures = export_changed(html_files, images_dir, deck_dir, jobs=jobs,
+                                                 image_dpi=image_dpi, parser=parser,
+                                                 source=source, master=master, force=force)
+    print(f"\nCrop decks: exported {exported}, skipped {skipped} unchanged")
+    for html_path, error in failures:
+        print(f"  ERROR: {os.path.basename(html_path)}: {error}")
+
+    manifest_path = os.path.join(deck_dir, EXPORT_MANIFEST)
+    manifest = load_manifest(manifest_path)
+    entries = manifest['pages']
+    stems = [Path(path).stem for path in html_files if Path(path).stem in entries]
+    if not stems:
+        print("No crop decks to combine")
+        return
+    inputs_hash = sha256_text(json.dumps([[stem, entries[stem]['output']] for stem in stems]))
+
+    name = os.path.basename(output_path)
+    combined = manifest.setdefault('combined', {})
+    entry = combined.get(name)
+    if (not force and entry and entry.get('inputs') == inputs_hash
+            and os.path.isfile(output_path) and sha256_file(output_path) == entry.get('output')):
+        print(f"\n✅ Combined PPTX is up to date: {output_path} ({len(stems)} slides)")
+        return
 
-    prs.save(output_path)
-    print(f"\n✅ Saved combined PPTX: {output_path} ({len(html_files)} slides)")
+    stats = merge_decks([os.path.join(deck_dir, f'{stem}.pptx') for stem in stems], output_path)
+    combined[name] = {'inputs': inputs_hash, 'output': sha256_file(output_path)}
+    save_manifest(manifest, manifest_path)
+    print(f"\n✅ Saved combined PPTX: {output_path} ({stats.slides} slides)")
+    print(f"   Images: {stats.media_refs} pictures, {stats.media_parts} unique image parts, "
+          f"{format_bytes(stats.bytes_saved)} saved by dedup")
+
+
+def changed_stems(changed, html_dir, images_dir):
+    """Page stems affected by the `changed` paths, or None if every deck is.
+
+    A page counts by its own file, a crop by any file in its image folder;
+    an event on a watched directory itself affects everything. Files in
+    subdirectories of html_dir (fragments/) and the registry are ignored.
+    """
+    html_root = os.path.abspath(html_dir)
+    images_root = os.path.abspath(images_dir)
+    stems = set()
+    for path in changed:
+        if path in (html_root, images_root):
+            return None
+        if os.path.dirname(path) == html_root and path.endswith('.html'):
+            stems.add(Path(path).stem)
+        elif path.startswith(images_root + os.sep):
+            stems.add(os.path.relpath(path, images_root).split(os.sep)[0])
+    return stems
+
+
+def watch_exports(html_dir, images_dir, output_dir, single_file_path=None, jobs=1,
+                  image_dpi=None, batch_size=None, parser='fast', source='auto', master=None,
+                  force=False):
+    """Export once, then re-export affected decks on every change until Ctrl-C.
+
+    With single_file_path the combined deck is re-assembled instead of
+    per-crop decks. Decks of pages that were deleted are removed; a change
+    to the master file re-exports every deck. `force` applies to the first
+    export only.
+    """
+    from file_watcher import FileWatcher
+    global _generated_pages
+
+    def export(stems=None, force=False):
+        if single_file_path:
+            process_all_to_single(html_dir, images_dir, single_file_path, image_dpi=image_dpi,
+                                  batch_size=batch_size, jobs=jobs, parser=parser, source=source,
+                                  master=master, force=force)
+            return
+        html_files = sorted(glob.glob(os.path.join(html_dir, '*.html')))
+        if stems is not None:
+            html_files = [path for path in html_files if Path(path).stem in stems]
+            for stem in stems:
+                deck = os.path.join(output_dir, f'{stem}.pptx')
+                page = os.path.join(html_dir, f'{stem}.html')
+                if not os.path.isfile(page) and os.path.isfile(deck):
+                    os.remove(deck)
+                    print(f"Removed {deck}")
+        exported, skipped, _ = export_changed(html_files, images_dir, output_dir, jobs=jobs,
+                                              image_dpi=image_dpi, parser=parser, source=source,
+                                              master=master, force=force)
+        print(f"Decks: exported {exported}, skipped {skipped} unchanged")
+
+    export(force=force)
+    paths = [html_dir, images_dir, REGISTRY_PATH]
+    if master:
+        master = os.path.abspath(master)
+        paths.append(master)
+    with FileWatcher(paths) as watcher:
+        print(f"\nWatching {len(paths)} paths ({watcher.backend}); Ctrl-C to stop")
+        try:
+            for changed in watcher.changes():
+                start = time.perf_counter()
+                stems = changed_stems(changed, html_dir, images_dir)
+                if master in changed:
+                    stems = None
+                if REGISTRY_PATH in changed:
+                    try:
+                        registry_slugs = reload_registry()
+                    except Exception as e:
+                        print(f"\n⚠ crop registry not reloaded: {e}")
+                        continue
+                    if stems is not None:
+                        stems |= registry_slugs
+                if stems is not None and not stems:
+                    continue
+                names = ', '.join(sorted(stems)) if stems is not None else 'all crops'
+                print(f"\nChanged: {names}")
+                # The generator may have rewritten pages and the manifest meanwhile
+                _generated_pages = None
+                clear_inventory()
+                export(stems)
+                print(f"Exported in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except KeyboardInterrupt:
+            print("\nStopped watching")
 
 
 def main():
@@ -431,22 +1118,72 @@ def main():
                         help='Combine all crops into one PPTX')
     parser.add_argument('--single-file-name', default='all_crops.pptx',
                         help='Name for combined PPTX file')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for per-file export or --batch-size '
+                             'partial decks (0 = one per CPU core)')
+    parser.add_argument('--image-dpi', type=int, default=None,
+                        help='Downscale and recompress images to this DPI at their slide size '
+                             '(cached in .cache/pptx-images)')
+    parser.add_argument('--batch-size', type=int, default=None,
+                        help='With --single-file, build partial decks of this many slides '
+                             'and merge them')
+    parser.add_argument('--parser', choices=['fast', 'bs4'], default='fast',
+                        help='HTML extraction backend: lxml XPath (fast, falls back to '
+                             'BeautifulSoup) or BeautifulSoup only')
+    parser.add_argument('--source', choices=['auto', 'registry', 'html'], default='auto',
+                        help='Crop data source: the shared registry for unmodified generated '
+                             'pages (auto), the registry for every known crop, or HTML only')
+
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and re-export the decks of crops whose page, '
+                             'images or registry entry change')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every deck even if its inputs are unchanged')
+    parser.add_argument('--template', default=None,
+                        help='Designer master (.pptx or .potx) with a "Crop Stages" layout '
+                             'whose named placeholders the slides are bound to')
 
     args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    if args.template:
+        try:
+            new_presentation(args.template)
+        except Exception as e:
+            parser.error(f"--template {args.template}: {e}")
 
     os.makedirs(args.output_dir, exist_ok=True)
 
+    if args.watch:
+        single_file_path = (os.path.join(args.output_dir, args.single_file_name)
+                            if args.single_file else None)
+        watch_exports(args.html_dir, args.images_dir, args.output_dir, single_file_path,
+                      jobs=jobs, image_dpi=args.image_dpi, batch_size=args.batch_size,
+                      parser=args.parser, source=args.source, master=args.template,
+                      force=args.force)
+        return
+
     if args.single_file:
         output_path = os.path.join(args.output_dir, args.single_file_name)
-        process_all_to_single(args.html_dir, args.images_dir, output_path)
+        process_all_to_single(args.html_dir, args.images_dir, output_path,
+                              image_dpi=args.image_dpi, batch_size=args.batch_size,
+                              jobs=jobs, parser=args.parser, source=args.source,
+                              master=args.template, force=args.force)
     else:
         html_files = sorted(glob.glob(os.path.join(args.html_dir, '*.html')))
         print(f"Found {len(html_files)} HTML files")
-        for html_path in html_files:
-            try:
-                process_single_html(html_path, args.images_dir, args.output_dir)
-            except Exception as e:
-                print(f"  ERROR processing {html_path}: {e}")
+        exported, skipped, failures = export_changed(html_files, args.images_dir,
+                                                     args.output_dir, jobs=jobs,
+                                                     image_dpi=args.image_dpi,
+                                                     parser=args.parser, source=args.source,
+                                                     master=args.template, force=args.force)
+
+        print(f"\nExported {exported}/{len(html_files)} files to {args.output_dir}"
+              f" ({skipped} unchanged)")
+        if failures:
+            print(f"Failed: {len(failures)}")
+            for html_path, error in failures:
+                print(f"  {os.path.basename(html_path)}: {error}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Stage Strip Atlases
+===================
+Packs the stage images of each crop into one horizontal strip, so a crop
+page (or a carousel slide) needs a single image request instead of one per
+stage.
+
+Usage:
+    python scripts/image_atlas.py --images-dir assets/images/crops [--jobs 0]
+    python scripts/generate_tables_html.py --images-dir assets/images/crops --atlas
+
+Atlases are written to assets/images/atlas/{slug}.{hash}.webp, where hash
+covers the source images and encoder settings, and are listed in
+assets/images/atlas/index.json with the strip size and each stage's frame
+as [x, y, width, height]. A slug's atlas is only rebuilt when one of its
+stage images changed; atlases of removed slugs and superseded hashes are
+deleted.
+"""
+
+import io
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+from image_inventory import load_inventory
+from image_metadata import ROOT_DIR, default_store
+
+
+ATLAS_DIR = os.path.join(ROOT_DIR, 'assets', 'images', 'atlas')
+ATLAS_INDEX = os.path.join(ATLAS_DIR, 'index.json')
+
+# Gap between frames, so scaled-down frames never bleed into each other
+PADDING = 2
+WEBP_OPTIONS = {'quality': 85, 'method': 4}
+SETTINGS = {'padding': PADDING, 'webp': WEBP_OPTIONS}
+
+
+def layout_frames(sizes):
+    """Place (stage, width, height) frames left to right, top-aligned.
+
+    Returns ({stage: [x, y, w, h]}, atlas width, atlas height).
+    """
+    frames = {}
+    x = 0
+    for stage, width, height in sizes:
+        frames[str(stage)] = [x, 0, width, height]
+        x += width + PADDING
+    return frames, max(x - PADDING, 1), max((h for _, _, h in sizes), default=1)
+
+
+def _build_atlas(job):
+    """Worker: compose and encode one slug's strip; returns (slug, entry)."""
+    slug, sources, digest, out_dir = job
+    from PIL import Image as PILImage
+
+    frames, width, height = layout_frames([(stage, info['width'], info['height'])
+                                           for stage, _, info in sources])
+    atlas = PILImage.new('RGBA', (width, height), (0, 0, 0, 0))
+    for stage, path, _ in sources:
+        x, y, _, _ = frames[str(stage)]
+        with PILImage.open(path) as img:
+            atlas.paste(img.convert('RGBA'), (x, y))
+
+    name = f'{slug}.{digest[:10]}.webp'
+    buf = io.BytesIO()
+    atlas.save(buf, 'WEBP', **WEBP_OPTIONS)
+    with open(os.path.join(out_dir, name), 'wb') as f:
+        f.write(buf.getvalue())
+    return slug, {'file': name, 'hash': digest, 'width': width, 'height': height,
+                  'frames': frames}
+
+
+def load_atlas_index(path=ATLAS_INDEX):
+    """The atlas index {slug: entry}, or {} if no atlases were built."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('atlases', {})
+
+
+def build_atlases(images_dir, out_dir=ATLAS_DIR, jobs=1, force=False):
+    """Build the strip atlas of every slug; returns (built, skipped, removed)."""
+    index_path = os.path.join(out_dir, 'index.json')
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    old_atlases = previous.get('atlases', {})
+    os.makedirs(out_dir, exist_ok=True)
+
+    store = default_store()
+    atlases = {}
+    work = []
+    for slug, stages in sorted(load_inventory(images_dir).items()):
+        sources = [(stage, by_ext['.png'], store.get(by_ext['.png']))
+                   for stage, by_ext in sorted(stages.items()) if '.png' in by_ext]
+        if not sources:
+            continue
+        digest = hashlib.sha256(json.dumps(
+            [SETTINGS, [(stage, info['sha256']) for stage, _, info in sources]],
+            sort_keys=True).encode('utf-8')).hexdigest()
+        old = old_atlases.get(slug)
+        if (not force and old and old.get('hash') == digest
+                and os.path.isfile(os.path.join(out_dir, old['file']))):
+            atlases[slug] = old
+        else:
+            work.append((slug, sources, digest, out_dir))
+    store.save()
+
+    if jobs == 1 or len(work) < 2:
+        for slug, entry in map(_build_atlas, work):
+            atlases[slug] = entry
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for slug, entry in pool.map(_build_atlas, work):
+                atlases[slug] = entry
+
+    keep = {entry['file'] for entry in atlases.values()}
+    removed = 0
+    for entry in os.scandir(out_dir):
+        if entry.is_file() and entry.name != 'index.json' and entry.name not in keep:
+            os.remove(entry.path)
+            removed += 1
+
+    data = {'settings': SETTINGS, 'atlases': dict(sorted(atlases.items()))}
+    if data != previous:
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+            f.write('\n')
+
+    built = len(work)
+    print(f"Atlases: built {built}, skipped {len(atlases) - built} unchanged, "
+          f"removed {removed} stale file(s)")
+    return built, len(atlases) - built, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack each crop\'s stage images into a strip atlas')
+    parser.add_argument('--images-dir', default=os.path.join(ROOT_DIR, 'assets', 'images', 'crops'),
+                        help='Path to images/crops/ directory')
+    parser.add_argument('--output-dir', default=ATLAS_DIR,
+                        help='Where atlases and index.json are written')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Parallel encoder processes (0 = one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every atlas even if its images are unchanged')
+    args = parser.parse_args()
+
+    jobs = args.jobs or os.cpu_count() or 1
+    build_atlases(args.images_dir, args.output_dir, jobs, args.force)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Responsive Image Derivatives
+============================
+Builds WebP and AVIF copies of every stage image at the widths the crop
+pages display them at, for use in <picture>/srcset markup.
+
+Usage:
+    python scripts/image_derivatives.py --images-dir assets/images/crops [--jobs 0]
+
+Derivatives are written to assets/images/derived/{slug}/ as
+{slug}_stage_{n}-{width}w.{hash}.{ext}, where hash is a prefix of the
+source image's SHA-256, and are listed in assets/images/derived/index.json
+with the source's pixel size. An image is only re-encoded when its content
+hash (or the encoder settings) changed; derivatives of removed or replaced
+images are deleted.
+"""
+
+import io
+import os
+import sys
+import json
+import argparse
+
+from image_inventory import load_inventory
+from image_metadata import ROOT_DIR, default_store
+
+
+DERIVED_DIR = os.path.join(ROOT_DIR, 'assets', 'images', 'derived')
+DERIVED_INDEX = os.path.join(DERIVED_DIR, 'index.json')
+
+# Widths in CSS px times device pixel ratio: mobile cards show stages 70px
+# wide, the desktop table at most ~85px. Widths at or above the source width
+# are replaced by the source width.
+WIDTHS = (80, 160)
+
+# format -> (extension, PIL save options)
+FORMATS = {
+    'avif': ('.avif', {'quality': 50, 'speed': 6}),
+    'webp': ('.webp', {'quality': 80, 'method': 4}),
+}
+
+SETTINGS = {'widths': list(WIDTHS), 'formats': {k: v[1] for k, v in FORMATS.items()}}
+
+
+def supported_formats():
+    """The FORMATS this Pillow build can encode, in preference order."""
+    from PIL import features
+    return [fmt for fmt in FORMATS if features.check(fmt)]
+
+
+def derivative_widths(width):
+    """Target widths for a source image `width` px wide."""
+    return sorted({min(w, width) for w in WIDTHS})
+
+
+def _encode_stage(job):
+    """Worker: encode one source image; returns (key, entry)."""
+    key, src_path, info, formats, out_dir = job
+    from PIL import Image as PILImage
+
+    stem, _ = os.path.splitext(os.path.basename(key))
+    slug_dir = os.path.join(out_dir, os.path.dirname(key))
+    os.makedirs(slug_dir, exist_ok=True)
+    digest = info['sha256'][:10]
+
+    entry = {'sha256': info['sha256'], 'width': info['width'], 'height': info['height']}
+    with PILImage.open(src_path) as img:
+        img.load()
+        for width in derivative_widths(info['width']):
+            height = max(1, round(info['height'] * width / info['width']))
+            resized = img if width == info['width'] else img.resize(
+                (width, height), PILImage.Resampling.LANCZOS)
+            for fmt in formats:
+                ext, options = FORMATS[fmt]
+                name = f'{stem}-{width}w.{digest}{ext}'
+                buf = io.BytesIO()
+                resized.save(buf, fmt.upper(), **options)
+                with open(os.path.join(slug_dir, name), 'wb') as f:
+                    f.write(buf.getvalue())
+                entry.setdefault(fmt, []).append([width, f'{os.path.dirname(key)}/{name}'])
+    return key, entry
+
+
+def load_derived_index(path=DERIVED_INDEX):
+    """The derivative index {"slug/file.png": entry}, or {} if none was built."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('images', {})
+
+
+def _entry_is_current(entry, info, formats, out_dir):
+    if not entry or entry.get('sha256') != info['sha256']:
+        return False
+    for fmt in formats:
+        if not entry.get(fmt):
+            return False
+        for _, rel in entry[fmt]:
+            if not os.path.isfile(os.path.join(out_dir, rel)):
+                return False
+    return True
+
+
+def build_derivatives(images_dir, out_dir=DERIVED_DIR, jobs=1, force=False):
+    """Encode derivatives for every stage image; returns (built, skipped, removed)."""
+    index_path = os.path.join(out_dir, 'index.json')
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    old_images = previous.get('images', {})
+    if previous.get('settings') != SETTINGS:
+        force = True
+
+    formats = supported_formats()
+    store = default_store()
+    images = {}
+    work = []
+    for slug, stages in sorted(load_inventory(images_dir).items()):
+        for stage, by_ext in sorted(stages.items()):
+            src_path = by_ext.get('.png')
+            if src_path is None:
+                continue
+            key = f'{slug}/{os.path.basename(src_path)}'
+            info = store.get(src_path)
+            if not force and _entry_is_current(old_images.get(key), info, formats, out_dir):
+                images[key] = old_images[key]
+            else:
+                work.append((key, src_path, info, formats, out_dir))
+    store.save()
+
+    if jobs == 1 or len(work) < 2:
+        for key, entry in map(_encode_stage, work):
+            images[key] = entry
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for key, entry in pool.map(_encode_stage, work, chunksize=8):
+                images[key] = entry
+
+    # Remove derivatives no longer referenced by the index
+    keep = {rel for entry in images.values() for fmt in FORMATS
+            for _, rel in entry.get(fmt, ())}
+    removed = 0
+    for dirpath, _, filenames in os.walk(out_dir):
+        for name in filenames:
+            rel = os.path.relpath(os.path.join(dirpath, name), out_dir).replace(os.sep, '/')
+            if rel != 'index.json' and rel not in keep:
+                os.remove(os.path.join(dirpath, name))
+                removed += 1
+
+    data = {'settings': SETTINGS, 'images': dict(sorted(images.items()))}
+    if data != previous:
+        os.makedirs(out_dir, exist_ok=True)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+            f.write('\n')
+
+    built = len(work)
+    print(f"Derivatives: encoded {built}, skipped {len(images) - built} unchanged, "
+          f"removed {removed} stale file(s) ({', '.join(formats) or 'no formats available'})")
+    return built, len(images) - built, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build WebP/AVIF derivatives of the stage images')
+    parser.add_argument('--images-dir', default=os.path.join(ROOT_DIR, 'assets', 'images', 'crops'),
+                        help='Path to images/crops/ directory')
+    parser.add_argument('--output-dir', default=DERIVED_DIR,
+                        help='Where derivatives and index.json are written')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Parallel encoder processes (0 = one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-encode every image even if it is unchanged')
+    args = parser.parse_args()
+
+    jobs = args.jobs or os.cpu_count() or 1
+    build_derivatives(args.images_dir, args.output_dir, jobs, args.force)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Crop Image Inventory
+====================
+Walks the crop images directory once with os.scandir and indexes the stage
+images as {slug: {stage: {ext: path}}}, so the HTML generator and the PPTX
+converter can look images up without probing each candidate path.
+
+Only files following the {slug}/{slug}_stage_{n}.{ext} naming are indexed.
+The index is cached per directory for the lifetime of the process; call
+clear_cache() after images are added or removed.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+
+# Preferred order when a stage exists in several formats
+IMAGE_EXTENSIONS = ('.png', '.jpg')
+
+STAGE_FILE_RE = re.compile(r'^(?P<slug>.+)_stage_(?P<stage>\d+)(?P<ext>\.\w+)$')
+
+
+def scan_images(images_dir):
+    """Scan images_dir and return a fresh {slug: {stage: {ext: path}}} index."""
+    index = {}
+    try:
+        slug_entries = list(os.scandir(images_dir))
+    except OSError:
+        return index
+
+    for slug_entry in slug_entries:
+        if not slug_entry.is_dir():
+            continue
+        slug = slug_entry.name
+        stages = {}
+        with os.scandir(slug_entry.path) as files:
+            for entry in files:
+                match = STAGE_FILE_RE.match(entry.name)
+                if not match or match.group('slug') != slug:
+                    continue
+                if match.group('ext') not in IMAGE_EXTENSIONS or not entry.is_file():
+                    continue
+                stage = int(match.group('stage'))
+                stages.setdefault(stage, {})[match.group('ext')] = entry.path
+        if stages:
+            index[slug] = stages
+
+    return index
+
+
+@lru_cache(maxsize=None)
+def _cached_scan(abs_images_dir):
+    return scan_images(abs_images_dir)
+
+
+def load_inventory(images_dir):
+    """Return the index for images_dir, scanning it on first use only."""
+    return _cached_scan(os.path.abspath(images_dir))
+
+
+def clear_cache():
+    """Forget all scanned directories so the next lookup rescans."""
+    _cached_scan.cache_clear()
+
+
+def stage_image(images_dir, slug, stage, exts=IMAGE_EXTENSIONS):
+    """Path of the image for one crop stage, or None if there is none."""
+    found = load_inventory(images_dir).get(slug, {}).get(stage, {})
+    for ext in exts:
+        if ext in found:
+            return found[ext]
+    return None
+
+
+def existing_stages(images_dir, slug, exts=IMAGE_EXTENSIONS, num_stages=10):
+    """Stage numbers (1..num_stages) that have an image in one of exts."""
+    stages = load_inventory(images_dir).get(slug, {})
+    return [
+        i for i in range(1, num_stages + 1)
+        if any(ext in stages.get(i, ()) for ext in exts)
+    ]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Image Metadata Cache
+====================
+Persistent store of width, height, format, byte size and SHA-256 for crop
+images, kept in .cache/image-metadata.json at the repository root.
+
+Records are keyed by real path (symlinks share their target's record) and
+are only trusted while the file's mtime and size still match, so a lookup
+normally costs one os.stat() and never opens the image. Misses read the
+file once, hash it and parse the header with PIL.
+"""
+
+import io
+import os
+import json
+import hashlib
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT_DIR, '.cache')
+DEFAULT_STORE_PATH = os.path.join(CACHE_DIR, 'image-metadata.json')
+
+
+def read_image_metadata(path, st=None):
+    """Read metadata for one image straight from disk (no caching)."""
+    from PIL import Image as PILImage
+
+    if st is None:
+        st = os.stat(path)
+    with open(path, 'rb') as f:
+        blob = f.read()
+    with PILImage.open(io.BytesIO(blob)) as img:
+        width, height = img.size
+        fmt = img.format
+    return {
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+        'width': width,
+        'height': height,
+        'format': fmt,
+        'sha256': hashlib.sha256(blob).hexdigest(),
+    }
+
+
+class ImageMetadataStore:
+    """On-disk image metadata cache, loaded lazily and saved on demand."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._records = None
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            records = {}
+        return records if isinstance(records, dict) else {}
+
+    @property
+    def records(self):
+        if self._records is None:
+            self._records = self._load()
+        return self._records
+
+    def get(self, image_path):
+        """Return the metadata record for image_path, reading it on a miss."""
+        key = os.path.realpath(image_path)
+        st = os.stat(key)
+        record = self.records.get(key)
+        if (record is None or record.get('mtime_ns') != st.st_mtime_ns
+                or record.get('size') != st.st_size):
+            record = read_image_metadata(key, st)
+            self.records[key] = record
+            self._dirty = True
+        return record
+
+    def save(self):
+        """Merge new records into the store file, if anything was added.
+
+        Several export workers may save concurrently; the file is replaced
+        atomically and entries written by other processes are kept.
+        """
+        if not self._dirty:
+            return
+        merged = self._load()
+        merged.update(self.records)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._records = merged
+        self._dirty = False
+
+
+_default_store = None
+
+
+def default_store():
+    """The process-wide store at DEFAULT_STORE_PATH."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ImageMetadataStore()
+    return _default_store
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Slide Image Preparation
+=======================
+Downscales and recompresses stage images for the box they occupy on a slide,
+instead of embedding the original PNGs at full resolution.
+
+Each image is resized (never enlarged) to the requested DPI for its
+placement box, then stored as a palette-quantized PNG when it has
+transparency, or as a JPEG when it is fully opaque. Results live in
+.cache/pptx-images/ keyed by source SHA-256 and target pixel size, so each
+size of each image is only encoded once.
+"""
+
+import io
+import os
+import math
+
+from image_metadata import CACHE_DIR
+
+
+PREPARED_DIR = os.path.join(CACHE_DIR, 'pptx-images')
+EMU_PER_INCH = 914400
+JPEG_QUALITY = 85
+
+
+def target_pixels(info, box_w, box_h, dpi):
+    """Pixel size for an image shown in a box_w x box_h (EMU) box at dpi."""
+    width = math.ceil(box_w / EMU_PER_INCH * dpi)
+    height = math.ceil(box_h / EMU_PER_INCH * dpi)
+    if width >= info['width'] or height >= info['height']:
+        return info['width'], info['height']
+    return width, height
+
+
+def _has_transparency(img):
+    if img.mode in ('RGBA', 'LA'):
+        return img.getextrema()[-1][0] < 255
+    return img.mode == 'P' and 'transparency' in img.info
+
+
+def _encode(img_path, size):
+    """Return (bytes, ext) of img_path resized to size and recompressed."""
+    from PIL import Image as PILImage
+
+    with PILImage.open(img_path) as img:
+        img.load()
+        if img.size != size:
+            img = img.resize(size, PILImage.Resampling.LANCZOS)
+
+        buf = io.BytesIO()
+        if _has_transparency(img):
+            img = img.convert('RGBA').quantize(256, method=PILImage.Quantize.FASTOCTREE)
+            img.save(buf, 'PNG', optimize=True)
+            return buf.getvalue(), '.png'
+        img.convert('RGB').save(buf, 'JPEG', quality=JPEG_QUALITY,
+                                optimize=True, progressive=True)
+        return buf.getvalue(), '.jpg'
+
+
+def prepare_image(img_path, info, box_w, box_h, dpi, cache_dir=PREPARED_DIR):
+    """Return the path of img_path resized for its box, building it if needed.
+
+    `info` is the image's metadata record (see image_metadata). If
+    recompression would not make the file smaller, the cached copy holds
+    the original bytes.
+    """
+    width, height = target_pixels(info, box_w, box_h, dpi)
+    stem = f"{info['sha256'][:20]}_{width}x{height}"
+    for ext in ('.png', '.jpg'):
+        cached = os.path.join(cache_dir, stem + ext)
+        if os.path.isfile(cached):
+            return cached
+
+    blob, ext = _encode(img_path, (width, height))
+    if len(blob) >= info['size']:
+        with open(img_path, 'rb') as f:
+            blob = f.read()
+        ext = os.path.splitext(img_path)[1].lower()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cached = os.path.join(cache_dir, stem + ext)
+    tmp_path = f'{cached}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp_path, cached)
+    return cached
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Page Templates
+==============
+A minimal precompiled template layer for the files in templates/.
+
+    page = load_template("crop-page.html")
+    html = page.render(display_name="Wheat", stages_table=table_html)
+
+Placeholders are {{ name }} (HTML-escaped) and {{ name|safe }} (inserted
+as-is). A template is split into literal text and placeholders once, when
+it is first loaded, and is only recompiled when its file changes; rendering
+is a single join. One trailing newline of each file is dropped, so
+templates can end with a newline without adding one to the output.
+
+Every render is timed; render_stats() reports the count, total and slowest
+render per template.
+"""
+
+import os
+import re
+import html
+import time
+from functools import lru_cache
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATES_DIR = os.path.join(ROOT_DIR, "templates")
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*(\|\s*safe\s*)?\}\}")
+
+# template name -> [renders, total seconds, slowest seconds]
+_stats = {}
+
+
+class Template:
+    """A compiled template: alternating literal text and placeholders."""
+
+    def __init__(self, source, name="<string>"):
+        self.name = name
+        self.source = source
+        self._parts = []       # literal strings, and (key, safe) for placeholders
+        pos = 0
+        for match in PLACEHOLDER_RE.finditer(source):
+            self._parts.append(source[pos:match.start()])
+            self._parts.append((match.group(1), bool(match.group(2))))
+            pos = match.end()
+        self._parts.append(source[pos:])
+        self.names = frozenset(part[0] for part in self._parts if isinstance(part, tuple))
+
+    def render(self, **context):
+        """Fill in the placeholders; a missing name raises KeyError."""
+        start = time.perf_counter()
+        out = []
+        for part in self._parts:
+            if isinstance(part, str):
+                out.append(part)
+            else:
+                key, safe = part
+                value = str(context[key])
+                out.append(value if safe else html.escape(value))
+        result = "".join(out)
+
+        elapsed = time.perf_counter() - start
+        stats = _stats.setdefault(self.name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        return result
+
+
+def read_template(name, templates_dir=TEMPLATES_DIR):
+    """The text of a file in templates/, re-read only when it changes on disk."""
+    path = os.path.join(templates_dir, name)
+    return _read(path, os.stat(path).st_mtime_ns)
+
+
+def load_template(name, templates_dir=TEMPLATES_DIR):
+    """The compiled template for a file in templates/, recompiled only when it changes."""
+    path = os.path.join(templates_dir, name)
+    return _compile(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=None)
+def _read(path, mtime_ns):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def _compile(path, mtime_ns):
+    source = _read(path, mtime_ns)
+    if source.endswith("\n"):
+        source = source[:-1]
+    return Template(source, os.path.basename(path))
+
+
+def render_stats():
+    """{template name: (renders, total seconds, slowest seconds)}."""
+    return {name: tuple(stats) for name, stats in _stats.items()}
+
+
+def reset_render_stats():
+    _stats.clear()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Designer Master Templates
+=========================
+Loads a branded .pptx or .potx file for html_to_pptx.py --template and finds
+the slide layout and named placeholders that crop slides are bound to.
+
+The file needs a slide layout named "Crop Stages" whose placeholders are
+named as follows (PowerPoint: Home > Arrange > Selection Pane):
+
+    Title           the crop name (the layout's title placeholder if none is named so)
+    Subtitle        'Botanical Growth Stages'
+    Stage Images    the area the stage pictures are fitted into, one column per stage
+    Stage Table     the area of the BBCH code / description / product table
+
+A placeholder that is missing falls back to the built-in layout's position.
+Title and subtitle keep the fonts and colours of their placeholders; the
+table takes its look from the theme; backgrounds and footers come from the
+master. Slides already in the file are dropped.
+
+The file is read and cleaned once per process; every deck is a fresh
+Presentation parsed from the cached bytes.
+"""
+
+import io
+import os
+import zipfile
+from functools import lru_cache
+
+
+CROP_LAYOUT = 'Crop Stages'
+PH_TITLE = 'Title'
+PH_SUBTITLE = 'Subtitle'
+PH_IMAGES = 'Stage Images'
+PH_TABLE = 'Stage Table'
+
+CT_TEMPLATE = b'application/vnd.openxmlformats-officedocument.presentationml.template.main+xml'
+CT_PRESENTATION = b'application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml'
+
+
+def _as_presentation(blob):
+    """A .potx package rewritten as a .pptx (python-pptx only opens the latter)."""
+    src = zipfile.ZipFile(io.BytesIO(blob))
+    content_types = src.read('[Content_Types].xml')
+    if CT_TEMPLATE not in content_types:
+        return blob
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename == '[Content_Types].xml':
+                data = content_types.replace(CT_TEMPLATE, CT_PRESENTATION)
+            dst.writestr(item, data)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=None)
+def _master_bytes(path, mtime_ns):
+    from pptx import Presentation
+
+    with open(path, 'rb') as f:
+        blob = _as_presentation(f.read())
+    prs = Presentation(io.BytesIO(blob))
+    crop_layout(prs)  # fail early if the layout is missing
+
+    # Drop sample slides; parts nothing relates to are not saved
+    sld_ids = prs.slides._sldIdLst
+    for sld_id in list(sld_ids):
+        prs.part.drop_rel(sld_id.rId)
+        sld_ids.remove(sld_id)
+    buf = io.BytesIO()
+    prs.save(buf)
+    return buf.getvalue()
+
+
+def master_version(path):
+    """(absolute path, mtime) of a master file; changes when the file is edited."""
+    path = os.path.abspath(path)
+    return path, os.stat(path).st_mtime_ns
+
+
+def open_master(path):
+    """A new, slide-less Presentation based on the master file at path."""
+    from pptx import Presentation
+    return Presentation(io.BytesIO(_master_bytes(*master_version(path))))
+
+
+def crop_layout(prs):
+    """The master's "Crop Stages" slide layout; ValueError if there is none."""
+    for layout in prs.slide_layouts:
+        if layout.name.strip().lower() == CROP_LAYOUT.lower():
+            return layout
+    names = ', '.join(repr(layout.name) for layout in prs.slide_layouts)
+    raise ValueError(f'template has no slide layout named {CROP_LAYOUT!r} (found {names})')
+
+
+def find_placeholder(slide, name):
+    """The slide placeholder named so (case-insensitive) on its layout, or None.
+
+    Placeholders copied onto a slide get generic names, so the name is
+    looked up on the layout placeholder with the same idx. For PH_TITLE the
+    slide's title placeholder is used when none is named so.
+    """
+    layout_names = {shape.placeholder_format.idx: shape.name
+                    for shape in slide.slide_layout.placeholders}
+    for shape in slide.placeholders:
+        shape_name = layout_names.get(shape.placeholder_format.idx, shape.name)
+        if shape_name.strip().lower() == name.lower():
+            return shape
+    if name == PH_TITLE:
+        return slide.shapes.title
+    return None
+
+
+def placeholder_box(shape):
+    """(left, top, width, height) of a placeholder, inherited from its layout."""
+    return shape.left, shape.top, shape.width, shape.height
+
+
+def remove_shape(shape):
+    element = shape._element
+    element.getparent().remove(element)
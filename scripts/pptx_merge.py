@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+PPTX Package Merger
+===================
+Concatenates the slides of several .pptx files into one deck by copying
+package parts between zip files, without loading any deck into python-pptx.
+
+All input decks must come from the same base template (as every deck built
+by html_to_pptx.py does): masters, layouts and theme are taken from the
+first deck, and slides may only relate to layouts, images and external
+targets. Slides are renumbered in input order and media parts are renamed
+and de-duplicated by content hash, keeping the compression they had in
+their source deck; media the base deck's masters and layouts use (a logo,
+a background picture) keeps its name, and slide media is numbered around
+it. Parts are streamed one at a time, so memory use does not grow with the
+number of slides.
+"""
+
+import hashlib
+import posixpath
+import zipfile
+
+from lxml import etree
+
+
+NS_CT = 'http://schemas.openxmlformats.org/package/2006/content-types'
+NS_RELS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+NS_P = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+NS_R = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+RT_SLIDE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide'
+RT_LAYOUT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout'
+RT_IMAGE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image'
+CT_SLIDE = 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml'
+
+PRESENTATION = 'ppt/presentation.xml'
+PRESENTATION_RELS = 'ppt/_rels/presentation.xml.rels'
+CONTENT_TYPES = '[Content_Types].xml'
+
+# Parts rebuilt by the merge rather than copied from the base deck (media
+# other than slide media is copied; see _base_media)
+_REBUILT_PREFIXES = ('ppt/slides/', 'ppt/media/')
+_REBUILT_PARTS = (PRESENTATION, PRESENTATION_RELS, CONTENT_TYPES)
+
+
+def _rels_path(part_name):
+    folder, name = posixpath.split(part_name)
+    return posixpath.join(folder, '_rels', name + '.rels')
+
+
+def _resolve(source_part, target):
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+
+def _xml_bytes(root):
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _base_media(zf):
+    """Media parts related to from outside ppt/slides/ (masters, layouts, notes)."""
+    media = set()
+    for name in zf.namelist():
+        if not name.endswith('.rels') or name.startswith('ppt/slides/'):
+            continue
+        folder, rels_name = posixpath.split(name)
+        source_part = posixpath.join(posixpath.dirname(folder), rels_name[:-len('.rels')])
+        for rel in etree.fromstring(zf.read(name)):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = _resolve(source_part, rel.get('Target'))
+            if target.startswith('ppt/media/'):
+                media.add(target)
+    return media
+
+
+def _slide_parts(zf):
+    """Slide part names of an open deck, in presentation order."""
+    pres = etree.fromstring(zf.read(PRESENTATION))
+    rels = etree.fromstring(zf.read(PRESENTATION_RELS))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels}
+    return [
+        _resolve(PRESENTATION, targets[sld_id.get(f'{{{NS_R}}}id')])
+        for sld_id in pres.iterfind(f'{{{NS_P}}}sldIdLst/{{{NS_P}}}sldId')
+    ]
+
+
+class MergeStats:
+    """Counts reported by merge_decks."""
+
+    def __init__(self):
+        self.slides = 0
+        self.media_refs = 0
+        self.media_parts = 0      # slide media written (base deck media not counted)
+        self.bytes_saved = 0
+
+
+def merge_decks(deck_paths, output_path, transform_slide=None):
+    """Write the slides of deck_paths, in order, into one deck at output_path.
+
+    `transform_slide(deck_path, index, slide_xml)` may return replacement
+    slide XML bytes (index is the slide's position within its deck).
+    Returns a MergeStats.
+    """
+    if not deck_paths:
+        raise ValueError('merge_decks needs at least one deck')
+
+    stats = MergeStats()
+    media_by_hash = {}
+    content_defaults = {}
+
+    with zipfile.ZipFile(deck_paths[0]) as base, \
+            zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as out:
+        base_names = set(base.namelist())
+        kept_media = _base_media(base) & base_names
+
+        for name in base.namelist():
+            if name in kept_media:
+                blob = base.read(name)
+                media_by_hash.setdefault(hashlib.sha256(blob).hexdigest(), name)
+            elif name in _REBUILT_PARTS or name.startswith(_REBUILT_PREFIXES):
+                continue
+            else:
+                blob = base.read(name)
+            out.writestr(base.getinfo(name), blob)
+
+        media_number = 0
+
+        for deck_path in deck_paths:
+            with zipfile.ZipFile(deck_path) as zf:
+                types = etree.fromstring(zf.read(CONTENT_TYPES))
+                for default in types.iterfind(f'{{{NS_CT}}}Default'):
+                    content_defaults.setdefault(default.get('Extension').lower(),
+                                                default.get('ContentType'))
+
+                for index, slide_part in enumerate(_slide_parts(zf)):
+                    stats.slides += 1
+                    new_part = f'ppt/slides/slide{stats.slides}.xml'
+                    rels = etree.fromstring(zf.read(_rels_path(slide_part)))
+
+                    for rel in rels:
+                        if rel.get('TargetMode') == 'External':
+                            continue
+                        target = _resolve(slide_part, rel.get('Target'))
+                        if rel.get('Type') == RT_LAYOUT:
+                            if target not in base_names:
+                                raise ValueError(f'{deck_path}: layout {target} '
+                                                 'is not in the base deck')
+                        elif rel.get('Type') == RT_IMAGE:
+                            compress_type = zf.getinfo(target).compress_type
+                            blob = zf.read(target)
+                            digest = hashlib.sha256(blob).hexdigest()
+                            stats.media_refs += 1
+                            if digest in media_by_hash:
+                                stats.bytes_saved += len(blob)
+                                target = media_by_hash[digest]
+                            else:
+                                ext = posixpath.splitext(target)[1]
+                                stats.media_parts += 1
+                                media_number += 1
+                                while f'ppt/media/image{media_number}{ext}' in kept_media:
+                                    media_number += 1
+                                target = f'ppt/media/image{media_number}{ext}'
+                                media_by_hash[digest] = target
+                                out.writestr(target, blob, compress_type=compress_type)
+                        else:
+                            raise ValueError(f'{deck_path}: unsupported slide '
+                                             f'relationship {rel.get("Type")}')
+                        rel.set('Target', posixpath.relpath(target, 'ppt/slides'))
+
+                    slide_xml = zf.read(slide_part)
+                    if transform_slide is not None:
+                        slide_xml = transform_slide(deck_path, index, slide_xml) or slide_xml
+                    out.writestr(new_part, slide_xml)
+                    out.writestr(_rels_path(new_part), _xml_bytes(rels))
+
+        _write_presentation(base, out, stats.slides)
+        _write_content_types(base, out, stats.slides, content_defaults)
+
+    return stats
+
+
+def _write_presentation(base, out, num_slides):
+    """presentation.xml and its rels from the base deck, with the merged slides."""
+    rels = etree.fromstring(base.read(PRESENTATION_RELS))
+    for rel in list(rels):
+        if rel.get('Type') == RT_SLIDE:
+            rels.remove(rel)
+    next_id = 1 + max((int(rel.get('Id')[3:]) for rel in rels
+                       if rel.get('Id', '')[3:].isdigit()), default=0)
+
+    pres = etree.fromstring(base.read(PRESENTATION))
+    sld_id_lst = pres.find(f'{{{NS_P}}}sldIdLst')
+    if sld_id_lst is None:
+        sld_id_lst = etree.Element(f'{{{NS_P}}}sldIdLst')
+        pres.find(f'{{{NS_P}}}sldMasterIdLst').addnext(sld_id_lst)
+    sld_id_lst.clear()
+
+    for i in range(num_slides):
+        rId = f'rId{next_id + i}'
+        etree.SubElement(rels, f'{{{NS_RELS}}}Relationship', {
+            'Id': rId, 'Type': RT_SLIDE, 'Target': f'slides/slide{i + 1}.xml',
+        })
+        etree.SubElement(sld_id_lst, f'{{{NS_P}}}sldId', {
+            'id': str(256 + i), f'{{{NS_R}}}id': rId,
+        })
+
+    out.writestr(PRESENTATION, _xml_bytes(pres))
+    out.writestr(PRESENTATION_RELS, _xml_bytes(rels))
+
+
+def _write_content_types(base, out, num_slides, defaults):
+    types = etree.fromstring(base.read(CONTENT_TYPES))
+    known = {d.get('Extension').lower() for d in types.iterfind(f'{{{NS_CT}}}Default')}
+    for override in list(types.iterfind(f'{{{NS_CT}}}Override')):
+        if override.get('PartName').startswith('/ppt/slides/'):
+            types.remove(override)
+
+    first_override = types.find(f'{{{NS_CT}}}Override')
+    for ext, content_type in sorted(defaults.items()):
+        if ext not in known:
+            default = etree.Element(f'{{{NS_CT}}}Default',
+                                    {'Extension': ext, 'ContentType': content_type})
+            if first_override is not None:
+                first_override.addprevious(default)
+            else:
+                types.append(default)
+    for i in range(num_slides):
+        etree.SubElement(types, f'{{{NS_CT}}}Override', {
+            'PartName': f'/ppt/slides/slide{i + 1}.xml', 'ContentType': CT_SLIDE,
+        })
+
+    out.writestr(CONTENT_TYPES, _xml_bytes(types))